@@ -0,0 +1,355 @@
+import asyncio
+import contextvars
+import hashlib
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Mapping, Optional, Sequence, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.utils import class_names
+
+logger = logging.getLogger(__name__)
+
+_current: "contextvars.ContextVar[Optional[_Ticket]]" = contextvars.ContextVar("admission_ticket", default=None)
+
+
+class OverloadedError(Exception):
+    """Raised when a request is shed instead of queued; `retry_after` is in seconds."""
+
+    def __init__(self, retry_after: float, reason: str) -> None:
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.reason = reason
+        super().__init__(reason)
+
+
+# Timeouts raised inside the SDKs, matched by name so that neither has to be imported here.
+_TIMEOUT_ERRORS = frozenset({"httpx.TimeoutException", "openai.APITimeoutError"})
+
+
+def _is_overload(error: BaseException) -> bool:
+    """Whether an upstream error means the upstream is saturated: a 429/503 or a timeout."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, asyncio.TimeoutError) or getattr(error, "status_code", None) in (429, 503):
+            return True
+        if any(name in _TIMEOUT_ERRORS for name in class_names(error)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def report_upstream(latency: Optional[float] = None, error: Optional[BaseException] = None) -> None:
+    """Feed one upstream LLM call outcome to the controller that admitted the current request, if any."""
+    ticket = _current.get()
+    if ticket is not None:
+        ticket.controller.observe(latency, error)
+
+
+def reserve(slots: int) -> int:
+    """Grow the admission of the current request towards `slots` slots, e.g. for a batch fanning out to many calls.
+
+    Only slots that are free right now are taken, without queueing, and at most the controller's
+    `max_share` of its current limit, so a large request neither waits for the limit to drain nor
+    crowds out single requests. They are held until the response is complete. Returns how many
+    calls the request may run at once: the slots it holds, or `slots` outside an admitted request.
+    """
+    ticket = _current.get()
+    if ticket is None:
+        return slots
+    cap = max(1, int(ticket.controller.limit * ticket.controller.max_share))
+    extra = min(slots, cap) - ticket.slots
+    if extra > 0:
+        ticket.slots += ticket.controller.try_acquire(extra)
+    return ticket.slots
+
+
+def parse_lane_keys(value: str) -> Dict[str, str]:
+    """Parse `lane:key` pairs separated by commas, e.g. `paid:3f9c...,paid:a1b2...`, into a key to lane map."""
+    keys: Dict[str, str] = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        lane, _, key = item.strip().partition(":")
+        if not lane or not key:
+            raise ValueError(f"Invalid lane key {item!r}, expected lane:key")
+        keys[key] = lane
+    return keys
+
+
+def _digest(key: bytes) -> bytes:
+    return hashlib.sha256(key).digest()
+
+
+def overloaded_response(error: OverloadedError) -> JSONResponse:
+    """The 503 answer for a shed request."""
+    return JSONResponse(
+        {"detail": f"Service overloaded: {error.reason}"},
+        status_code=503,
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+class AdmissionController:
+    """Adaptive concurrency limit with a prioritized, bounded wait queue.
+
+    The limit follows AIMD on upstream signals reported through `report_upstream`: it grows
+    by about one per limit's worth of successful calls while it is being used, and is cut by
+    `backoff` on a 429, 503 or timeout, or to 90% when upstream latency drifts above
+    `latency_tolerance` times its baseline. Decreases happen at most once per observed
+    latency, so a burst of errors from one wave of requests only counts once. The first
+    `warmup_samples` latencies, which include cold connections, only set the baseline: the
+    latency EWMA starts from the last of them, and latency cuts wait until they are in.
+
+    A request takes one slot, or up to `max_share` of the limit via `reserve()`. Requests above
+    the limit wait in one FIFO per lane; `lanes` lists them highest priority first. A request is
+    shed with `OverloadedError` instead of queued when its estimated wait
+    exceeds `queue_timeout`, when the queue is full and holds no lower-priority request to
+    evict, or when it has waited `queue_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 16,
+        min_limit: int = 1,
+        max_limit: int = 128,
+        max_queue: int = 256,
+        queue_timeout: float = 10.0,
+        lanes: Sequence[str] = ("paid", "free"),
+        default_lane: str = "free",
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        alpha: float = 0.1,
+        max_share: float = 0.5,
+        warmup_samples: int = 10,
+    ) -> None:
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.lanes = tuple(lanes)
+        self.default_lane = default_lane
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.alpha = alpha
+        self.max_share = max_share
+        self.warmup_samples = warmup_samples
+        self.in_flight = 0
+        self._waiters: Dict[str, Deque[Tuple["asyncio.Future[None]", int]]] = {lane: deque() for lane in self.lanes}
+        self._service_time: Optional[float] = None
+        self._latency: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._latency_samples = 0
+        self._last_decrease = 0.0
+        self.admitted = 0
+        self.shed = 0
+        self.overloads = 0
+
+    def lane_for(self, value: Optional[str]) -> str:
+        """Lane named by `value` if it is one of the lanes, or the default lane."""
+        return value if value in self._waiters else self.default_lane
+
+    @property
+    def queued(self) -> int:
+        return sum(slots for waiters in self._waiters.values() for _, slots in waiters)
+
+    def _estimate_wait(self, lane: str) -> float:
+        if self._service_time is None:
+            return 0.0
+        rank = self.lanes.index(lane)
+        ahead = sum(slots for other in self.lanes[: rank + 1] for _, slots in self._waiters[other])
+        return (ahead + 1) * self._service_time / max(1.0, self.limit)
+
+    def _evict_lower(self, lane: str) -> bool:
+        for lower in reversed(self.lanes[self.lanes.index(lane) + 1 :]):
+            waiters = self._waiters[lower]
+            while waiters:
+                waiter, _ = waiters.pop()
+                if not waiter.done():
+                    waiter.set_exception(OverloadedError(self._estimate_wait(lower), f"Preempted by the {lane} lane"))
+                    return True
+        return False
+
+    def _shed(self, retry_after: float, reason: str) -> OverloadedError:
+        self.shed += 1
+        return OverloadedError(retry_after, reason)
+
+    async def acquire(self, lane: str, slots: int = 1) -> None:
+        """Wait for `slots` slots in `lane`, or raise `OverloadedError`."""
+        if self.in_flight + slots <= max(int(self.limit), 1) and not self.queued:
+            self.in_flight += slots
+            self.admitted += 1
+            return
+
+        estimate = self._estimate_wait(lane)
+        if estimate > self.queue_timeout:
+            raise self._shed(estimate, "Estimated queue wait exceeds the deadline")
+        if self.queued >= self.max_queue and not self._evict_lower(lane):
+            raise self._shed(estimate or self.queue_timeout, "Request queue is full")
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        entry = (waiter, slots)
+        self._waiters[lane].append(entry)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                return
+            self._discard(lane, entry)
+            raise self._shed(self._estimate_wait(lane), "Timed out waiting in the request queue")
+        except OverloadedError:
+            self.shed += 1
+            raise
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self.release(slots=slots)
+            else:
+                self._discard(lane, entry)
+            raise
+
+    def try_acquire(self, slots: int) -> int:
+        """Take up to `slots` slots that are free right now, unless requests are queued; returns how many."""
+        if self.queued:
+            return 0
+        granted = max(0, min(slots, max(int(self.limit), 1) - self.in_flight))
+        self.in_flight += granted
+        return granted
+
+    def _discard(self, lane: str, entry: Tuple["asyncio.Future[None]", int]) -> None:
+        try:
+            self._waiters[lane].remove(entry)
+        except ValueError:
+            pass
+
+    def release(self, service_time: Optional[float] = None, slots: int = 1) -> None:
+        """Free `slots` slots and hand them to the next waiters, highest-priority lane first."""
+        self.in_flight -= slots
+        if service_time is not None:
+            self._service_time = self._ewma(self._service_time, service_time)
+        self._wake()
+
+    def _wake(self) -> None:
+        for lane in self.lanes:
+            waiters = self._waiters[lane]
+            while waiters:
+                waiter, slots = waiters[0]
+                if waiter.done():
+                    waiters.popleft()
+                    continue
+                if self.in_flight + slots > max(int(self.limit), 1):
+                    return
+                waiters.popleft()
+                waiter.set_result(None)
+                self.in_flight += slots
+                self.admitted += 1
+
+    def _ewma(self, current: Optional[float], sample: float) -> float:
+        return sample if current is None else current + self.alpha * (sample - current)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < (self._latency or 1.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * factor)
+        logger.info(f"Admission limit decreased to {self.limit:.1f}")
+
+    def observe(self, latency: Optional[float] = None, error: Optional[BaseException] = None) -> None:
+        """Adjust the limit from one upstream call outcome."""
+        if error is not None:
+            if _is_overload(error):
+                self.overloads += 1
+                self._decrease(self.backoff)
+            return
+        if latency is None:
+            return
+
+        self._latency_samples += 1
+        self._baseline = latency if self._baseline is None else min(latency, self._baseline * 1.01)
+        warm = self._latency_samples > self.warmup_samples
+        self._latency = self._ewma(self._latency, latency) if warm else latency
+        if warm and self._latency > self.latency_tolerance * self._baseline:
+            self._decrease(0.9)
+        elif self.in_flight >= int(self.limit) - 1:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self._wake()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limit, occupancy and shedding counters."""
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": {lane: sum(slots for _, slots in waiters) for lane, waiters in self._waiters.items()},
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "upstream_overloads": self.overloads,
+            "upstream_latency": None if self._latency is None else round(self._latency, 4),
+            "upstream_baseline": None if self._baseline is None else round(self._baseline, 4),
+            "service_time": None if self._service_time is None else round(self._service_time, 4),
+        }
+
+
+class _Ticket:
+    """Admission held by the current request: its controller, lane and number of slots."""
+
+    def __init__(self, controller: AdmissionController, lane: str) -> None:
+        self.controller = controller
+        self.lane = lane
+        self.slots = 1
+
+
+class AdmissionMiddleware:
+    """ASGI middleware putting an `AdmissionController` in front of the routes under `path_prefixes`.
+
+    The slot is held until the response, including a streamed body, is complete. The lane is
+    resolved on the server from the API key in the `key_header` request header, through
+    `lane_keys` (key to lane); requests without a known key get the controller's default,
+    lowest-priority lane. Shed requests get a 503 with `Retry-After`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController,
+        path_prefixes: Sequence[str] = ("/predict/",),
+        lane_keys: Optional[Mapping[str, str]] = None,
+        key_header: str = "x-api-key",
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.path_prefixes = tuple(path_prefixes)
+        self.key_header = key_header.lower().encode()
+        self._lanes = {_digest(key.encode()): controller.lane_for(lane) for key, lane in (lane_keys or {}).items()}
+
+    def lane_for(self, scope: Scope) -> str:
+        """Lane of the API key a request carries, or the default lane."""
+        key = next((value for name, value in scope["headers"] if name == self.key_header), None)
+        if key is None:
+            return self.controller.default_lane
+        return self._lanes.get(_digest(key.strip()), self.controller.default_lane)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        lane = self.lane_for(scope)
+        try:
+            await self.controller.acquire(lane)
+        except OverloadedError as e:
+            await overloaded_response(e)(scope, receive, send)
+            return
+
+        ticket = _Ticket(self.controller, lane)
+        token = _current.set(ticket)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            self.controller.release(time.perf_counter() - started, ticket.slots)
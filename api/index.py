@@ -1,31 +1,111 @@
+import asyncio
+import json
 import logging
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Literal, Optional, Union
 
-import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import RedirectResponse
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 from api import __title__, __version__
+from api.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    OverloadedError,
+    overloaded_response,
+    parse_lane_keys,
+    reserve,
+)
+from api.llm import RATE_GOVERNOR, aclose_clients, pool_stats
+from api.metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware, Sample
 from api.models import (
     CardInfoAPIResponse,
+    CardInfoBulkAPIResponse,
     CardsAPIRequest,
     CardsAPIResponse,
+    CardSearchAPIResponse,
+    CardSearchHit,
+    FullReadingAPIRequest,
+    FullReadingAPIResponse,
     NumerologyAPIRequest,
     NumerologyAPIResponse,
     TarotAPIRequest,
     TarotAPIResponse,
+    TarotBatchAPIRequest,
+    TarotBatchAPIResponse,
+    TarotCard,
+    TarotLLMResponse,
 )
-from api.modules import NumerologyReader, TarotDeck, TarotReader
+from api.modules import NumerologyEngine, NumerologyReader, TarotDeck, TarotReader
+from api.modules.predict import FallbackPolicy, SemanticCache, SQLiteReadingCache
+from api.utils import ImmutableStaticFiles, accepts_gzip, etag_matches, format_sse, json_response, merge_streams
 
 logger = logging.getLogger(__name__)
 PROJECT_BASE_DIR = Path(__file__).resolve().parents[1]
 NUMEROLOGY_READER = NumerologyReader()
 TAROT_READER = TarotReader()
+if os.getenv("READING_CACHE_PATH"):
+    TarotReader.configure(cache=SQLiteReadingCache(Path(os.environ["READING_CACHE_PATH"])))
+if os.getenv("LLM_FALLBACK_MODE"):
+    for reader in (TarotReader, NumerologyReader):
+        reader.configure(
+            fallback=FallbackPolicy(
+                mode=os.environ["LLM_FALLBACK_MODE"],  # type: ignore[arg-type]
+                default_timeout=float(os.environ["LLM_MODEL_TIMEOUT"]) if os.getenv("LLM_MODEL_TIMEOUT") else None,
+            )
+        )
+if os.getenv("SEMANTIC_CACHE") == "1":
+    for reader_name, reader in (("tarot", TarotReader), ("numerology", NumerologyReader)):
+        reader.configure(
+            semantic_cache=SemanticCache(
+                name=reader_name,
+                threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85")),
+                max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "4096")),
+                path=Path(os.environ["SEMANTIC_CACHE_DIR"]) / f"{reader_name}.npz"
+                if os.getenv("SEMANTIC_CACHE_DIR")
+                else None,
+            )
+        )
+CARD_INFO_CACHE_CONTROL = "public, max-age=3600"
+CARD_IMAGE_CACHE_CONTROL = "public, max-age=86400"
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+PREDICT_ADMISSION = AdmissionController(
+    initial_limit=int(os.getenv("ADMISSION_INITIAL_LIMIT", "16")),
+    max_limit=int(os.getenv("ADMISSION_MAX_LIMIT", "128")),
+    max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "256")),
+    queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10")),
+)
+TarotDeck.catalog.load()
+TarotDeck.search.load()
+TarotReader.composer.load()
 
 
-app = FastAPI(title=__title__, version=__version__, docs_url="/swagger", redoc_url=None)
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    for reader in (TarotReader, NumerologyReader):
+        if reader.semantic_cache is not None:
+            reader.semantic_cache.save()
+    await aclose_clients()
+
+
+app = FastAPI(title=__title__, version=__version__, docs_url="/swagger", redoc_url=None, lifespan=lifespan)
+app.add_middleware(
+    AdmissionMiddleware,
+    controller=PREDICT_ADMISSION,
+    path_prefixes=("/predict/",),
+    lane_keys=parse_lane_keys(os.getenv("ADMISSION_LANE_KEYS", "")),
+)
+app.add_middleware(MetricsMiddleware)
+app.add_exception_handler(OverloadedError, lambda request, e: overloaded_response(e))
+app.mount(
+    "/tarot-cards/images/variants",
+    ImmutableStaticFiles(directory=TarotDeck.image_variants.output_dir, check_dir=False),
+    name="tarot-card-variants",
+)
 app.mount("/tarot-cards/images", StaticFiles(directory=PROJECT_BASE_DIR / "static" / "images"), name="tarot-cards")
 
 if os.getenv("VERCEL") == "1":
@@ -40,8 +120,129 @@ if os.getenv("VERCEL") == "1":
         return RedirectResponse("https://tarotpedia.github.io/docs", status_code=307)
 
 
+def cache_lookup_samples() -> Iterable[Sample]:
+    caches = {
+        "card_catalog": TarotDeck.catalog.stats(),
+        "numerology_memo": NumerologyEngine.memo.stats(),
+        "tarot_reading": TarotReader.cache.stats(),
+    }
+    for reader_name, reader in (("tarot", TarotReader), ("numerology", NumerologyReader)):
+        if reader.semantic_cache is not None:
+            caches[f"{reader_name}_semantic"] = reader.semantic_cache.stats()
+    for cache, stats in caches.items():
+        yield {"cache": cache, "result": "hit"}, stats["hits"]
+        yield {"cache": cache, "result": "miss"}, stats["misses"]
+
+
+def coalesced_samples() -> Iterable[Sample]:
+    for reader, cls in (("tarot", TarotReader), ("numerology", NumerologyReader)):
+        yield {"reader": reader}, cls.inflight.stats()["coalesced"]
+
+
+def circuit_samples() -> Iterable[Sample]:
+    trackers = {id(cls.fallback.health): cls.fallback.health for cls in (TarotReader, NumerologyReader)}
+    for tracker in trackers.values():
+        for model, health in tracker.stats().items():
+            for state in ("closed", "open", "half_open"):
+                yield {"model": model, "state": state}, 1.0 if health["state"] == state else 0.0
+
+
+def admission_samples() -> Iterable[Sample]:
+    stats = PREDICT_ADMISSION.stats()
+    yield {"kind": "limit"}, stats["limit"]
+    yield {"kind": "in_flight"}, stats["in_flight"]
+    for lane, queued in stats["queued"].items():
+        yield {"kind": "queued", "lane": lane}, queued
+
+
+def rate_limit_samples() -> Iterable[Sample]:
+    for model, stats in RATE_GOVERNOR.stats()["models"].items():
+        for kind in ("requests", "tokens"):
+            if stats[f"{kind}_available"] is not None:
+                yield {"model": model, "kind": kind}, stats[f"{kind}_available"]
+
+
+REGISTRY.collector("cache_lookups_total", "Cache lookups by cache and result.", cache_lookup_samples, "counter")
+REGISTRY.collector(
+    "llm_coalesced_requests_total", "Requests served by an in-flight call.", coalesced_samples, "counter"
+)
+REGISTRY.collector("llm_circuit_state", "Circuit breaker state per model (1 for the current state).", circuit_samples)
+REGISTRY.collector("llm_rate_limit_available", "Client-side rate limit headroom per model.", rate_limit_samples)
+REGISTRY.collector("admission_state", "Predict admission limit, in-flight and queued requests.", admission_samples)
+REGISTRY.collector(
+    "admission_shed_total", "Predict requests shed with a 503.", lambda: [({}, PREDICT_ADMISSION.shed)], "counter"
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/debug/llm-pool", include_in_schema=False)
+async def llm_pool():
+    return pool_stats()
+
+
+@app.get("/debug/llm-health", include_in_schema=False)
+async def llm_health():
+    return {"tarot": TAROT_READER.fallback.health.stats(), "numerology": NUMEROLOGY_READER.fallback.health.stats()}
+
+
+@app.get("/debug/rate-limits", include_in_schema=False)
+async def rate_limit_stats():
+    return RATE_GOVERNOR.stats()
+
+
+@app.get("/debug/admission", include_in_schema=False)
+async def admission_stats():
+    return PREDICT_ADMISSION.stats()
+
+
+@app.get("/debug/search", include_in_schema=False)
+async def search_stats():
+    return TarotDeck.search.stats()
+
+
+@app.get("/debug/semantic-cache", include_in_schema=False)
+async def semantic_cache_stats():
+    return {
+        "tarot": TarotReader.semantic_cache.stats() if TarotReader.semantic_cache else None,
+        "numerology": NumerologyReader.semantic_cache.stats() if NumerologyReader.semantic_cache else None,
+    }
+
+
+@app.get("/debug/prompts", include_in_schema=False)
+async def prompt_stats():
+    return {"tarot": TAROT_READER.prompts.stats(), "numerology": NUMEROLOGY_READER.prompts.stats()}
+
+
+def make_deck(name: str, dob: str, follow_numerology: bool) -> TarotDeck:
+    """Deck seeded by the personal numerology number when requested."""
+    if follow_numerology:
+        universe_number = NUMEROLOGY_READER.calculate(name, dob)["personal_numerology"]
+    else:
+        universe_number = None
+
+    return TarotDeck(seed=universe_number)
+
+
+def require_llm(*readers: Union[TarotReader, NumerologyReader]) -> None:
+    """Answer 503 up front when a route needs an LLM client that is not configured.
+
+    Without a client every model attempt would fail alike, before any upstream call.
+    """
+    if not all(reader.is_configured() for reader in readers):
+        raise HTTPException(status_code=503, detail="Predict API is not configured: OPENAI_API_KEY is not set")
+
+
+def draw_spread(name: str, dob: str, count: int, follow_numerology: bool) -> List[TarotCard]:
+    """Draw `count` cards, seeded by the personal numerology number when requested."""
+    return make_deck(name, dob, follow_numerology).draw(count=count)
+
+
 @app.post("/predict/tarot-interpretations", response_model=TarotAPIResponse, tags=["Predict API"])
-async def predict_tarot_interpretations(request: TarotAPIRequest) -> TarotAPIResponse:
+async def predict_tarot_interpretations(request: TarotAPIRequest) -> Response:
     """
     | Method | Path                             | Description                                       |
     | ------ | -------------------------------- | ------------------------------------------------- |
@@ -54,7 +255,10 @@ async def predict_tarot_interpretations(request: TarotAPIRequest) -> TarotAPIRes
         TarotAPIResponse: The response object containing the name, question, and interpretations.
 
     !!! note
-        This function uses the `TarotReader` module to get the tarot interpretations.
+        This function uses the `TarotReader` module to get the tarot interpretations. With `"tier": "fast"`
+        the reading is composed from the card meanings without an LLM call, in microseconds; the same
+        fast reading is served when every model fails, instead of an error. `tier` in the response tells which
+        one was served.
 
     !!! example "Example Request"
 
@@ -101,23 +305,24 @@ async def predict_tarot_interpretations(request: TarotAPIRequest) -> TarotAPIRes
                     "meaning": "Future outlook:...",
                 },
             ],
-            "summary": "..."
+            "summary": "...",
+            "tier": "llm"
         }
         ```
     """
+    if request.tier == "llm":
+        require_llm(TAROT_READER)
     try:
-        interpretations, summary = await TAROT_READER.generate_reading(
+        interpretations, summary, tier = await TAROT_READER.generate_reading(
             name=request.name,
             question=request.question,
             past_card=request.past_card,
             present_card=request.present_card,
             future_card=request.future_card,
+            tier=request.tier,
         )
 
-        return TarotAPIResponse(
-            interpretations=interpretations,
-            summary=summary,
-        )
+        return json_response(TarotAPIResponse(interpretations=interpretations, summary=summary, tier=tier))
 
     except HTTPException:
         raise
@@ -125,8 +330,135 @@ async def predict_tarot_interpretations(request: TarotAPIRequest) -> TarotAPIRes
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 
+@app.post("/predict/tarot-interpretations/stream", response_class=StreamingResponse, tags=["Predict API"])
+async def stream_tarot_interpretations(request: TarotAPIRequest) -> StreamingResponse:
+    """
+    | Method | Path                                    | Description                                  |
+    | ------ | --------------------------------------- | -------------------------------------------- |
+    | `POST` | `/predict/tarot-interpretations/stream` | Stream tarot interpretations as they are generated |
+
+    Params:
+        request (TarotAPIRequest): The request object containing the name, question, past_card, present_card, and future_card.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` of `partial` events followed by one `done` event holding the `TarotAPIResponse`, or an `error` event.
+
+    !!! note
+        Each `partial` event carries the `past`, `present`, `future` and `summary` fields generated so far (`null` until started).
+        Fast-tier and fallback readings arrive as a single complete `partial` event, and the `done` event's `tier`
+        is then `fast`.
+
+    !!! example "Example Events"
+
+        ```text
+        event: partial
+        data: {"past": "Past influence:...", "present": null, "future": null, "summary": null}
+
+        event: partial
+        data: {"past": "Past influence:...", "present": "Present situation:...", "future": null, "summary": null}
+
+        event: done
+        data: {"interpretations": [...], "summary": "...", "tier": "llm"}
+        ```
+    """
+    if request.tier == "llm":
+        require_llm(TAROT_READER)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            fields: dict = {}
+            tier = request.tier
+            async for fields, tier in TAROT_READER.stream_interpretation(
+                name=request.name,
+                question=request.question,
+                past_card_name=request.past_card.full_card_name,
+                present_card_name=request.present_card.full_card_name,
+                future_card_name=request.future_card.full_card_name,
+                tier=request.tier,
+            ):
+                yield format_sse(json.dumps(fields), event="partial")
+
+            response = TarotLLMResponse.model_validate(fields)
+            interpretations = TAROT_READER.build_interpretations(
+                request.past_card, request.present_card, request.future_card, response
+            )
+            result = TarotAPIResponse(interpretations=interpretations, summary=response.summary, tier=tier)
+            yield format_sse(result.model_dump_json(), event="done")
+
+        except HTTPException as e:
+            yield format_sse(json.dumps({"detail": e.detail}), event="error")
+        except Exception as e:
+            yield format_sse(json.dumps({"detail": f"Internal Server Error: {str(e)}"}), event="error")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post("/predict/tarot-interpretations/batch", response_model=TarotBatchAPIResponse, tags=["Predict API"])
+async def predict_tarot_interpretations_batch(request: TarotBatchAPIRequest, stream: bool = False) -> Response:
+    """
+    | Method | Path                                   | Description                                  |
+    | ------ | -------------------------------------- | -------------------------------------------- |
+    | `POST` | `/predict/tarot-interpretations/batch` | Get tarot interpretations for many requests  |
+
+    Params:
+        request (TarotBatchAPIRequest): The list of tarot requests (1 to `TAROT_BATCH_MAX_SIZE`, default 32) and an
+            optional concurrency limit (1-64).
+        stream (bool): Stream each item as JSON Lines (`application/x-ndjson`) as soon as it completes.
+
+    Returns:
+        TarotBatchAPIResponse: One item per request, in request order, holding either a `result` or an `error`.
+
+    !!! note
+        Items run concurrently with at most `concurrency` in flight (default `TarotReader.batch_concurrency`).
+        Per-model upstream limits come from the `FallbackPolicy` `concurrency` setting. A failed item does not
+        fail the batch. When streaming, items arrive in completion order; use `index` to match them up.
+        The batch takes one admission slot per reading it runs at once. Beyond its own slot it only takes slots
+        that are free, up to half the admission limit, and runs fewer readings at once when the service is busy.
+
+    !!! example "Example Request"
+
+        ```json
+        {
+            "requests": [
+                {
+                    "name": "John Doe",
+                    "question": "Will my current love last forever?",
+                    "past_card": {"name": "Chariot", "is_upright": false},
+                    "present_card": {"name": "The Fool", "is_upright": true},
+                    "future_card": {"name": "The Magician", "is_upright": true}
+                }
+            ],
+            "concurrency": 16
+        }
+        ```
+
+    !!! example "Example Response"
+
+        ```json
+        {
+            "results": [
+                {"index": 0, "result": {"interpretations": [...], "summary": "...", "tier": "llm"}, "error": null}
+            ]
+        }
+        ```
+    """
+    if any(item.tier == "llm" for item in request.requests):
+        require_llm(TAROT_READER)
+    concurrency = reserve(min(len(request.requests), request.concurrency or TarotReader.batch_concurrency))
+    if stream:
+
+        async def lines() -> AsyncIterator[str]:
+            async for item in TAROT_READER.iter_readings(request.requests, concurrency):
+                yield item.model_dump_json() + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    results = await TAROT_READER.generate_readings(request.requests, concurrency)
+    return json_response(TarotBatchAPIResponse(results=results))
+
+
 @app.post("/predict/numerology-interpretations", response_model=NumerologyAPIResponse, tags=["Predict API"])
-async def predict_numerology_interpretations(request: NumerologyAPIRequest) -> NumerologyAPIResponse:
+async def predict_numerology_interpretations(request: NumerologyAPIRequest) -> Response:
     """
     | Method | Path                                  | Description                                 |
     | ------ | ------------------------------------- | ------------------------------------------- |
@@ -159,6 +491,7 @@ async def predict_numerology_interpretations(request: NumerologyAPIRequest) -> N
         }
         ```
     """
+    require_llm(NUMEROLOGY_READER)
     try:
         numerology_meaning = await NUMEROLOGY_READER.analyze(
             name=request.name,
@@ -166,7 +499,7 @@ async def predict_numerology_interpretations(request: NumerologyAPIRequest) -> N
             question=request.question,
         )
 
-        return NumerologyAPIResponse(numerology_meaning=numerology_meaning)
+        return json_response(NumerologyAPIResponse(numerology_meaning=numerology_meaning))
 
     except HTTPException:
         raise
@@ -174,8 +507,219 @@ async def predict_numerology_interpretations(request: NumerologyAPIRequest) -> N
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 
+@app.post("/predict/numerology-interpretations/stream", response_class=StreamingResponse, tags=["Predict API"])
+async def stream_numerology_interpretations(request: NumerologyAPIRequest) -> StreamingResponse:
+    """
+    | Method | Path                                         | Description                                       |
+    | ------ | -------------------------------------------- | ------------------------------------------------- |
+    | `POST` | `/predict/numerology-interpretations/stream` | Stream numerology interpretations as they are generated |
+
+    Params:
+        request (NumerologyAPIRequest): The request object containing the name, dob, and question.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` of `delta` events with markdown chunks followed by one `done` event holding the `NumerologyAPIResponse`, or an `error` event.
+
+    !!! example "Example Events"
+
+        ```text
+        event: delta
+        data: {"text": "| Aspect Calculated  | Value |"}
+
+        event: done
+        data: {"numerology_meaning": "..."}
+        ```
+    """
+    require_llm(NUMEROLOGY_READER)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            chunks = []
+            async for delta in NUMEROLOGY_READER.stream_analysis(
+                name=request.name,
+                dob=request.dob,
+                question=request.question,
+            ):
+                chunks.append(delta)
+                yield format_sse(json.dumps({"text": delta}), event="delta")
+
+            result = NumerologyAPIResponse(numerology_meaning="".join(chunks))
+            yield format_sse(result.model_dump_json(), event="done")
+
+        except HTTPException as e:
+            yield format_sse(json.dumps({"detail": e.detail}), event="error")
+        except Exception as e:
+            yield format_sse(json.dumps({"detail": f"Internal Server Error: {str(e)}"}), event="error")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post("/predict/full-reading", response_model=FullReadingAPIResponse, tags=["Predict API"])
+async def predict_full_reading(request: FullReadingAPIRequest) -> Response:
+    """
+    | Method | Path                    | Description                                                  |
+    | ------ | ----------------------- | ------------------------------------------------------------ |
+    | `POST` | `/predict/full-reading` | Draw a three card spread and get tarot and numerology readings |
+
+    Params:
+        request (FullReadingAPIRequest): The request object containing the name, dob, question, and follow_numerology.
+
+    Returns:
+        FullReadingAPIResponse: The response object containing the drawn cards, interpretations, summary, and numerology meaning.
+
+    !!! note
+        The spread is drawn with `TarotDeck`, then `TarotReader` and `NumerologyReader` run concurrently, so the
+        latency is that of the slower reading rather than their sum. A failed numerology reading yields
+        `numerology_meaning: null` instead of failing the whole request.
+
+    !!! example "Example Request"
+
+        ```json
+        {
+            "name": "John Doe",
+            "dob": "1990-01-01",
+            "question": "Will my current love last forever?",
+            "follow_numerology": false
+        }
+        ```
+
+    !!! example "Example Response"
+
+        ```json
+        {
+            "cards": [...],
+            "interpretations": [...],
+            "summary": "...",
+            "numerology_meaning": "...",
+            "tier": "llm"
+        }
+        ```
+    """
+    require_llm(TAROT_READER, NUMEROLOGY_READER)
+    try:
+        past_card, present_card, future_card = draw_spread(request.name, request.dob, 3, request.follow_numerology)
+        tarot_result, numerology_result = await asyncio.gather(
+            TAROT_READER.generate_reading(
+                name=request.name,
+                question=request.question,
+                past_card=past_card,
+                present_card=present_card,
+                future_card=future_card,
+            ),
+            NUMEROLOGY_READER.analyze(name=request.name, dob=request.dob, question=request.question),
+            return_exceptions=True,
+        )
+        if isinstance(tarot_result, BaseException):
+            raise tarot_result
+        if isinstance(numerology_result, BaseException):
+            logger.error(f"Numerology reading failed: {numerology_result}")
+            numerology_result = None
+
+        interpretations, summary, tier = tarot_result
+        return json_response(
+            FullReadingAPIResponse(
+                cards=[past_card, present_card, future_card],
+                interpretations=interpretations,
+                summary=summary,
+                numerology_meaning=numerology_result,
+                tier=tier,
+            )
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+
+@app.post("/predict/full-reading/stream", response_class=StreamingResponse, tags=["Predict API"])
+async def stream_full_reading(request: FullReadingAPIRequest) -> StreamingResponse:
+    """
+    | Method | Path                           | Description                                            |
+    | ------ | ------------------------------ | ------------------------------------------------------ |
+    | `POST` | `/predict/full-reading/stream` | Stream a full reading as the tarot and numerology readings are generated |
+
+    Params:
+        request (FullReadingAPIRequest): The request object containing the name, dob, question, and follow_numerology.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` starting with a `cards` event, then interleaved tarot `partial`
+        and numerology `delta` events, and one final `done` event holding the `FullReadingAPIResponse`, or an `error` event.
+
+    !!! example "Example Events"
+
+        ```text
+        event: cards
+        data: {"cards": [...]}
+
+        event: delta
+        data: {"text": "| Aspect Calculated  | Value |"}
+
+        event: partial
+        data: {"past": "Past influence:...", "present": null, "future": null, "summary": null}
+
+        event: done
+        data: {"cards": [...], "interpretations": [...], "summary": "...", "numerology_meaning": "...", "tier": "llm"}
+        ```
+    """
+    require_llm(TAROT_READER, NUMEROLOGY_READER)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            cards = draw_spread(request.name, request.dob, 3, request.follow_numerology)
+            yield format_sse(CardsAPIResponse(cards=cards).model_dump_json(), event="cards")
+
+            fields: dict = {}
+            tier = "llm"
+            chunks: List[str] = []
+            numerology_failed = False
+            streams = {
+                "tarot": TAROT_READER.stream_interpretation(
+                    name=request.name,
+                    question=request.question,
+                    past_card_name=cards[0].full_card_name,
+                    present_card_name=cards[1].full_card_name,
+                    future_card_name=cards[2].full_card_name,
+                ),
+                "numerology": NUMEROLOGY_READER.stream_analysis(
+                    name=request.name,
+                    dob=request.dob,
+                    question=request.question,
+                ),
+            }
+            async for source, item in merge_streams(streams):
+                if isinstance(item, BaseException):
+                    if source == "tarot":
+                        raise item
+                    logger.error(f"Numerology reading failed: {item}")
+                    numerology_failed = True
+                elif source == "tarot":
+                    fields, tier = item
+                    yield format_sse(json.dumps(fields), event="partial")
+                else:
+                    chunks.append(item)
+                    yield format_sse(json.dumps({"text": item}), event="delta")
+
+            response = TarotLLMResponse.model_validate(fields)
+            result = FullReadingAPIResponse(
+                cards=cards,
+                interpretations=TAROT_READER.build_interpretations(*cards, response),
+                summary=response.summary,
+                numerology_meaning=None if numerology_failed else "".join(chunks),
+                tier=tier,
+            )
+            yield format_sse(result.model_dump_json(), event="done")
+
+        except HTTPException as e:
+            yield format_sse(json.dumps({"detail": e.detail}), event="error")
+        except Exception as e:
+            yield format_sse(json.dumps({"detail": f"Internal Server Error: {str(e)}"}), event="error")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @app.post("/tarot-cards/draw", response_model=CardsAPIResponse, tags=["Tarot Cards API"])
-async def draw_cards(request: CardsAPIRequest) -> CardsAPIResponse:
+async def draw_cards(request: CardsAPIRequest) -> Response:
     """
     | Method | Path                       | Description                                       |
     | ------ | -------------------------- | ------------------------------------------------- |
@@ -188,7 +732,8 @@ async def draw_cards(request: CardsAPIRequest) -> CardsAPIResponse:
         CardsAPIResponse: The response object containing the cards.
 
     !!! note
-        This function uses the `get_shuffled_cards` function to get the shuffled tarot cards.
+        Cards are drawn with `TarotDeck.draw_json`, seeded by the personal numerology number when
+        `follow_numerology` is set, and the body is joined from the catalog's pre-rendered card JSON.
 
     !!! example "Example Request"
 
@@ -223,18 +768,12 @@ async def draw_cards(request: CardsAPIRequest) -> CardsAPIResponse:
         }
         ```
     """
-    if request.follow_numerology:
-        universe_number = NUMEROLOGY_READER.calculate(request.name, request.dob)["personal_numerology"]
-    else:
-        universe_number = None
-
-    tarot_deck = TarotDeck(seed=universe_number)
-    shuffled_cards = tarot_deck.draw(count=request.count)
-    return CardsAPIResponse(cards=shuffled_cards)
+    tarot_deck = make_deck(request.name, request.dob, request.follow_numerology)
+    return Response(content=tarot_deck.draw_json(count=request.count), media_type="application/json")
 
 
 @app.get("/tarot-cards/get-card-info", response_model=CardInfoAPIResponse, tags=["Tarot Cards API"])
-def get_card_info(card_number: int) -> CardInfoAPIResponse:
+def get_card_info(card_number: int, if_none_match: Optional[str] = Header(default=None)) -> Response:
     """
     | Method | Path                                  | Description                                 |
     | ------ | ------------------------------------- | ------------------------------------------- |
@@ -242,12 +781,14 @@ def get_card_info(card_number: int) -> CardInfoAPIResponse:
 
     Params:
         card_number (int): The card number (Range: 1-78).
+        if_none_match (str, optional): `If-None-Match` header holding a previously returned `ETag`.
 
     Returns:
         CardInfoAPIResponse: The response object containing the card info.
 
     !!! note
-        This function uses the `TarotDeck` class to get the card info.
+        Responses are pre-rendered once from the in-memory card catalog and carry `ETag` and
+        `Cache-Control` headers. A matching `If-None-Match` returns `304 Not Modified` without a body.
 
     !!! example "Example Response"
 
@@ -273,10 +814,220 @@ def get_card_info(card_number: int) -> CardInfoAPIResponse:
     if not 1 <= card_number <= 78:
         raise HTTPException(status_code=400, detail="Card number must be between 1 and 78")
 
-    tarot_deck = TarotDeck()
-    card_info = tarot_deck.get_card_info(card_number)
-    return CardInfoAPIResponse(**card_info)
+    record = TarotDeck.catalog.get(card_number)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Card {card_number} not found")
+
+    headers = {"ETag": record.etag, "Cache-Control": CARD_INFO_CACHE_CONTROL}
+    if etag_matches(if_none_match, record.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=record.body, media_type="application/json", headers=headers)
+
+
+@app.get("/tarot-cards/cards", response_model=CardInfoBulkAPIResponse, tags=["Tarot Cards API"])
+def get_cards_info(
+    cards: str = "all",
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
+) -> Response:
+    """
+    | Method | Path                 | Description                                          |
+    | ------ | -------------------- | ---------------------------------------------------- |
+    | `GET`  | `/tarot-cards/cards` | Get the info of all or selected cards in one request |
+
+    Params:
+        cards (str, optional): Comma-separated card numbers (Range: 1-78), or `all`.
+        fields (str, optional): Comma-separated `CardInfoAPIResponse` fields to include; all by default.
+        if_none_match (str, optional): `If-None-Match` header holding a previously returned `ETag`.
+        accept_encoding (str, optional): `Accept-Encoding` header; `gzip` gets a compressed body.
+
+    Returns:
+        CardInfoBulkAPIResponse: The requested cards, in request order, each with its `card_number`.
+
+    !!! note
+        Bodies are joined from per-card fragments pre-rendered by the card catalog, and recent
+        selections are kept with their gzip encoding, so repeated requests do no rendering or
+        compression. Responses carry `ETag` and `Cache-Control`; a matching `If-None-Match`
+        returns `304 Not Modified` without a body.
+
+    !!! example "Example Request"
+
+        ```
+        GET /tarot-cards/cards?cards=all&fields=name,image_url,keywords
+        ```
+
+    !!! example "Example Response"
+
+        ```json
+        {
+            "cards": [
+                {
+                    "card_number": 1,
+                    "name": "The Fool",
+                    "image_url": "/tarot-cards/images/1.jpg",
+                    "keywords": ["freedom", "faith", "inexperience", "innocence"]
+                },
+                ...
+            ]
+        }
+        ```
+    """
+    card_numbers: Optional[List[int]] = None
+    if cards.strip().lower() != "all":
+        try:
+            card_numbers = [int(number) for number in cards.split(",") if number.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cards must be comma-separated card numbers or 'all'")
+        if not card_numbers or not all(1 <= number <= 78 for number in card_numbers):
+            raise HTTPException(status_code=400, detail="Card numbers must be between 1 and 78")
+    projection = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+
+    try:
+        bundle = TarotDeck.catalog.bundle(card_numbers, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    gzipped = accepts_gzip(accept_encoding)
+    gzip_etag = bundle.etag[:-1] + '-gzip"'
+    headers = {
+        "ETag": gzip_etag if gzipped else bundle.etag,
+        "Cache-Control": CARD_INFO_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(if_none_match, bundle.etag) or etag_matches(if_none_match, gzip_etag):
+        return Response(status_code=304, headers=headers)
+    if gzipped:
+        return Response(
+            content=bundle.gzipped, media_type="application/json", headers=headers | {"Content-Encoding": "gzip"}
+        )
+    return Response(content=bundle.body, media_type="application/json", headers=headers)
+
+
+@app.get("/tarot-cards/search", response_model=CardSearchAPIResponse, tags=["Tarot Cards API"])
+def search_cards(
+    q: str = Query(default="", max_length=200),
+    suit: Optional[Literal["trump", "cups", "pentacles", "swords", "wands"]] = None,
+    arcana: Optional[Literal["major", "minor"]] = None,
+    prefix: bool = True,
+    limit: int = Query(default=10, ge=1, le=78),
+    offset: int = Query(default=0, ge=0),
+) -> Response:
+    """
+    | Method | Path                  | Description                                            |
+    | ------ | --------------------- | ------------------------------------------------------ |
+    | `GET`  | `/tarot-cards/search` | Search cards by keywords, meanings and other metadata  |
+
+    Params:
+        q (str, optional): Search terms; a card must match every term. Empty lists the filtered cards.
+        suit (str, optional): Only cards of this suit (`trump` for the Major Arcana).
+        arcana (str, optional): Only `major` or `minor` arcana cards.
+        prefix (bool, optional): Also match words starting with each term (`medit` finds "meditation").
+        limit (int, optional): Page size (Range: 1-78).
+        offset (int, optional): Number of ranked results to skip.
+
+    Returns:
+        CardSearchAPIResponse: The total number of matches and the requested page of results.
+
+    !!! note
+        Results are ranked with BM25 over an inverted index built from the card catalog at
+        startup. Name, keywords and archetype matches weigh more than meanings or questions,
+        and prefix matches less than whole words. `card_number` can be passed to
+        `/tarot-cards/get-card-info` for the full card.
+
+    !!! example "Example Response"
+
+        ```json
+        {
+            "query": "meditation",
+            "total": 2,
+            "offset": 0,
+            "limit": 10,
+            "results": [
+                {
+                    "card_number": 40,
+                    "name": "Four of Swords",
+                    "arcana": "Minor Arcana",
+                    "suit": "Swords",
+                    "image_url": "/tarot-cards/images/40.jpg",
+                    "score": 6.1734,
+                    "matched_fields": ["keywords", "meanings"]
+                },
+                ...
+            ]
+        }
+        ```
+    """
+    result = TarotDeck.search.search(q, suit=suit, arcana=arcana, prefix=prefix, limit=limit, offset=offset)
+    return json_response(
+        CardSearchAPIResponse(
+            query=q,
+            total=result.total,
+            offset=offset,
+            limit=limit,
+            results=[
+                CardSearchHit(
+                    card_number=hit.record.number,
+                    name=hit.record.name,
+                    arcana=hit.record.info["arcana"],
+                    suit=hit.record.info["suit"],
+                    image_url=hit.record.image_url,
+                    score=hit.score,
+                    matched_fields=list(hit.fields),
+                )
+                for hit in result.hits
+            ],
+        )
+    )
+
+
+@app.get("/tarot-cards/image", response_class=RedirectResponse, status_code=307, tags=["Tarot Cards API"])
+def get_card_image(
+    card_number: int,
+    width: Optional[int] = Query(default=None, ge=1),
+    format: Optional[Literal["avif", "webp", "jpeg"]] = None,
+    accept: Optional[str] = Header(default=None),
+) -> RedirectResponse:
+    """
+    | Method | Path                 | Description                                         |
+    | ------ | -------------------- | --------------------------------------------------- |
+    | `GET`  | `/tarot-cards/image` | Redirect to the best pre-built image of a card      |
+
+    Params:
+        card_number (int): The card number (Range: 1-78).
+        width (int, optional): The rendered width in pixels; the smallest variant at least this wide is chosen.
+        format (str, optional): Force `avif`, `webp` or `jpeg` instead of negotiating from the `Accept` header.
+
+    Returns:
+        RedirectResponse: A `307` redirect to a content-hashed variant under `/tarot-cards/images/variants`,
+        served with `Cache-Control: public, max-age=31536000, immutable`.
+
+    !!! note
+        Variants are produced offline by `make images`. Until they are built this redirects to the original JPEG.
+
+    !!! example "Example Request"
+
+        ```text
+        GET /tarot-cards/image?card_number=1&width=200
+        Accept: image/avif,image/webp,*/*
+
+        307 Temporary Redirect
+        Location: /tarot-cards/images/variants/1-200w.3f2c9a1b7e.avif
+        ```
+    """
+    if not 1 <= card_number <= 78:
+        raise HTTPException(status_code=400, detail="Card number must be between 1 and 78")
+
+    variant = TarotDeck.image_variants.select(card_number, width, accept=accept, format=format)
+    if variant is None:
+        location = f"{TarotDeck.images_subpath}/{card_number}.jpg"
+    else:
+        location = TarotDeck.image_variants.url(variant)
+    headers = {"Cache-Control": CARD_IMAGE_CACHE_CONTROL, "Vary": "Accept"}
+    return RedirectResponse(location, status_code=307, headers=headers)
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(app, host="0.0.0.0", reload=True)
@@ -1,3 +1,4 @@
+import json
 import os
 from datetime import datetime
 
@@ -7,93 +8,74 @@ import streamlit as st
 BASE_API_URL = os.getenv("BASE_API_URL", "http://0.0.0.0:8000")
 
 
-def draw_three_cards(name: str, dob: str):
-    payload = {"name": name, "dob": dob, "count": 3, "follow_numerology": False}
-    try:
-        r = requests.post(
-            f"{BASE_API_URL}/tarot-cards/draw",
-            headers={"accept": "application/json", "Content-Type": "application/json"},
-            json=payload,
-            timeout=30,
-        )
-        if r.status_code == 200:
-            return r.json().get("cards", [])
-        st.error(f"Failed to draw cards: {r.status_code}")
-        return []
-    except requests.exceptions.RequestException as e:
-        st.error(f"Connection error: {e}")
-        return []
+def stream_events(path: str, payload: dict, timeout: int):
+    """Yield `(event, data)` pairs from a server-sent events endpoint."""
+    with requests.post(
+        f"{BASE_API_URL}{path}",
+        headers={"accept": "text/event-stream", "Content-Type": "application/json"},
+        json=payload,
+        timeout=timeout,
+        stream=True,
+    ) as r:
+        r.raise_for_status()
+        event, data = "message", []
+        for line in r.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:") :].strip()
+            elif line.startswith("data:"):
+                data.append(line[len("data:") :].strip())
+            elif not line and data:
+                yield event, json.loads("\n".join(data))
+                event, data = "message", []
+
+
+def render_partial_tarot(placeholder, fields: dict):
+    sections = [
+        f"**{title}**\n\n{fields[key]}"
+        for key, title in (("past", "Past"), ("present", "Present"), ("future", "Future"), ("summary", "Summary"))
+        if fields.get(key)
+    ]
+    placeholder.markdown("\n\n".join(sections))
 
 
 def get_tarot_and_numerology(name: str, dob: str, question: str):
-    """Perform 2-phase prediction with progress bar."""
+    """Perform a full reading in one streamed request with progress bar."""
     progress = st.progress(0, text="🔮 Starting your reading...")
     status = st.empty()
+    tarot_preview = st.empty()
+    numerology_preview = st.empty()
 
-    # Phase 1: Draw Cards
     status.text("🎴 Drawing your tarot cards...")
-    cards = draw_three_cards(name, dob)
-    progress.progress(33)
-    if not cards or len(cards) < 3:
-        st.error("Failed to draw cards")
-        return None
-
-    # Prepare cards for interpretation
-    payload_tarot = {
-        "name": name,
-        "question": question,
-        "past_card": {
-            "name": cards[0]["name"],
-            "is_upright": cards[0]["is_upright"],
-        },
-        "present_card": {
-            "name": cards[1]["name"],
-            "is_upright": cards[1]["is_upright"],
-        },
-        "future_card": {
-            "name": cards[2]["name"],
-            "is_upright": cards[2]["is_upright"],
-        },
-    }
-
-    # Phase 2: Tarot Interpretation
-    status.text("✨ Interpreting tarot reading...")
+    payload = {"name": name, "dob": dob, "question": question, "follow_numerology": False}
+    reading = None
+    chunks = []
     try:
-        r = requests.post(
-            f"{BASE_API_URL}/predict/tarot-interpretations",
-            headers={"accept": "application/json", "Content-Type": "application/json"},
-            json=payload_tarot,
-            timeout=60,
-        )
-        progress.progress(66)
-        if r.status_code != 200:
-            st.error(f"Tarot interpretation failed: {r.status_code}")
-            return None
-        tarot_data = r.json()
+        for event, data in stream_events("/predict/full-reading/stream", payload, timeout=60):
+            if event == "cards":
+                progress.progress(33)
+                status.text("✨ Interpreting tarot reading and calculating numerology insights...")
+            elif event == "partial":
+                progress.progress(66)
+                render_partial_tarot(tarot_preview, data)
+            elif event == "delta":
+                chunks.append(data["text"])
+                numerology_preview.markdown("".join(chunks))
+            elif event == "done":
+                reading = data
+            elif event == "error":
+                st.error(f"Reading failed: {data.get('detail')}")
     except requests.exceptions.RequestException as e:
-        st.error(f"Interpretation request failed: {e}")
+        st.error(f"Reading request failed: {e}")
+
+    tarot_preview.empty()
+    numerology_preview.empty()
+    if reading is None:
         return None
 
-    # Phase 3: Numerology
-    status.text("🔢 Calculating numerology insights...")
-    try:
-        r2 = requests.post(
-            f"{BASE_API_URL}/predict/numerology-interpretations",
-            headers={"accept": "application/json", "Content-Type": "application/json"},
-            json={"name": name, "dob": dob, "question": question},
-            timeout=30,
-        )
-        progress.progress(100)
-        if r2.status_code == 200:
-            tarot_data["numerology_meaning"] = r2.json().get("numerology_meaning", "")
-        else:
-            tarot_data["numerology_meaning"] = None
-    except requests.exceptions.RequestException:
-        tarot_data["numerology_meaning"] = None
-
-    tarot_data["original_cards"] = cards
+    progress.progress(100)
+    reading["original_cards"] = reading["cards"]
     status.text("✅ Reading complete.")
-    return tarot_data
+    return reading
 
 
 def display_card(card_data: dict, interpretation: dict):
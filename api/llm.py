@@ -1,9 +1,16 @@
+import importlib.util
 import logging
 import os
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 import dotenv
-import instructor
-import openai
+
+from api.ratelimit import RateGovernor, RateLimit, parse_rate_limits
+
+if TYPE_CHECKING:
+    import httpx
+    import instructor
+    import openai
 
 logger = logging.getLogger(__name__)
 
@@ -12,11 +19,117 @@ if IS_ENV_EXISTS:
     logger.info("Loading environment variables from .env file")
     dotenv.load_dotenv(".env")
 
-OPENAI_API_KEY = os.environ["OPENAI_API_KEY"]
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
-OPENAI_BASE_CLIENT = openai.AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
-OPENAI_CLIENT = instructor.from_openai(OPENAI_BASE_CLIENT)
+OPENAI_MAX_CONNECTIONS = int(os.environ.get("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.environ.get("OPENAI_KEEPALIVE_EXPIRY", "30"))
+OPENAI_CONNECT_TIMEOUT = float(os.environ.get("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_READ_TIMEOUT = float(os.environ.get("OPENAI_READ_TIMEOUT", "120"))
+OPENAI_MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", "2"))
+OPENAI_HTTP2 = os.environ.get("OPENAI_HTTP2", "false").lower() in ("1", "true", "yes")
 MODEL_LISTS = [
     "openai/gpt-oss-120b",
     "openai/gpt-oss-20b",
 ]
+# Client-side requests/tokens per minute per model; `LLM_RATE_LIMITS=model=rpm:tpm,...` overrides them.
+MODEL_RATE_LIMITS: Dict[str, RateLimit] = {
+    "openai/gpt-oss-120b": RateLimit(rpm=None, tpm=None),
+    "openai/gpt-oss-20b": RateLimit(rpm=None, tpm=None),
+} | parse_rate_limits(os.environ.get("LLM_RATE_LIMITS", ""))
+LLM_RATE_LIMIT_MAX_WAIT = float(os.environ.get("LLM_RATE_LIMIT_MAX_WAIT", "2"))
+RATE_GOVERNOR = RateGovernor(MODEL_RATE_LIMITS, max_wait=LLM_RATE_LIMIT_MAX_WAIT)
+
+
+class LLMNotConfiguredError(RuntimeError):
+    """Raised when the shared OpenAI client is needed but `OPENAI_API_KEY` is not set."""
+
+
+_http_client: Optional["httpx.AsyncClient"] = None
+_base_client: Optional["openai.AsyncOpenAI"] = None
+_instructor_client: Optional["instructor.AsyncInstructor"] = None
+
+
+def _build_http_client() -> "httpx.AsyncClient":
+    """Build the pooled HTTP client shared by every OpenAI client."""
+    import httpx
+
+    http2 = OPENAI_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("OPENAI_HTTP2 is set but the `h2` package is not installed, falling back to HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(OPENAI_READ_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+    )
+
+
+def llm_configured() -> bool:
+    """Whether the shared OpenAI client can be built, i.e. `OPENAI_API_KEY` is set."""
+    return bool(OPENAI_API_KEY)
+
+
+def get_openai_client() -> "openai.AsyncOpenAI":
+    """Return the process-wide OpenAI client, creating it (and importing `openai`) on first use."""
+    global _http_client, _base_client
+    if _base_client is None:
+        if not OPENAI_API_KEY:
+            raise LLMNotConfiguredError("OPENAI_API_KEY must be set to use the predict API")
+
+        import openai
+
+        _http_client = _build_http_client()
+        _base_client = openai.AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            base_url=OPENAI_BASE_URL,
+            max_retries=OPENAI_MAX_RETRIES,
+            http_client=_http_client,
+        )
+    return _base_client
+
+
+def get_instructor_client() -> "instructor.AsyncInstructor":
+    """Return the process-wide instructor client wrapping `get_openai_client()`."""
+    global _instructor_client
+    if _instructor_client is None:
+        import instructor
+
+        _instructor_client = instructor.from_openai(get_openai_client())
+    return _instructor_client
+
+
+async def aclose_clients() -> None:
+    """Close the shared connection pool; the next `get_*` call starts a fresh one."""
+    global _http_client, _base_client, _instructor_client
+    if _base_client is not None:
+        await _base_client.close()
+    _http_client = _base_client = _instructor_client = None
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Connection pool utilization of the shared HTTP client."""
+    stats: Dict[str, Any] = {
+        "open": _http_client is not None,
+        "http2": OPENAI_HTTP2,
+        "max_connections": OPENAI_MAX_CONNECTIONS,
+        "max_keepalive_connections": OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    }
+    pool = getattr(getattr(_http_client, "_transport", None), "_pool", None)
+    if pool is None:
+        return stats
+
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    stats.update(
+        connections=len(connections),
+        idle=idle,
+        active=len(connections) - idle,
+        waiting_requests=sum(1 for request in getattr(pool, "_requests", []) if request.connection is None),
+    )
+    return stats
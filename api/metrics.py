@@ -0,0 +1,177 @@
+import bisect
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with positional label values, e.g. `counter.inc("model-a", "timeout")`."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for labels, value in self._values.items():
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Histogram:
+    """Histogram over fixed buckets; `observe` is a bisect and two additions."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        values = self._values.get(labels)
+        if values is None:
+            values = self._values[labels] = [0.0] * (len(self.buckets) + 3)
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for labels, values in self._values.items():
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, float("inf")), values):
+                cumulative += count
+                yield f"{self.name}_bucket", {**base, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", base, values[-2]
+            yield f"{self.name}_count", base, values[-1]
+
+
+class MetricsRegistry:
+    """Metrics recorded in-process and rendered in the Prometheus text format.
+
+    Counters and histograms are updated on the hot paths. Gauges that other components
+    already track (cache hit counts, breaker state, ...) are read by collectors at scrape time
+    instead, so they cost nothing between scrapes.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Union[Counter, Histogram]] = {}
+        self._collectors: List[Tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Counter(name, help, labelnames)
+        return metric  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Histogram(name, help, labelnames, buckets)
+        return metric  # type: ignore[return-value]
+
+    def collector(self, name: str, help: str, collect: Callable[[], Iterable[Sample]], type: str = "gauge") -> None:
+        """Register a metric whose samples are produced by `collect()` at scrape time."""
+        self._collectors.append((name, type, help, collect))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(
+                f"{name}{_format_labels(labels)} {_format_value(value)}" for name, labels, value in metric.samples()
+            )
+        for name, type, help, collect in self._collectors:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type}")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status")
+)
+LLM_CALL_DURATION = REGISTRY.histogram(
+    "llm_call_duration_seconds", "Upstream LLM call latency by model and outcome.", ("model", "outcome")
+)
+LLM_FAILURES = REGISTRY.counter(
+    "llm_call_failures_total", "Failed upstream LLM calls by model and reason.", ("model", "reason")
+)
+LLM_FALLBACKS = REGISTRY.counter("llm_fallbacks_total", "Times the fallback chain moved past a model.", ("model",))
+FAST_READINGS = REGISTRY.counter(
+    "tarot_fast_readings_total", "Tarot readings composed without an LLM, by reason.", ("reason",)
+)
+LLM_TOKENS = REGISTRY.counter("llm_tokens_total", "Tokens used by reader, model and kind.", ("reader", "model", "kind"))
+
+
+def record_usage(reader: str, model: str, usage: Optional[object]) -> None:
+    """Count the prompt and completion tokens of an OpenAI `usage` object, when the response has one."""
+    if usage is None:
+        return
+    LLM_TOKENS.inc(reader, model, "prompt", amount=getattr(usage, "prompt_tokens", 0) or 0)
+    LLM_TOKENS.inc(reader, model, "completion", amount=getattr(usage, "completion_tokens", 0) or 0)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request, labelled by route template rather than raw path."""
+
+    def __init__(self, app: ASGIApp, histogram: Histogram = HTTP_REQUEST_DURATION) -> None:
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.histogram.observe(time.perf_counter() - started, scope["method"], route, str(status))
@@ -1,11 +1,19 @@
 from .api import (
     CardInfoAPIResponse,
+    CardInfoBulkAPIResponse,
     CardsAPIRequest,
     CardsAPIResponse,
+    CardSearchAPIResponse,
+    CardSearchHit,
+    FullReadingAPIRequest,
+    FullReadingAPIResponse,
     NumerologyAPIRequest,
     NumerologyAPIResponse,
     TarotAPIRequest,
     TarotAPIResponse,
+    TarotBatchAPIRequest,
+    TarotBatchAPIResponse,
+    TarotBatchItem,
 )
 from .llm import TarotLLMResponse
 from .tarot import TarotCard, TarotInterpretation
@@ -21,4 +29,12 @@ __all__ = [
     "NumerologyAPIRequest",
     "NumerologyAPIResponse",
     "CardInfoAPIResponse",
+    "CardInfoBulkAPIResponse",
+    "CardSearchAPIResponse",
+    "CardSearchHit",
+    "FullReadingAPIRequest",
+    "FullReadingAPIResponse",
+    "TarotBatchAPIRequest",
+    "TarotBatchAPIResponse",
+    "TarotBatchItem",
 ]
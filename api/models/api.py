@@ -1,11 +1,14 @@
-from typing import Dict, List, Optional
+import os
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 
 from api.models.tarot import TarotCard, TarotInterpretation
 
 from .utils import validate_date_string_format
 
+TAROT_BATCH_MAX_SIZE = int(os.getenv("TAROT_BATCH_MAX_SIZE", "32"))
+
 
 class TarotAPIRequest(BaseModel):
     name: str
@@ -13,11 +16,28 @@ class TarotAPIRequest(BaseModel):
     past_card: TarotCard
     present_card: TarotCard
     future_card: TarotCard
+    tier: Literal["llm", "fast"] = "llm"
 
 
 class TarotAPIResponse(BaseModel):
     interpretations: List[TarotInterpretation]
     summary: str
+    tier: Literal["llm", "fast"] = "llm"
+
+
+class TarotBatchAPIRequest(BaseModel):
+    requests: List[TarotAPIRequest] = Field(..., min_length=1, max_length=TAROT_BATCH_MAX_SIZE)
+    concurrency: Optional[int] = Field(default=None, ge=1, le=64)
+
+
+class TarotBatchItem(BaseModel):
+    index: int
+    result: Optional[TarotAPIResponse] = None
+    error: Optional[str] = None
+
+
+class TarotBatchAPIResponse(BaseModel):
+    results: List[TarotBatchItem]
 
 
 class NumerologyAPIRequest(BaseModel):
@@ -64,3 +84,44 @@ class CardInfoAPIResponse(BaseModel):
     elemental: Optional[str] = None
     mythical_spiritual: Optional[str] = None
     questions_to_ask: Optional[List[str]] = None
+
+
+class CardInfoBulkAPIResponse(BaseModel):
+    cards: List[Dict[str, Any]]
+
+
+class CardSearchHit(BaseModel):
+    card_number: int
+    name: str
+    arcana: str
+    suit: str
+    image_url: str
+    score: float
+    matched_fields: List[str]
+
+
+class CardSearchAPIResponse(BaseModel):
+    query: str
+    total: int
+    offset: int
+    limit: int
+    results: List[CardSearchHit]
+
+
+class FullReadingAPIRequest(BaseModel):
+    name: str
+    dob: str
+    question: str
+    follow_numerology: bool = False
+
+    @field_validator("dob")
+    def validate_dob_format(cls, value: str) -> str:
+        return validate_date_string_format(value)
+
+
+class FullReadingAPIResponse(BaseModel):
+    cards: List[TarotCard]
+    interpretations: List[TarotInterpretation]
+    summary: str
+    numerology_meaning: Optional[str] = None
+    tier: Literal["llm", "fast"] = "llm"
@@ -1,14 +1,18 @@
+from functools import cached_property
 from typing import Literal, Optional
 
-from pydantic import BaseModel, computed_field
+from pydantic import BaseModel, ConfigDict, computed_field
 
 
 class TarotCard(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     is_upright: bool
     image_url: Optional[str] = None
 
     @computed_field
+    @cached_property
     def full_card_name(self) -> str:
         if self.is_upright:
             return f"{self.name} (UPRIGHT)"
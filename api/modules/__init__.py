@@ -1,3 +1,4 @@
+from .numerology import NumerologyEngine
 from .predict import NumerologyReader, TarotReader
 from .tarot_cards import TarotDeck
 
@@ -5,4 +6,5 @@ __all__ = [
     "TarotDeck",
     "TarotReader",
     "NumerologyReader",
+    "NumerologyEngine",
 ]
@@ -0,0 +1,4 @@
+from .engine import NumerologyEngine, digital_root
+from .memo import NumerologyMemo
+
+__all__ = ["NumerologyEngine", "NumerologyMemo", "digital_root"]
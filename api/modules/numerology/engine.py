@@ -0,0 +1,147 @@
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Sequence, Tuple
+
+from unidecode import unidecode
+
+from .memo import NumerologyMemo
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_ALPHA = bytes(c for c in range(128) if chr(c).isalpha())
+_DIGITS = b"0123456789"
+_NON_ALPHA = bytes(c for c in range(256) if c not in _ALPHA)
+_NON_DIGIT = bytes(c for c in range(256) if c not in _DIGITS)
+
+
+def digital_root(value: int) -> int:
+    """Repeated digit sum of a non-negative integer, in closed form (values <= 9 are kept)."""
+    return value if value <= 9 else 1 + (value - 1) % 9
+
+
+def _digit_sum(value: int) -> int:
+    return sum(str(value).encode()) - 48 * len(str(value))
+
+
+class NumerologyEngine:
+    """Numerology number calculation.
+
+    The core path works on ASCII bytes: letters are valued `ord(c) - 64` by summing the byte
+    string once, digits are summed the same way, and the personal number is a closed-form
+    digital root. Explanation strings are only built when asked for. `calculate_batch` does
+    the same over whole arrays with NumPy.
+
+    `calculate_memoized` serves repeat users from a bounded memo keyed by the space-stripped,
+    upper-cased name, the DOB and the current year, so entries roll over on January 1.
+    """
+
+    _year: Tuple[int, int, float] = (0, 0, 0.0)
+    memo: NumerologyMemo = NumerologyMemo()
+
+    @staticmethod
+    def normalize_name(name: str) -> bytes:
+        """Upper-case, transliterate and strip spaces, as ASCII bytes."""
+        return unidecode(name.upper().replace(" ", "")).encode("ascii", "ignore")
+
+    @classmethod
+    def current_year(cls) -> Tuple[int, int]:
+        """Current year and its digit sum, recomputed only when the year rolls over."""
+        year, year_sum, valid_until = cls._year
+        if time.time() >= valid_until:
+            now = datetime.now()
+            year = now.year
+            year_sum = _digit_sum(year)
+            valid_until = datetime(year + 1, 1, 1).timestamp()
+            cls._year = (year, year_sum, valid_until)
+        return year, year_sum
+
+    @classmethod
+    def calculate(cls, name: str, dob: str, explain: bool = False) -> Dict[str, Any]:
+        """Calculate numerological values from name and date of birth, optionally with explanation."""
+        letters = cls.normalize_name(name).translate(None, _NON_ALPHA)
+        name_sum = sum(letters) - 64 * len(letters)
+
+        dob_digits = dob.encode("ascii", "ignore").translate(None, _NON_DIGIT)
+        dob_sum = sum(dob_digits) - 48 * len(dob_digits)
+
+        total_sum = name_sum + dob_sum
+        personal = digital_root(total_sum)
+        current_year, current_year_sum = cls.current_year()
+
+        result: Dict[str, Any] = {
+            "name_numerology": name_sum,
+            "dob_numerology": dob_sum,
+            "personal_numerology": personal,
+            "current_year_numerology": current_year_sum,
+        }
+        if explain:
+            result["_explanation"] = cls._explain(letters, dob_digits, total_sum, current_year)
+        return result
+
+    @classmethod
+    def calculate_memoized(cls, name: str, dob: str) -> Dict[str, Any]:
+        """Memoized `calculate(name, dob, explain=True)`. The returned dict is shared: do not mutate it."""
+        key = (name.upper().replace(" ", ""), dob, cls.current_year()[0])
+        return cls.memo.get_or_compute(key, lambda: cls.calculate(name, dob, explain=True))
+
+    @staticmethod
+    def _explain(letters: bytes, dob_digits: bytes, total_sum: int, current_year: int) -> Dict[str, str]:
+        name_sum = sum(letters) - 64 * len(letters)
+        name_expl = " + ".join(f"{chr(c)}({c - 64})" for c in letters) + f" = {name_sum}"
+
+        dob_sum = sum(dob_digits) - 48 * len(dob_digits)
+        dob_expl = " + ".join(chr(d) for d in dob_digits) + f" = {dob_sum}"
+
+        reduction_steps = [str(total_sum)]
+        while total_sum > 9:
+            total_sum = _digit_sum(total_sum)
+            reduction_steps.append(str(total_sum))
+
+        year_digits = str(current_year)
+        year_expl = " + ".join(year_digits) + f" = {_digit_sum(current_year)}"
+
+        return {
+            "name": name_expl,
+            "dob": dob_expl,
+            "personal": " → ".join(reduction_steps),
+            "current_year": year_expl,
+        }
+
+    @classmethod
+    def calculate_batch(cls, names: Sequence[str], dobs: Sequence[str]) -> Dict[str, "np.ndarray"]:
+        """Vectorized `calculate` over parallel sequences of names and dates of birth.
+
+        Requires NumPy (`analytics` extra). Returns one integer array per numerology number.
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("Batch numerology requires NumPy: install the `analytics` extra") from e
+
+        if len(names) != len(dobs):
+            raise ValueError("names and dobs must have the same length")
+
+        letter_values = np.zeros(256, dtype=np.int64)
+        letter_values[list(_ALPHA)] = np.frombuffer(_ALPHA, dtype=np.uint8).astype(np.int64) - 64
+        digit_values = np.zeros(256, dtype=np.int64)
+        digit_values[list(_DIGITS)] = np.arange(10)
+
+        def segment_sums(chunks: Sequence[bytes], values: "np.ndarray") -> "np.ndarray":
+            lengths = np.fromiter((len(chunk) for chunk in chunks), dtype=np.int64, count=len(chunks))
+            buffer = np.frombuffer(b"".join(chunks), dtype=np.uint8)
+            cumulative = np.concatenate(([0], np.cumsum(values[buffer])))
+            ends = np.cumsum(lengths)
+            return cumulative[ends] - cumulative[ends - lengths]
+
+        name_sums = segment_sums([cls.normalize_name(name) for name in names], letter_values)
+        dob_sums = segment_sums([dob.encode("ascii", "ignore") for dob in dobs], digit_values)
+        totals = name_sums + dob_sums
+        _, current_year_sum = cls.current_year()
+
+        return {
+            "name_numerology": name_sums,
+            "dob_numerology": dob_sums,
+            "personal_numerology": np.where(totals > 9, 1 + (totals - 1) % 9, totals),
+            "current_year_numerology": np.full(len(totals), current_year_sum, dtype=np.int64),
+        }
@@ -1,4 +1,29 @@
+from .cache import MemoryReadingCache, ReadingCache, SQLiteReadingCache
+from .composer import ReadingComposer
+from .fallback import AllModelsFailedError, FallbackPolicy
+from .health import CircuitOpenError, HealthTracker, is_upstream_failure
 from .numerology import NumerologyReader
+from .prompts import Prompt, PromptAssembler, PromptReport
+from .semantic import HashedNgramFeaturizer, SemanticCache
+from .singleflight import SingleFlight
 from .tarot import TarotReader
 
-__all__ = ["TarotReader", "NumerologyReader"]
+__all__ = [
+    "TarotReader",
+    "NumerologyReader",
+    "ReadingCache",
+    "MemoryReadingCache",
+    "SQLiteReadingCache",
+    "SingleFlight",
+    "FallbackPolicy",
+    "AllModelsFailedError",
+    "HealthTracker",
+    "CircuitOpenError",
+    "is_upstream_failure",
+    "PromptAssembler",
+    "Prompt",
+    "PromptReport",
+    "ReadingComposer",
+    "SemanticCache",
+    "HashedNgramFeaturizer",
+]
@@ -0,0 +1,180 @@
+import logging
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from api.models import TarotLLMResponse
+from api.modules.tarot_cards import CardCatalog, CardRecord
+
+logger = logging.getLogger(__name__)
+
+POSITIONS = ("past", "present", "future")
+ORIENTATION_SUFFIXES = {" (UPRIGHT)": True, " (REVERSED)": False}
+POSITION_LEADS = {
+    "past": "Behind you lies {card}",
+    "present": "At the heart of the matter is {card}",
+    "future": "Ahead, {card} comes into view",
+}
+
+
+def _lower_first(text: str) -> str:
+    """Lower-case the first letter of a sentence fragment, unless it starts an acronym."""
+    if len(text) > 1 and text[0].isupper() and not text[1].isupper():
+        return text[0].lower() + text[1:]
+    return text
+
+
+def _sentence(text: str) -> str:
+    text = text.strip()
+    return text if text.endswith((".", "!", "?")) else text + "."
+
+
+def _join(items: Sequence[str]) -> str:
+    if len(items) < 2:
+        return "".join(items)
+    return ", ".join(items[:-1]) + " and " + items[-1]
+
+
+def _pick(items: Sequence[str], start: int, count: int) -> List[str]:
+    return [items[(start + offset) % len(items)] for offset in range(min(count, len(items)))]
+
+
+def parse_card_name(full_card_name: str) -> Tuple[str, bool]:
+    """Split a `TarotCard.full_card_name` such as "The Fool (UPRIGHT)" into name and orientation."""
+    for suffix, is_upright in ORIENTATION_SUFFIXES.items():
+        if full_card_name.upper().endswith(suffix):
+            return full_card_name[: -len(suffix)].strip(), is_upright
+    return full_card_name.strip(), True
+
+
+class _Card(NamedTuple):
+    theme: str
+    question: Optional[str]
+    fragments: Dict[Tuple[bool, str], str]
+
+
+class _ComposerState(NamedTuple):
+    records: Tuple[CardRecord, ...]
+    cards: Dict[str, _Card]
+
+
+class ReadingComposer:
+    """Deterministic, zero-LLM tarot readings composed from the card catalog.
+
+    For every card, orientation and position a paragraph is rendered once from the card's
+    keywords and its light (upright) or shadow (reversed) meanings, with the upright
+    fortune-telling lines added to future positions. `compose()` only looks the three
+    paragraphs up and writes a short summary around the reader's name and question, so a
+    reading takes microseconds. Unknown card names get a generic paragraph rather than an
+    error.
+
+    The fragments are built on first use and rebuilt whenever the catalog has been reloaded.
+    """
+
+    def __init__(self, catalog: CardCatalog) -> None:
+        self.catalog = catalog
+        self._state: Optional[_ComposerState] = None
+        self._lock = threading.Lock()
+        self.readings = 0
+
+    def _render(self, record: CardRecord, is_upright: bool, position: str) -> str:
+        info: Dict[str, Any] = record.info
+        meanings = (info.get("meanings") or {}).get("light" if is_upright else "shadow") or []
+        keywords = info.get("keywords") or []
+        offset = POSITIONS.index(position) * 2
+        card = record.name if is_upright else f"{record.name}, reversed"
+
+        parts = [POSITION_LEADS[position].format(card=card)]
+        if keywords:
+            parts[0] += f", a card of {_join(keywords[:3])}"
+        parts[0] = _sentence(parts[0])
+
+        picked = [_lower_first(meaning) for meaning in _pick(meanings, offset, 2)]
+        if picked and position == "past":
+            tail = "shaped where you stand now" if is_upright else "may still be holding you back"
+            parts.append(_sentence(f"It speaks of {_join(picked)}, which {tail}"))
+        elif picked and position == "present":
+            lead = "Right now the cards point to" if is_upright else "Right now, be wary of"
+            parts.append(_sentence(f"{lead} {_join(picked)}"))
+        elif picked:
+            lead = "What lies ahead favours" if is_upright else "In the time ahead, watch for"
+            parts.append(_sentence(f"{lead} {_join(picked)}"))
+
+        if position == "future" and is_upright and info.get("fortune_telling"):
+            parts.append(_sentence(info["fortune_telling"][0]))
+        return " ".join(parts)
+
+    def _build(self, records: Tuple[CardRecord, ...]) -> _ComposerState:
+        cards = {
+            record.name.casefold(): _Card(
+                theme=(record.info.get("keywords") or [record.name])[0],
+                question=(record.info.get("questions_to_ask") or [None])[0],
+                fragments={
+                    (is_upright, position): self._render(record, is_upright, position)
+                    for is_upright in (True, False)
+                    for position in POSITIONS
+                },
+            )
+            for record in records
+        }
+        logger.info(f"Rendered fast reading fragments for {len(cards)} tarot cards")
+        return _ComposerState(records=records, cards=cards)
+
+    @property
+    def _loaded(self) -> _ComposerState:
+        records = self.catalog.records
+        state = self._state
+        if state is None or state.records is not records:
+            with self._lock:
+                if self._state is None or self._state.records is not records:
+                    self._state = self._build(records)
+                state = self._state
+        return state
+
+    def load(self) -> "ReadingComposer":
+        """Render the fragments eagerly (no-op if the catalog has not changed since)."""
+        _ = self._loaded
+        return self
+
+    def _lookup(self, state: _ComposerState, name: str) -> Optional[_Card]:
+        key = name.casefold()
+        return state.cards.get(key) or state.cards.get(f"the {key}")
+
+    def compose(
+        self, name: str, question: str, past_card_name: str, present_card_name: str, future_card_name: str
+    ) -> TarotLLMResponse:
+        """Compose a reading for three `TarotCard.full_card_name` values."""
+        state = self._loaded
+        fields: Dict[str, str] = {}
+        themes: List[str] = []
+        reversed_count = 0
+        question_to_ask: Optional[str] = None
+        for position, full_card_name in zip(POSITIONS, (past_card_name, present_card_name, future_card_name)):
+            card_name, is_upright = parse_card_name(full_card_name)
+            card = self._lookup(state, card_name)
+            reversed_count += not is_upright
+            if card is None:
+                orientation = "upright" if is_upright else "reversed"
+                fields[position] = _sentence(POSITION_LEADS[position].format(card=f"{card_name}, {orientation}"))
+                themes.append(card_name)
+                continue
+            fields[position] = card.fragments[(is_upright, position)]
+            themes.append(card.theme)
+            if position == "present":
+                question_to_ask = card.question
+
+        summary = [
+            f'{name}, on "{question.strip()}": the reading moves from {themes[0]} through {themes[1]} toward {themes[2]}.'
+        ]
+        if reversed_count >= 2:
+            summary.append("With most cards reversed, take time to reflect before you act.")
+        else:
+            summary.append("With the cards largely upright, the way forward is open.")
+        if question_to_ask:
+            summary.append(f"A question to sit with: {question_to_ask}")
+
+        self.readings += 1
+        return TarotLLMResponse(summary=" ".join(summary), **fields)
+
+    def stats(self) -> Dict[str, Any]:
+        """Number of cards with rendered fragments and readings composed."""
+        return {"cards": len(self._loaded.cards), "readings": self.readings}
@@ -0,0 +1,324 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Literal, Optional, Sequence, TypeVar
+
+from api.admission import report_upstream
+from api.llm import RATE_GOVERNOR
+from api.metrics import LLM_CALL_DURATION, LLM_FAILURES, LLM_FALLBACKS
+from api.ratelimit import RateGovernor, RateLimitedError
+
+from .health import DEFAULT_HEALTH, CircuitOpenError, HealthTracker, is_upstream_failure
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+FallbackMode = Literal["sequential", "hedged", "race"]
+
+
+class AllModelsFailedError(Exception):
+    """Raised when every model in the fallback chain failed."""
+
+    def __init__(self, errors: Dict[str, BaseException]) -> None:
+        self.errors = errors
+        super().__init__("; ".join(f"{model}: {error!r}" for model, error in errors.items()) or "no models configured")
+
+
+class FallbackPolicy:
+    """Strategy for walking a reader's model list.
+
+    Modes:
+        - `sequential`: try each model in order, the next one only after the previous failed.
+        - `hedged`: start the next model when the current one is slower than its observed
+          latency percentile (or fails), first valid result wins.
+        - `race`: start every model at once, first valid result wins.
+
+    In every mode each attempt is bounded by its per-model timeout, and losing attempts are
+    cancelled as soon as a winner is known. `concurrency` optionally caps how many calls to
+    a model may be in flight at once; further attempts queue for a free slot.
+
+    Outcomes are reported to `health` (shared between policies by default), where only
+    timeouts, transport errors and 429/5xx answers count as model failures: models whose
+    circuit breaker is open are skipped, and the rest are tried healthiest first. They also
+    feed the admission controller that admitted the current request, if any.
+
+    Every attempt first reserves a request and its estimated `cost` in tokens from
+    `governor` (the process-wide `api.llm.RATE_GOVERNOR` by default), waiting briefly for
+    headroom. Models that cannot get it in time are tried last and fail fast with
+    `RateLimitedError`, before any HTTP call; callers report the tokens every attempt used,
+    including failed ones, with `settle()`.
+    """
+
+    def __init__(
+        self,
+        mode: FallbackMode = "sequential",
+        timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: Optional[float] = None,
+        hedge_percentile: float = 0.95,
+        hedge_delay: float = 10.0,
+        min_samples: int = 20,
+        window: int = 200,
+        concurrency: Optional[Dict[str, int]] = None,
+        health: Optional[HealthTracker] = None,
+        governor: Optional[RateGovernor] = None,
+    ) -> None:
+        if mode not in ("sequential", "hedged", "race"):
+            raise ValueError(f"Unknown fallback mode: {mode}")
+        self.mode = mode
+        self.timeouts = dict(timeouts or {})
+        self.default_timeout = default_timeout
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.concurrency = dict(concurrency or {})
+        self.health = health if health is not None else DEFAULT_HEALTH
+        self.governor = governor if governor is not None else RATE_GOVERNOR
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+
+    def timeout_for(self, model: str) -> Optional[float]:
+        """Per-model timeout, falling back to the default timeout."""
+        return self.timeouts.get(model, self.default_timeout)
+
+    def hedge_delay_for(self, model: str) -> float:
+        """Seconds to wait on `model` before hedging with the next one."""
+        samples = self._latencies.get(model)
+        if not samples or len(samples) < self.min_samples:
+            return self.hedge_delay
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(self.hedge_percentile * len(ordered)))]
+
+    def _observe(self, model: str, latency: float) -> None:
+        samples = self._latencies.get(model)
+        if samples is None:
+            samples = self._latencies[model] = deque(maxlen=self.window)
+        samples.append(latency)
+
+    def _slot(self, model: str) -> Optional[asyncio.Semaphore]:
+        limit = self.concurrency.get(model)
+        if limit is None:
+            return None
+        slot = self._slots.get(model)
+        if slot is None:
+            slot = self._slots[model] = asyncio.Semaphore(limit)
+        return slot
+
+    def settle(self, model: str, cost: int, tokens: int) -> None:
+        """Correct the rate limiter's token estimate `cost` for an attempt with the `tokens` it used."""
+        self.governor.settle(model, cost, tokens)
+
+    def _order(self, models: Sequence[str], cost: int) -> List[str]:
+        return self.governor.order(self.health.order(models), cost)
+
+    async def _admit(self, model: str, cost: int) -> None:
+        """Take the model's circuit breaker slot and rate limit reservation, or raise."""
+        if not self.health.acquire(model):
+            raise CircuitOpenError(model)
+        try:
+            await self.governor.acquire(model, cost)
+        except BaseException:
+            self.health.release(model)
+            raise
+
+    async def _attempt(self, model: str, call: Callable[[str], Awaitable[T]], cost: int = 0) -> T:
+        await self._admit(model, cost)
+        called = False
+
+        async def invoke(model: str) -> T:
+            nonlocal called
+            called = True
+            return await call(model)
+
+        try:
+            slot = self._slot(model)
+            if slot is None:
+                return await self._timed(model, invoke)
+            async with slot:
+                return await self._timed(model, invoke)
+        except asyncio.CancelledError:
+            self.health.release(model)
+            raise
+        except Exception as e:
+            self._report_error(model, e)
+            raise
+        finally:
+            # Once `call` runs it settles the reservation itself; refund it when it never did.
+            if not called:
+                self.settle(model, cost, 0)
+
+    async def _timed(self, model: str, call: Callable[[str], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(call(model), timeout=self.timeout_for(model))
+        except Exception:
+            LLM_CALL_DURATION.observe(time.perf_counter() - started, model, "failure")
+            raise
+        latency = time.perf_counter() - started
+        LLM_CALL_DURATION.observe(latency, model, "success")
+        self._observe(model, latency)
+        self.health.record_success(model, latency)
+        report_upstream(latency)
+        return result
+
+    async def _close(self, model: str, iterator: AsyncIterator[T], cost: int, opened: bool) -> None:
+        """Close a stream that failed before its first item; refund the reservation if it never started."""
+        with contextlib.suppress(Exception):
+            await iterator.aclose()  # type: ignore[attr-defined]
+        if not opened:
+            self.settle(model, cost, 0)
+
+    def _report_error(self, model: str, error: BaseException) -> None:
+        """Count an upstream failure against the model's health; other errors only give its claim back."""
+        if is_upstream_failure(error):
+            self.health.record_failure(model)
+        else:
+            self.health.release(model)
+        report_upstream(error=error)
+
+    @staticmethod
+    def _record_failure(model: str, error: BaseException) -> None:
+        LLM_FAILURES.inc(model, type(error).__name__)
+        if isinstance(error, CircuitOpenError):
+            logger.debug(f"Skipping model {model}: circuit breaker is open")
+        elif isinstance(error, RateLimitedError):
+            logger.info(f"Skipping model {model}: {error}")
+        else:
+            logger.error(f"Model {model} failed: {error!r}")
+
+    async def run(self, models: Sequence[str], call: Callable[[str], Awaitable[T]], cost: int = 0) -> T:
+        """Return the first valid `call(model)` result according to the configured mode.
+
+        `cost` is the estimated number of tokens of one call, reserved against each model's
+        tokens-per-minute budget.
+        """
+        models = self._order(models, cost)
+        if self.mode == "sequential":
+            return await self._run_sequential(models, call, cost)
+        return await self._run_concurrent(models, call, cost)
+
+    async def _run_sequential(self, models: Sequence[str], call: Callable[[str], Awaitable[T]], cost: int) -> T:
+        errors: Dict[str, BaseException] = {}
+        for model in models:
+            try:
+                return await self._attempt(model, call, cost)
+            except Exception as e:
+                errors[model] = e
+                self._record_failure(model, e)
+                if model != models[-1]:
+                    LLM_FALLBACKS.inc(model)
+                    logger.info("Switching to next model")
+        raise AllModelsFailedError(errors)
+
+    async def _run_concurrent(self, models: Sequence[str], call: Callable[[str], Awaitable[T]], cost: int) -> T:
+        queue: List[str] = list(models)
+        pending: Dict["asyncio.Task[T]", str] = {}
+        errors: Dict[str, BaseException] = {}
+        last_started: Optional[str] = None
+
+        def launch() -> None:
+            nonlocal last_started
+            last_started = queue.pop(0)
+            pending[asyncio.create_task(self._attempt(last_started, call, cost))] = last_started
+
+        try:
+            while queue and (self.mode == "race" or not pending):
+                launch()
+
+            while pending:
+                timeout = self.hedge_delay_for(last_started) if queue and last_started else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    LLM_FALLBACKS.inc(last_started)
+                    logger.info(f"Model {last_started} is slow, hedging with next model")
+                    launch()
+                    continue
+
+                for task in done:
+                    model = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    errors[model] = error
+                    self._record_failure(model, error)
+                    if queue:
+                        LLM_FALLBACKS.inc(model)
+                        logger.info("Switching to next model")
+                        launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        raise AllModelsFailedError(errors)
+
+    async def stream(
+        self, models: Sequence[str], open_stream: Callable[[str], AsyncIterator[T]], cost: int = 0
+    ) -> AsyncIterator[T]:
+        """Yield items from the first model whose stream produces a first item in time.
+
+        Streams can only fall back before anything has been emitted, so models are always
+        tried one at a time here; the per-model timeout bounds the time to the first item.
+        """
+        errors: Dict[str, BaseException] = {}
+        models = self._order(models, cost)
+        for model in models:
+            try:
+                await self._admit(model, cost)
+            except (CircuitOpenError, RateLimitedError) as e:
+                errors[model] = e
+                self._record_failure(model, e)
+                continue
+
+            started = time.perf_counter()
+            iterator = open_stream(model).__aiter__()
+            opened = False
+
+            async def first_item() -> T:
+                nonlocal opened
+                opened = True
+                return await iterator.__anext__()
+
+            try:
+                first = await asyncio.wait_for(first_item(), timeout=self.timeout_for(model))
+            except Exception as e:
+                LLM_CALL_DURATION.observe(time.perf_counter() - started, model, "failure")
+                self._report_error(model, e)
+                errors[model] = e
+                self._record_failure(model, e)
+                if model != models[-1]:
+                    LLM_FALLBACKS.inc(model)
+                    logger.info("Switching to next model")
+                await self._close(model, iterator, cost, opened)
+                continue
+            except BaseException:
+                self.health.release(model)
+                await self._close(model, iterator, cost, opened)
+                raise
+
+            try:
+                yield first
+                async for item in iterator:
+                    yield item
+            except Exception as e:
+                LLM_CALL_DURATION.observe(time.perf_counter() - started, model, "failure")
+                LLM_FAILURES.inc(model, type(e).__name__)
+                self._report_error(model, e)
+                raise
+            except BaseException:
+                self.health.release(model)
+                raise
+            finally:
+                with contextlib.suppress(Exception):
+                    await iterator.aclose()  # type: ignore[attr-defined]
+            latency = time.perf_counter() - started
+            LLM_CALL_DURATION.observe(latency, model, "success")
+            self._observe(model, latency)
+            self.health.record_success(model, latency)
+            report_upstream(latency)
+            return
+
+        raise AllModelsFailedError(errors)
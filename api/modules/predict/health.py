@@ -0,0 +1,211 @@
+import logging
+import time
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence
+
+from api.utils import class_names
+
+logger = logging.getLogger(__name__)
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+class CircuitOpenError(Exception):
+    """Raised when a model is skipped because its circuit breaker is open."""
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+        super().__init__(f"Circuit breaker for {model} is open")
+
+
+# Exceptions, by top-level package and class name, raised when no answer came back from the
+# upstream at all; matched by name so that neither SDK has to be imported here.
+_TRANSPORT_ERRORS = frozenset({"httpx.TransportError", "openai.APIConnectionError"})
+
+
+def is_upstream_failure(error: Optional[BaseException]) -> bool:
+    """Whether `error` says the model is unhealthy: a timeout, a transport error, or a 429/5xx answer.
+
+    Client-side errors, such as a response failing validation or a missing API key, do not
+    count. Wrapped errors are classified by their causes as well.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status = getattr(error, "status_code", None)
+        if isinstance(error, TimeoutError) or (isinstance(status, int) and (status == 429 or status >= 500)):
+            return True
+        if any(name in _TRANSPORT_ERRORS for name in class_names(error)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class ModelHealth:
+    """Recent health of one model: EWMAs of its error rate and latency, and its breaker state."""
+
+    def __init__(self) -> None:
+        self.state: BreakerState = "closed"
+        self.error_rate = 0.0
+        self.latency: Optional[float] = None
+        self.samples = 0
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.updated_at = 0.0
+        self.probing = False
+        self.trips = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "error_rate": round(self.error_rate, 4),
+            "latency": None if self.latency is None else round(self.latency, 4),
+            "samples": self.samples,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+        }
+
+
+class HealthTracker:
+    """Per-model health tracking and circuit breaking for the fallback chain.
+
+    Every attempt updates the model's error-rate and latency EWMAs; only upstream failures
+    (see `is_upstream_failure`) count as errors. A model trips open after
+    `max_consecutive_failures` failures in a row, or once its error rate reaches
+    `failure_threshold` over at least `min_samples` attempts. Open models are skipped for
+    `cooldown` seconds, then half-open: a single probe request is let through, closing the
+    breaker on success and re-opening it on failure.
+
+    `order()` puts healthy models first, then degraded ones (error rate above
+    `degraded_threshold`, or latency above `slow_latency`), then open ones, keeping the
+    configured order within each group. Error rates halve every `recovery` seconds without
+    new samples, so a degraded model that no longer gets traffic moves back up in time.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        failure_threshold: float = 0.5,
+        min_samples: int = 5,
+        max_consecutive_failures: int = 3,
+        cooldown: float = 30.0,
+        degraded_threshold: float = 0.25,
+        slow_latency: Optional[float] = None,
+        recovery: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.min_samples = min_samples
+        self.max_consecutive_failures = max_consecutive_failures
+        self.cooldown = cooldown
+        self.degraded_threshold = degraded_threshold
+        self.slow_latency = slow_latency
+        self.recovery = recovery
+        self.clock = clock
+        self._models: Dict[str, ModelHealth] = {}
+
+    def _health(self, model: str) -> ModelHealth:
+        health = self._models.get(model)
+        if health is None:
+            health = self._models[model] = ModelHealth()
+        return health
+
+    def _decay(self, health: ModelHealth) -> None:
+        now = self.clock()
+        if health.error_rate and self.recovery > 0:
+            health.error_rate *= 0.5 ** ((now - health.updated_at) / self.recovery)
+        health.updated_at = now
+
+    def _cooled_down(self, health: ModelHealth) -> bool:
+        return self.clock() - health.opened_at >= self.cooldown
+
+    def available(self, model: str) -> bool:
+        """Whether a request could be sent to `model` right now."""
+        health = self._health(model)
+        if health.state == "closed":
+            return True
+        if health.state == "open":
+            return self._cooled_down(health)
+        return not health.probing
+
+    def degraded(self, model: str) -> bool:
+        """Whether `model` is available but recently unreliable or slow."""
+        health = self._health(model)
+        self._decay(health)
+        if health.error_rate >= self.degraded_threshold:
+            return True
+        return self.slow_latency is not None and health.latency is not None and health.latency > self.slow_latency
+
+    def order(self, models: Sequence[str]) -> List[str]:
+        """Models healthiest first: available, then degraded, then those with an open breaker.
+
+        Open models stay in the list so callers can report them as skipped; `acquire()`
+        rejects them without a request being sent.
+        """
+        return sorted(models, key=lambda model: (not self.available(model), self.degraded(model)))
+
+    def acquire(self, model: str) -> bool:
+        """Claim the right to call `model`; half-opens a cooled-down breaker and claims its probe."""
+        health = self._health(model)
+        if health.state == "open":
+            if not self._cooled_down(health):
+                return False
+            health.state = "half_open"
+            logger.info(f"Circuit breaker for {model} is half-open, probing")
+        if health.state == "half_open":
+            if health.probing:
+                return False
+            health.probing = True
+        return True
+
+    def release(self, model: str) -> None:
+        """Give back a claim without an outcome, e.g. when the attempt was cancelled."""
+        self._health(model).probing = False
+
+    def record_success(self, model: str, latency: float) -> None:
+        health = self._health(model)
+        self._decay(health)
+        health.samples += 1
+        health.error_rate -= self.alpha * health.error_rate
+        health.latency = latency if health.latency is None else health.latency + self.alpha * (latency - health.latency)
+        health.consecutive_failures = 0
+        if health.state == "half_open":
+            health.state = "closed"
+            health.probing = False
+            health.error_rate = 0.0
+            health.samples = 0
+            logger.info(f"Circuit breaker for {model} closed")
+
+    def record_failure(self, model: str) -> None:
+        health = self._health(model)
+        self._decay(health)
+        health.samples += 1
+        health.error_rate += self.alpha * (1.0 - health.error_rate)
+        health.consecutive_failures += 1
+        if health.state == "half_open":
+            self._trip(model, health)
+        elif health.state == "closed" and (
+            health.consecutive_failures >= self.max_consecutive_failures
+            or (health.samples >= self.min_samples and health.error_rate >= self.failure_threshold)
+        ):
+            self._trip(model, health)
+
+    def _trip(self, model: str, health: ModelHealth) -> None:
+        health.state = "open"
+        health.probing = False
+        health.opened_at = self.clock()
+        health.trips += 1
+        logger.warning(f"Circuit breaker for {model} opened for {self.cooldown:.0f}s")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Breaker state and health EWMAs per model."""
+        stats = {}
+        for model, health in self._models.items():
+            self._decay(health)
+            stats[model] = health.as_dict()
+            if health.state == "open":
+                stats[model]["retry_in"] = round(max(0.0, health.opened_at + self.cooldown - self.clock()), 1)
+        return stats
+
+
+DEFAULT_HEALTH = HealthTracker()
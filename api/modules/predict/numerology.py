@@ -1,14 +1,22 @@
-import json
 import logging
-from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional
 
-import openai
 from fastapi import HTTPException
-from unidecode import unidecode
 
-from api.llm import MODEL_LISTS, OPENAI_BASE_CLIENT
+from api.llm import MODEL_LISTS, get_openai_client, llm_configured
+from api.metrics import record_usage
+from api.modules.numerology import NumerologyEngine
 from api.prompts.numerology import SYSTEM_PROMPT
+from api.ratelimit import usage_tokens
+
+from .cache import make_cache_key
+from .fallback import AllModelsFailedError, FallbackPolicy
+from .prompts import Prompt, PromptAssembler, count_tokens
+from .semantic import SemanticCache
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    import openai
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +25,13 @@ class NumerologyReader:
     """numerology computation and interpretation service."""
 
     models: list[str] = MODEL_LISTS
-    client: openai.AsyncOpenAI = OPENAI_BASE_CLIENT
+    client: Optional["openai.AsyncOpenAI"] = None
     max_analysis_length: int = 1000
+    inflight: SingleFlight = SingleFlight()
+    fallback: FallbackPolicy = FallbackPolicy()
+    prompts: PromptAssembler = PromptAssembler(SYSTEM_PROMPT)
+    semantic_cache: Optional[SemanticCache] = None
+    expected_completion_tokens: int = 800
 
     @classmethod
     def configure(
@@ -26,6 +39,8 @@ class NumerologyReader:
         models: Optional[list[str]] = None,
         client: Optional[Any] = None,
         max_analysis_length: Optional[int] = None,
+        fallback: Optional[FallbackPolicy] = None,
+        semantic_cache: Optional[SemanticCache] = None,
     ) -> None:
         """Change model or runtime configuration globally."""
         if models:
@@ -34,83 +49,158 @@ class NumerologyReader:
             cls.client = client
         if max_analysis_length:
             cls.max_analysis_length = max_analysis_length
+        if fallback is not None:
+            cls.fallback = fallback
+        if semantic_cache is not None:
+            cls.semantic_cache = semantic_cache
+
+    @classmethod
+    def is_configured(cls) -> bool:
+        """Whether a client was configured or the shared one can be built from `OPENAI_API_KEY`."""
+        return cls.client is not None or llm_configured()
+
+    @classmethod
+    def _get_client(cls) -> "openai.AsyncOpenAI":
+        """Configured client, or the shared pooled client from `api.llm`."""
+        return cls.client or get_openai_client()
 
     @staticmethod
     def calculate(name: str, dob: str) -> Dict[str, Any]:
-        """Calculate numerological values from name and date of birth with explanation."""
-        normalized_name = unidecode(name.upper().replace(" ", ""))
-
-        letters = [(c, ord(c) - 64) for c in normalized_name if c.isalpha()]
-        name_sum = sum(v for _, v in letters)
-        name_expl = " + ".join(f"{c}({v})" for c, v in letters) + f" = {name_sum}"
-
-        dob_digits = [int(ch) for ch in dob if ch.isdigit()]
-        dob_sum = sum(dob_digits)
-        dob_expl = " + ".join(str(d) for d in dob_digits) + f" = {dob_sum}"
-
-        total_sum = name_sum + dob_sum
-        reduction_steps = [str(total_sum)]
-        while total_sum > 9:
-            total_sum = sum(int(d) for d in str(total_sum))
-            reduction_steps.append(str(total_sum))
-        personal_expl = " → ".join(reduction_steps)
-
-        current_year = datetime.now().year
-        current_year_digits = [int(ch) for ch in str(current_year) if ch.isdigit()]
-        current_year_sum = sum(current_year_digits)
-        current_year_expl = " + ".join(str(d) for d in current_year_digits) + f" = {current_year_sum}"
-
-        return {
-            "name_numerology": name_sum,
-            "dob_numerology": dob_sum,
-            "personal_numerology": total_sum,
-            "current_year_numerology": current_year_sum,
-            "_explanation": {
-                "name": f"{name_expl}",
-                "dob": f"{dob_expl}",
-                "personal": f"{personal_expl}",
-                "current_year": f"{current_year_expl}",
-            },
-        }
+        """Calculate numerological values from name and date of birth with explanation.
+
+        Results are memoized per (name, dob, current year) and shared between callers, including
+        the `/tarot-cards/draw` path, so they must not be mutated.
+        """
+        return NumerologyEngine.calculate_memoized(name, dob)
 
     @classmethod
     def _build_prompt(cls) -> str:
-        """Return reusable system prompt for numerology interpretation."""
-        return SYSTEM_PROMPT.format(
-            max_analysis_length=cls.max_analysis_length,
-        )
+        """Return reusable system prompt for numerology interpretation, rendered once per configuration."""
+        return cls.prompts.system_prompt(max_analysis_length=cls.max_analysis_length)
+
+    @classmethod
+    def _prepare_request(cls, name: str, dob: str, question: str) -> Prompt:
+        """Assemble the prompt from the user details and their numerology."""
+        payload = {
+            "name": name,
+            "dob": dob,
+            "question": question,
+            "current_year": NumerologyEngine.current_year()[0],
+            "numerology": cls.calculate(name, dob),
+        }
+        return cls.prompts.build(payload, max_analysis_length=cls.max_analysis_length)
 
     @classmethod
     async def analyze(cls, name: str, dob: str, question: str) -> str:
         """Perform numerology analysis and LLM interpretation."""
-        numerology = cls.calculate(name, dob)
-        user_input = json.dumps(
-            {
-                "name": name,
-                "dob": dob,
-                "question": question,
-                "current_year": datetime.now().year,
-                "numerology": numerology,
-            },
-            indent=4,
+        prompt = cls._prepare_request(name, dob, question)
+        flight_key = make_cache_key(
+            {"name": name, "dob": dob, "question": question, "current_year": NumerologyEngine.current_year()[0]},
+            cls.models,
+            prompt.system,
         )
+        group = cls._semantic_group(name, dob, prompt)
+        similar = cls._semantic_lookup(group, question)
+        if similar is not None:
+            return similar
+
+        analysis = await cls.inflight.run(flight_key, lambda: cls._complete(prompt))
+        cls._semantic_store(group, question, analysis)
+        return analysis
+
+    @classmethod
+    def _semantic_group(cls, name: str, dob: str, prompt: Prompt) -> Optional[str]:
+        """Semantic cache partition: the name, date of birth and numbers, models and system prompt.
+
+        The analysis spells out the calculation from the person's name letters and birth-date
+        digits, so it is never reused for anyone else, even with the same numbers.
+        """
+        if cls.semantic_cache is None:
+            return None
+        numbers = {key: value for key, value in cls.calculate(name, dob).items() if not key.startswith("_")}
+        return make_cache_key({"name": name, "dob": dob, "numbers": numbers}, cls.models, prompt.system)
+
+    @classmethod
+    def _semantic_lookup(cls, group: Optional[str], question: str) -> Optional[str]:
+        """Analysis cached for a similar question by the same person."""
+        if cls.semantic_cache is None or group is None:
+            return None
+        hit = cls.semantic_cache.get(group, question)
+        return hit.value if hit is not None else None
+
+    @classmethod
+    def _semantic_store(cls, group: Optional[str], question: str, analysis: Optional[str]) -> None:
+        if cls.semantic_cache is not None and group is not None and analysis:
+            cls.semantic_cache.set(group, question, analysis)
+
+    @classmethod
+    def _estimate_cost(cls, prompt: Prompt) -> int:
+        """Tokens one call is expected to use, reserved against the model's rate limit."""
+        return prompt.report.total_tokens + cls.expected_completion_tokens
 
-        system_prompt = cls._build_prompt()
+    @classmethod
+    async def _complete(cls, prompt: Prompt) -> str:
+        """Run the model list through the fallback policy until one returns an analysis."""
+        cost = cls._estimate_cost(prompt)
 
-        for model in cls.models:
+        async def attempt(model: str) -> str:
+            # The request is sent even when the call fails or is cancelled: keep the estimate then.
+            tokens = cost
             try:
-                response = await cls.client.chat.completions.create(
+                response = await cls._get_client().chat.completions.create(
                     model=model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_input},
-                    ],
+                    messages=prompt.messages(),
                 )
+                tokens = usage_tokens(response.usage, default=cost)
+                record_usage("numerology", model, response.usage)
                 return response.choices[0].message.content
-            except Exception as e:
-                logger.error(f"Model {model} failed: {e}")
-                if model != cls.models[-1]:
-                    logger.info("Switching to next model")
-                    continue
+            finally:
+                cls.fallback.settle(model, cost, tokens)
 
-        raise HTTPException(status_code=403, detail="All configured models failed")
+        try:
+            return await cls.fallback.run(cls.models, attempt, cost=cost)
+        except AllModelsFailedError:
+            raise HTTPException(status_code=403, detail="All configured models failed")
+
+    @classmethod
+    async def stream_analysis(cls, name: str, dob: str, question: str) -> AsyncIterator[str]:
+        """Perform numerology analysis and stream the LLM's markdown as it is generated."""
+        prompt = cls._prepare_request(name, dob, question)
+        group = cls._semantic_group(name, dob, prompt)
+        similar = cls._semantic_lookup(group, question)
+        if similar is not None:
+            yield similar
+            return
+
+        cost = cls._estimate_cost(prompt)
+
+        async def open_stream(model: str) -> AsyncIterator[str]:
+            usage = None
+            parts = []
+            try:
+                stream = await cls._get_client().chat.completions.create(
+                    model=model,
+                    messages=prompt.messages(),
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                async for chunk in stream:
+                    if getattr(chunk, "usage", None) is not None:
+                        usage = chunk.usage
+                        record_usage("numerology", model, usage)
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                        yield parts[-1]
+            finally:
+                streamed = prompt.report.total_tokens + count_tokens("".join(parts)) if parts else cost
+                cls.fallback.settle(model, cost, usage_tokens(usage, default=streamed))
+
+        deltas = []
+        try:
+            async for delta in cls.fallback.stream(cls.models, open_stream, cost=cost):
+                deltas.append(delta)
+                yield delta
+        except AllModelsFailedError:
+            raise HTTPException(status_code=403, detail="All configured models failed")
+
+        cls._semantic_store(group, question, "".join(deltas))
@@ -0,0 +1,123 @@
+import json
+import logging
+import math
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_UNLOADED: Any = object()
+_token_counter: Optional[Callable[[str], int]] = _UNLOADED
+_token_counter_lock = threading.Lock()
+
+
+def compact_json(payload: Dict[str, Any]) -> str:
+    """Serialize a prompt payload without indentation or separator padding."""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+def _load_token_counter() -> Optional[Callable[[str], int]]:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.info(f"tiktoken unavailable ({e!r}), estimating prompt tokens from length")
+        return None
+    return lambda text: len(encoding.encode_ordinary(text))
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens in `text`: exact with `tiktoken` (o200k_base) when installed, else ~4 bytes per token."""
+    global _token_counter
+    if _token_counter is _UNLOADED:
+        with _token_counter_lock:
+            if _token_counter is _UNLOADED:
+                _token_counter = _load_token_counter()
+    if _token_counter is None:
+        return math.ceil(len(text.encode()) / 4)
+    return _token_counter(text)
+
+
+class PromptReport(NamedTuple):
+    """Input-token accounting for one request."""
+
+    system_tokens: int
+    user_tokens: int
+    total_tokens: int
+    saved_tokens: Optional[int] = None
+
+
+class Prompt(NamedTuple):
+    """A fully assembled request: the system prompt, the user input and their token report."""
+
+    system: str
+    user: str
+    report: PromptReport
+
+    def messages(self) -> List[Dict[str, str]]:
+        """Chat messages, system prompt first. A new list per call, since clients may append re-asks."""
+        return [{"role": "system", "content": self.system}, {"role": "user", "content": self.user}]
+
+
+class PromptAssembler:
+    """Builds chat messages so the provider can reuse a cached prompt prefix.
+
+    The system prompt is rendered once per set of template parameters and always sent first,
+    byte-for-byte identical between requests; everything that varies per request goes into a
+    compact JSON user message after it. Each `build()` also reports the prompt's input tokens.
+    How many the compact payload saved over indented JSON is measured on one build in
+    `savings_sample_every` (and on every build with debug logging) and extrapolated in `stats()`.
+    """
+
+    savings_sample_every: int = 32
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        self._rendered: Dict[Tuple[Tuple[str, Any], ...], Tuple[str, int]] = {}
+        self.requests = 0
+        self.input_tokens = 0
+        self.sampled_requests = 0
+        self.sampled_saved_tokens = 0
+
+    def _system(self, params: Dict[str, Any]) -> Tuple[str, int]:
+        key = tuple(sorted(params.items()))
+        rendered = self._rendered.get(key)
+        if rendered is None:
+            text = self.template.format(**params) if params else self.template
+            rendered = self._rendered[key] = (text, count_tokens(text))
+        return rendered
+
+    def system_prompt(self, **params: Any) -> str:
+        """Rendered system prompt for the given template parameters."""
+        return self._system(params)[0]
+
+    def build(self, payload: Dict[str, Any], **params: Any) -> Prompt:
+        """Assemble the messages for one request and account for its input tokens."""
+        system, system_tokens = self._system(params)
+        user = compact_json(payload)
+        user_tokens = count_tokens(user)
+        saved_tokens = None
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug or self.requests % self.savings_sample_every == 0:
+            saved_tokens = count_tokens(json.dumps(payload, indent=4)) - user_tokens
+            self.sampled_requests += 1
+            self.sampled_saved_tokens += saved_tokens
+        report = PromptReport(system_tokens, user_tokens, system_tokens + user_tokens, saved_tokens)
+
+        self.requests += 1
+        self.input_tokens += report.total_tokens
+        if debug:
+            logger.debug(f"Prompt tokens: {report}")
+        return Prompt(system, user, report)
+
+    def stats(self) -> Dict[str, Any]:
+        """Rendered prompt variants, input tokens accounted so far and the estimated savings."""
+        saved_per_request = self.sampled_saved_tokens / self.sampled_requests if self.sampled_requests else 0.0
+        return {
+            "rendered_prompts": len(self._rendered),
+            "requests": self.requests,
+            "input_tokens": self.input_tokens,
+            "saved_tokens": round(saved_per_request * self.requests),
+            "savings_samples": self.sampled_requests,
+        }
@@ -0,0 +1,353 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from api.metrics import REGISTRY
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_BUCKETS = (0.3, 0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 0.98, 1.0)
+SEMANTIC_SIMILARITY = REGISTRY.histogram(
+    "semantic_cache_similarity",
+    "Best cached-question similarity per semantic cache lookup, by cache and outcome.",
+    ("cache", "outcome"),
+    buckets=SIMILARITY_BUCKETS,
+)
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_CONTRACTION = re.compile(r"\b(\w+?)n['’]t\b")
+_CONTRACTED = {"wo": "will", "ca": "can", "sha": "shall"}
+NEGATIONS = frozenset(
+    "not no never nor neither none nothing nobody nowhere without cannot t dont doesnt didnt wont wouldnt cant "
+    "couldnt shouldnt isnt arent wasnt werent havent hasnt hadnt".split()
+)
+QUESTION_STOPWORDS = frozenset(
+    "a an and am are as at be been being by can could did do does for from going gonna had has have i in is it its me "
+    "my of on or so that the this to was were will with would should shall you your".split()
+)
+SYNONYMS: Dict[str, str] = {
+    word: canonical
+    for canonical, words in {
+        "love": "relationship partner romance romantic",
+        "career": "job profession",
+        "change": "switch",
+        "money": "finance financial",
+        "marriage": "married marry",
+    }.items()
+    for word in words.split()
+}
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("The semantic cache requires NumPy: install the `analytics` extra") from e
+    return np
+
+
+class HashedNgramFeaturizer:
+    """CPU-only question embedding: signed, hashed character n-grams and words, L2-normalized.
+
+    Only a question's content words are embedded: text is case-folded and stripped of
+    punctuation, `stopwords` are dropped, plurals are trimmed and `synonyms` mapped to one
+    word, so "Is my relationship going to last?" embeds like "Will my love last?".
+    """
+
+    def __init__(
+        self,
+        dim: int = 1024,
+        ngram_range: Tuple[int, int] = (3, 5),
+        word_weight: float = 2.0,
+        stopwords: FrozenSet[str] = QUESTION_STOPWORDS,
+        synonyms: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.word_weight = word_weight
+        self.stopwords = stopwords
+        self.synonyms = SYNONYMS if synonyms is None else synonyms
+        self._np = _import_numpy()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(_PUNCTUATION.sub(" ", text.casefold()).split())
+
+    def terms(self, text: str) -> List[str]:
+        """Content words of `text`, singular and mapped to their synonym; "n't" reads as "not"."""
+        text = _CONTRACTION.sub(lambda match: f"{_CONTRACTED.get(match[1], match[1])} not", text.casefold())
+        words = (word for word in self.normalize(text).split() if word not in self.stopwords)
+        singular = (
+            word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word for word in words
+        )
+        return [self.synonyms.get(word, word) for word in singular]
+
+    def compatible(self, question: str, other: str, min_overlap: float) -> bool:
+        """Whether two similar questions share their negations and at least `min_overlap` of their content words (Jaccard).
+
+        Character n-grams barely register a "not" or a swapped topic word, so this guards
+        against serving the answer of the opposite or of another question.
+        """
+        words, other_words = set(self.terms(question)), set(self.terms(other))
+        if words & NEGATIONS != other_words & NEGATIONS:
+            return False
+        union = words | other_words
+        return not union or len(words & other_words) / len(union) >= min_overlap
+
+    def _features(self, text: str) -> Dict[str, float]:
+        features: Dict[str, float] = {}
+        padded = f" {text} "
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(padded) - n + 1):
+                gram = padded[i : i + n]
+                features[gram] = features.get(gram, 0.0) + 1.0
+        for word in text.split():
+            key = f"w:{word}"
+            features[key] = features.get(key, 0.0) + self.word_weight
+        return features
+
+    def __call__(self, text: str) -> "np.ndarray":
+        np = self._np
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in self._features(" ".join(self.terms(text))).items():
+            digest = zlib.crc32(feature.encode())
+            vector[digest % self.dim] += (1.0 if digest & 0x80000000 else -1.0) * (1.0 + np.log(count))
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+
+class SemanticHit(NamedTuple):
+    value: str
+    similarity: float
+
+
+class SemanticCache:
+    """Near-duplicate question cache over a NumPy vector index.
+
+    Entries live in a preallocated `max_entries` x `dim` matrix of question embeddings and are
+    partitioned by `group`, a key the reader derives from everything but the question (the
+    person asking, the drawn cards and orientations or the numerology inputs, plus models
+    and prompt), so a reading is only ever reused for the person it was written for. A
+    lookup scores only its group's rows with one matrix-vector product and returns the
+    best entry when its cosine similarity reaches `threshold` and the two questions have the
+    same negations and share `min_token_overlap` of their content words. The featurizer is
+    lexical: it catches rewordings and paraphrases built from the same or synonymous content
+    words, not ones that say the same thing in other words. Storing a question that is (almost) identical
+    to an existing one replaces it; otherwise the entry takes a free row, an expired one, or
+    the least recently used one.
+
+    Hit quality is tracked by the `semantic_cache_similarity` histogram (lookups into an
+    empty group are only counted as misses), and lookups whose best score falls within
+    `near_miss_margin` below the threshold are counted as near misses, to help tune it;
+    candidates turned down by the word check are counted as `rejected`. With `path`, the index is loaded at start, saved in the
+    background every `save_every` writes, and saved by `save()` on shutdown.
+    """
+
+    def __init__(
+        self,
+        name: str = "semantic",
+        threshold: float = 0.85,
+        max_entries: int = 4096,
+        ttl: float = 86400.0,
+        path: Optional[Path] = None,
+        featurizer: Optional[HashedNgramFeaturizer] = None,
+        near_miss_margin: float = 0.1,
+        save_every: int = 64,
+        min_token_overlap: float = 0.5,
+    ) -> None:
+        self._np = _import_numpy()
+        self.name = name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = Path(path) if path else None
+        self.featurizer = featurizer or HashedNgramFeaturizer()
+        self.near_miss_margin = near_miss_margin
+        self.save_every = save_every
+        self.min_token_overlap = min_token_overlap
+        self._lock = threading.Lock()
+        self._saving = threading.Lock()
+        self._reset()
+        self.hits = 0
+        self.misses = 0
+        self.near_misses = 0
+        self.rejected = 0
+        self.evictions = 0
+        self._hit_similarity = 0.0
+        self._writes = 0
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def _reset(self) -> None:
+        np = self._np
+        self._vectors = np.zeros((self.max_entries, self.featurizer.dim), dtype=np.float32)
+        self._expires = np.zeros(self.max_entries, dtype=np.float64)
+        self._used = np.zeros(self.max_entries, dtype=np.float64)
+        self._entries: List[Optional[Tuple[str, str, str]]] = [None] * self.max_entries
+        self._groups: Dict[str, List[int]] = {}
+        self._free = list(range(self.max_entries - 1, -1, -1))
+
+    def _best(self, group: str, vector: "np.ndarray", now: float) -> Tuple[Optional[int], float]:
+        rows = self._groups.get(group)
+        if not rows:
+            return None, 0.0
+        np = self._np
+        index = np.fromiter(rows, dtype=np.intp, count=len(rows))
+        scores = self._vectors[index] @ vector
+        scores[self._expires[index] <= now] = -1.0
+        best = int(np.argmax(scores))
+        return int(index[best]), float(scores[best])
+
+    def get(self, group: str, question: str) -> Optional[SemanticHit]:
+        """Cached value of the most similar question in `group`, if similar enough."""
+        vector = self.featurizer(question)
+        now = time.time()
+        with self._lock:
+            row, similarity = self._best(group, vector, now)
+            if row is not None and similarity >= self.threshold:
+                _, cached_question, value = self._entries[row]
+                if not self.featurizer.compatible(question, cached_question, self.min_token_overlap):
+                    self.rejected += 1
+                    row = None
+            if row is None or similarity < self.threshold:
+                self.misses += 1
+                if row is not None:
+                    self.near_misses += similarity >= self.threshold - self.near_miss_margin
+                if self._groups.get(group):
+                    SEMANTIC_SIMILARITY.observe(max(similarity, 0.0), self.name, "miss")
+                return None
+            self._used[row] = now
+            self.hits += 1
+            self._hit_similarity += similarity
+        SEMANTIC_SIMILARITY.observe(similarity, self.name, "hit")
+        return SemanticHit(value=value, similarity=similarity)
+
+    def set(self, group: str, question: str, value: str) -> None:
+        """Store the value generated for `question`."""
+        vector = self.featurizer(question)
+        now = time.time()
+        with self._lock:
+            row, similarity = self._best(group, vector, now)
+            if row is None or similarity < 0.999:
+                row = self._allocate(now)
+                self._groups.setdefault(group, []).append(row)
+            self._vectors[row] = vector
+            self._expires[row] = now + self.ttl
+            self._used[row] = now
+            self._entries[row] = (group, question, value)
+            self._writes += 1
+            save = self.path is not None and self._writes % self.save_every == 0
+        if save:
+            self._save_in_background()
+
+    def _allocate(self, now: float) -> int:
+        if self._free:
+            return self._free.pop()
+        np = self._np
+        expired = np.flatnonzero(self._expires <= now)
+        row = int(expired[0]) if len(expired) else int(np.argmin(self._used))
+        if not len(expired):
+            self.evictions += 1
+        group = self._entries[row][0]
+        rows = self._groups[group]
+        rows.remove(row)
+        if not rows:
+            del self._groups[group]
+        return row
+
+    def _snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = [row for row, entry in enumerate(self._entries) if entry is not None]
+            return {
+                "vectors": self._vectors[rows].copy(),
+                "expires": self._expires[rows].copy(),
+                "used": self._used[rows].copy(),
+                "meta": json.dumps(
+                    {"dim": self.featurizer.dim, "entries": [self._entries[row] for row in rows]}, ensure_ascii=False
+                ),
+            }
+
+    def save(self) -> None:
+        """Write the index to `path` atomically (no-op without a path)."""
+        if self.path is None:
+            return
+        np = self._np
+        with self._saving:
+            snapshot = self._snapshot()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.path.with_name(self.path.name + ".tmp")
+            with open(temp, "wb") as f:
+                np.savez(
+                    f,
+                    vectors=snapshot["vectors"],
+                    expires=snapshot["expires"],
+                    used=snapshot["used"],
+                    meta=np.array(snapshot["meta"]),
+                )
+            os.replace(temp, self.path)
+        logger.debug(f"Saved {len(snapshot['expires'])} semantic cache entries to {self.path}")
+
+    def _save_in_background(self) -> None:
+        def run() -> None:
+            try:
+                self.save()
+            except Exception as e:
+                logger.error(f"Failed to save the semantic cache to {self.path}: {e!r}")
+
+        threading.Thread(target=run, name=f"{self.name}-save", daemon=True).start()
+
+    def load(self) -> None:
+        """Replace the index with the unexpired entries saved at `path`, most recently used first."""
+        np = self._np
+        with np.load(self.path) as data:
+            meta = json.loads(str(data["meta"]))
+            vectors, expires, used = data["vectors"], data["expires"], data["used"]
+        if meta["dim"] != self.featurizer.dim:
+            logger.warning(f"Ignoring semantic cache at {self.path}: saved with dimension {meta['dim']}")
+            return
+
+        now = time.time()
+        order = [i for i in np.argsort(-used) if expires[i] > now][: self.max_entries]
+        with self._lock:
+            self._reset()
+            for i in order:
+                row = self._free.pop()
+                group, question, value = meta["entries"][i][:3]
+                self._vectors[row] = vectors[i]
+                self._expires[row] = expires[i]
+                self._used[row] = used[i]
+                self._entries[row] = (group, question, value)
+                self._groups.setdefault(group, []).append(row)
+        logger.info(f"Loaded {len(order)} semantic cache entries from {self.path}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup counters, hit quality and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "near_misses": self.near_misses,
+            "rejected": self.rejected,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "mean_hit_similarity": self._hit_similarity / self.hits if self.hits else None,
+            "threshold": self.threshold,
+            "evictions": self.evictions,
+            "size": len(self),
+            "groups": len(self._groups),
+        }
+
+    def __len__(self) -> int:
+        return self.max_entries - len(self._free)
@@ -1,42 +1,118 @@
-import json
+import asyncio
 import logging
 from datetime import datetime
-from typing import Any, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Literal, Optional, Sequence, Tuple
 
-import instructor
 from fastapi import HTTPException
 
-from api.llm import OPENAI_CLIENT
-from api.models import TarotCard, TarotInterpretation, TarotLLMResponse
+from api.llm import get_instructor_client, llm_configured
+from api.metrics import FAST_READINGS, record_usage
+from api.models import (
+    TarotAPIRequest,
+    TarotAPIResponse,
+    TarotBatchItem,
+    TarotCard,
+    TarotInterpretation,
+    TarotLLMResponse,
+)
+from api.modules.tarot_cards import TarotDeck
 from api.prompts.tarot import SYSTEM_PROMPT
+from api.ratelimit import usage_tokens
+
+from .cache import MemoryReadingCache, ReadingCache, make_cache_key
+from .composer import ReadingComposer
+from .fallback import AllModelsFailedError, FallbackPolicy
+from .prompts import Prompt, PromptAssembler, count_tokens
+from .semantic import SemanticCache
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    import instructor
 
 logger = logging.getLogger(__name__)
 
+ReadingTier = Literal["llm", "fast"]
+
 
 class TarotReader:
     """
     Tarot card interpretation module.
     """
 
-    client: instructor.AsyncInstructor = OPENAI_CLIENT
+    client: Optional["instructor.AsyncInstructor"] = None
     models: list[str] = ["openai/gpt-oss-120b", "openai/gpt-oss-20b"]
+    cache: ReadingCache = MemoryReadingCache()
+    inflight: SingleFlight = SingleFlight()
+    fallback: FallbackPolicy = FallbackPolicy()
+    prompts: PromptAssembler = PromptAssembler(SYSTEM_PROMPT)
+    batch_concurrency: int = 8
+    composer: ReadingComposer = ReadingComposer(TarotDeck.catalog)
+    fast_fallback: bool = True
+    semantic_cache: Optional[SemanticCache] = None
+    expected_completion_tokens: int = 800
 
     @classmethod
     def configure(
         cls,
         client: Optional[Any] = None,
         models: Optional[list[str]] = None,
+        cache: Optional[ReadingCache] = None,
+        fallback: Optional[FallbackPolicy] = None,
+        batch_concurrency: Optional[int] = None,
+        fast_fallback: Optional[bool] = None,
+        semantic_cache: Optional[SemanticCache] = None,
     ) -> None:
-        """Change OpenAI client or model list dynamically."""
+        """Change OpenAI client, model list, caches, fallback policy, batch concurrency or fast fallback."""
         if client:
             cls.client = client
         if models:
             cls.models = models
+        if cache is not None:
+            cls.cache = cache
+        if fallback is not None:
+            cls.fallback = fallback
+        if batch_concurrency:
+            cls.batch_concurrency = batch_concurrency
+        if fast_fallback is not None:
+            cls.fast_fallback = fast_fallback
+        if semantic_cache is not None:
+            cls.semantic_cache = semantic_cache
+
+    @classmethod
+    def is_configured(cls) -> bool:
+        """Whether a client was configured or the shared one can be built from `OPENAI_API_KEY`."""
+        return cls.client is not None or llm_configured()
+
+    @classmethod
+    def _get_client(cls) -> "instructor.AsyncInstructor":
+        """Configured client, or the shared pooled instructor client from `api.llm`."""
+        return cls.client or get_instructor_client()
 
     @classmethod
     def _build_system_prompt(cls) -> str:
-        """System prompt template for Tarot card interpretation."""
-        return SYSTEM_PROMPT
+        """System prompt for Tarot card interpretation, rendered once and reused as the cached prefix."""
+        return cls.prompts.system_prompt()
+
+    @classmethod
+    def _prepare_request(
+        cls,
+        name: str,
+        question: str,
+        past_card_name: str,
+        present_card_name: str,
+        future_card_name: str,
+    ) -> Tuple[str, Prompt]:
+        """Return the cache key and assembled prompt for a reading."""
+        payload = {
+            "name": name,
+            "question": question,
+            "past_card_name": past_card_name,
+            "present_card_name": present_card_name,
+            "future_card_name": future_card_name,
+            "current_year": datetime.now().year,
+        }
+        prompt = cls.prompts.build(payload)
+        return make_cache_key(payload, cls.models, prompt.system), prompt
 
     @classmethod
     async def interpret_cards(
@@ -46,58 +122,180 @@ class TarotReader:
         past_card_name: str,
         present_card_name: str,
         future_card_name: str,
+        tier: ReadingTier = "llm",
+    ) -> Tuple[TarotLLMResponse, ReadingTier]:
+        """Request structured Tarot interpretation from LLM models, or compose it locally for the `fast` tier.
+
+        Returns the interpretation and the tier actually served, which is `fast` when every model
+        failed and the fast fallback stood in.
+        """
+        cards = (past_card_name, present_card_name, future_card_name)
+        if tier == "fast":
+            FAST_READINGS.inc("requested")
+            return cls.composer.compose(name, question, *cards), "fast"
+
+        cache_key, prompt = cls._prepare_request(name, question, *cards)
+
+        cached = cls.cache.get(cache_key)
+        if cached is not None:
+            return TarotLLMResponse.model_validate_json(cached), "llm"
+
+        group = cls._semantic_group(name, *cards)
+        similar = cls._semantic_lookup(group, question)
+        if similar is not None:
+            return similar, "llm"
+
+        try:
+            result = await cls.inflight.run(cache_key, lambda: cls._complete(cache_key, prompt))
+        except AllModelsFailedError as e:
+            return cls._fast_fallback(e, name, question, *cards), "fast"
+
+        cls._semantic_store(group, question, result)
+        return result, "llm"
+
+    @classmethod
+    def _semantic_group(cls, name: str, *card_names: str) -> Optional[str]:
+        """Semantic cache partition: the person, cards and orientations, models and system prompt.
+
+        Readings address the person by name, so they are never reused for anyone else.
+        """
+        if cls.semantic_cache is None:
+            return None
+        return make_cache_key({"name": name, "cards": list(card_names)}, cls.models, cls._build_system_prompt())
+
+    @classmethod
+    def _semantic_lookup(cls, group: Optional[str], question: str) -> Optional[TarotLLMResponse]:
+        """Reading cached for a similar question by the same person on the same cards."""
+        if cls.semantic_cache is None or group is None:
+            return None
+        hit = cls.semantic_cache.get(group, question)
+        return TarotLLMResponse.model_validate_json(hit.value) if hit is not None else None
+
+    @classmethod
+    def _semantic_store(cls, group: Optional[str], question: str, result: TarotLLMResponse) -> None:
+        if cls.semantic_cache is not None and group is not None:
+            cls.semantic_cache.set(group, question, result.model_dump_json())
+
+    @classmethod
+    def _fast_fallback(
+        cls, error: AllModelsFailedError, name: str, question: str, *card_names: str
     ) -> TarotLLMResponse:
-        """Request structured Tarot interpretation from LLM models."""
-        system_prompt = cls._build_system_prompt()
-        user_input = json.dumps(
-            {
-                "name": name,
-                "question": question,
-                "past_card_name": past_card_name,
-                "present_card_name": present_card_name,
-                "future_card_name": future_card_name,
-                "current_year": datetime.now().year,
-            }
-        )
+        """Composed reading once every model failed, or a 403 when the fast fallback is disabled."""
+        if not cls.fast_fallback:
+            raise HTTPException(status_code=403, detail="All models failed to produce valid output")
+
+        logger.warning(f"All models failed, serving a fast reading instead: {error}")
+        FAST_READINGS.inc("fallback")
+        return cls.composer.compose(name, question, *card_names)
 
-        for model in cls.models:
+    @classmethod
+    def _estimate_cost(cls, prompt: Prompt) -> int:
+        """Tokens one call is expected to use, reserved against the model's rate limit."""
+        return prompt.report.total_tokens + cls.expected_completion_tokens
+
+    @classmethod
+    def _streamed_tokens(cls, prompt: Prompt, partial: Optional[TarotLLMResponse]) -> int:
+        """Tokens a streamed attempt used, estimated from what it produced (the full estimate if it produced nothing)."""
+        if partial is None:
+            return cls._estimate_cost(prompt)
+        return prompt.report.total_tokens + count_tokens(partial.model_dump_json())
+
+    @classmethod
+    async def _complete(cls, cache_key: str, prompt: Prompt) -> TarotLLMResponse:
+        """Run the model list through the fallback policy, then cache the valid interpretation."""
+        cost = cls._estimate_cost(prompt)
+
+        async def attempt(model: str) -> TarotLLMResponse:
+            # The request is sent even when the call fails or is cancelled: keep the estimate then.
+            tokens = cost
             try:
-                response = await cls.client.chat.completions.create(
+                response, completion = await cls._get_client().chat.completions.create_with_completion(
                     model=model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_input},
-                    ],
+                    messages=prompt.messages(),
                     response_model=TarotLLMResponse,
                 )
+                usage = getattr(completion, "usage", None)
+                tokens = usage_tokens(usage, default=cost)
+                record_usage("tarot", model, usage)
                 return TarotLLMResponse.model_validate(response, strict=True)
-            except Exception as e:
-                logger.error(f"Model {model} failed: {e}")
-                if model != cls.models[-1]:
-                    logger.info("Switching to next model")
-                continue
+            finally:
+                cls.fallback.settle(model, cost, tokens)
 
-        raise HTTPException(status_code=403, detail="All models failed to produce valid output")
+        result = await cls.fallback.run(cls.models, attempt, cost=cost)
+        cls.cache.set(cache_key, result.model_dump_json())
+        return result
 
     @classmethod
-    async def generate_reading(
+    async def stream_interpretation(
         cls,
         name: str,
         question: str,
+        past_card_name: str,
+        present_card_name: str,
+        future_card_name: str,
+        tier: ReadingTier = "llm",
+    ) -> AsyncIterator[Tuple[Dict[str, Optional[str]], ReadingTier]]:
+        """Stream partial structured Tarot interpretations as the LLM produces them.
+
+        Each item holds the `past`, `present`, `future` and `summary` fields generated so far
+        (`None` until started) and the tier serving them; the last item is the complete
+        interpretation. Fast-tier and fallback readings arrive as a single complete `fast` item.
+        """
+        cards = (past_card_name, present_card_name, future_card_name)
+        if tier == "fast":
+            FAST_READINGS.inc("requested")
+            yield cls.composer.compose(name, question, *cards).model_dump(), "fast"
+            return
+
+        cache_key, prompt = cls._prepare_request(name, question, *cards)
+
+        cached = cls.cache.get(cache_key)
+        if cached is not None:
+            yield TarotLLMResponse.model_validate_json(cached).model_dump(), "llm"
+            return
+
+        group = cls._semantic_group(name, *cards)
+        similar = cls._semantic_lookup(group, question)
+        if similar is not None:
+            yield similar.model_dump(), "llm"
+            return
+
+        cost = cls._estimate_cost(prompt)
+
+        async def open_stream(model: str) -> AsyncIterator[Any]:
+            last = None
+            try:
+                async for last in cls._get_client().chat.completions.create_partial(
+                    model=model,
+                    messages=prompt.messages(),
+                    response_model=TarotLLMResponse,
+                ):
+                    yield last
+            finally:
+                cls.fallback.settle(model, cost, cls._streamed_tokens(prompt, last))
+
+        fields: Dict[str, Optional[str]] = {}
+        try:
+            async for partial in cls.fallback.stream(cls.models, open_stream, cost=cost):
+                fields = partial.model_dump()
+                yield fields, "llm"
+        except AllModelsFailedError as e:
+            yield cls._fast_fallback(e, name, question, *cards).model_dump(), "fast"
+            return
+
+        result = TarotLLMResponse.model_validate(fields, strict=True)
+        cls.cache.set(cache_key, result.model_dump_json())
+        cls._semantic_store(group, question, result)
+
+    @staticmethod
+    def build_interpretations(
         past_card: TarotCard,
         present_card: TarotCard,
         future_card: TarotCard,
-    ) -> Tuple[List[TarotInterpretation], str]:
-        """Generate final tarot reading and structured interpretation."""
-        response = await cls.interpret_cards(
-            name=name,
-            question=question,
-            past_card_name=past_card.full_card_name,
-            present_card_name=present_card.full_card_name,
-            future_card_name=future_card.full_card_name,
-        )
-
-        interpretations = [
+        response: TarotLLMResponse,
+    ) -> List[TarotInterpretation]:
+        """Pair each drawn card with its position and interpreted meaning."""
+        return [
             TarotInterpretation(
                 card_name=past_card.name,
                 position="past",
@@ -118,4 +316,71 @@ class TarotReader:
             ),
         ]
 
-        return interpretations, response.summary
+    @classmethod
+    async def generate_reading(
+        cls,
+        name: str,
+        question: str,
+        past_card: TarotCard,
+        present_card: TarotCard,
+        future_card: TarotCard,
+        tier: ReadingTier = "llm",
+    ) -> Tuple[List[TarotInterpretation], str, ReadingTier]:
+        """Generate final tarot reading and structured interpretation, with the tier actually served."""
+        response, served = await cls.interpret_cards(
+            name=name,
+            question=question,
+            past_card_name=past_card.full_card_name,
+            present_card_name=present_card.full_card_name,
+            future_card_name=future_card.full_card_name,
+            tier=tier,
+        )
+
+        interpretations = cls.build_interpretations(past_card, present_card, future_card, response)
+        return interpretations, response.summary, served
+
+    @classmethod
+    async def iter_readings(
+        cls, requests: Sequence[TarotAPIRequest], concurrency: Optional[int] = None
+    ) -> AsyncIterator[TarotBatchItem]:
+        """Generate a batch of readings with bounded concurrency, yielding each item as it completes.
+
+        Per-model upstream limits are enforced by the fallback policy's `concurrency` setting.
+        """
+        semaphore = asyncio.Semaphore(concurrency or cls.batch_concurrency)
+
+        async def run(index: int, request: TarotAPIRequest) -> TarotBatchItem:
+            async with semaphore:
+                try:
+                    interpretations, summary, served = await cls.generate_reading(
+                        name=request.name,
+                        question=request.question,
+                        past_card=request.past_card,
+                        present_card=request.present_card,
+                        future_card=request.future_card,
+                        tier=request.tier,
+                    )
+                except HTTPException as e:
+                    return TarotBatchItem(index=index, error=str(e.detail))
+                except Exception as e:
+                    return TarotBatchItem(index=index, error=str(e))
+
+            return TarotBatchItem(
+                index=index, result=TarotAPIResponse(interpretations=interpretations, summary=summary, tier=served)
+            )
+
+        tasks = [asyncio.create_task(run(index, request)) for index, request in enumerate(requests)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @classmethod
+    async def generate_readings(
+        cls, requests: Sequence[TarotAPIRequest], concurrency: Optional[int] = None
+    ) -> List[TarotBatchItem]:
+        """Generate a batch of readings with bounded concurrency, in request order."""
+        items = [item async for item in cls.iter_readings(requests, concurrency)]
+        return sorted(items, key=lambda item: item.index)
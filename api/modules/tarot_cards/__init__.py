@@ -1,3 +1,16 @@
+from .catalog import CardBundle, CardCatalog, CardRecord
 from .deck import TarotDeck
+from .images import CardImageVariants, ImageVariant
+from .search import CardSearchIndex, SearchHit, SearchResult
 
-__all__ = ["TarotDeck"]
+__all__ = [
+    "TarotDeck",
+    "CardCatalog",
+    "CardRecord",
+    "CardBundle",
+    "CardImageVariants",
+    "ImageVariant",
+    "CardSearchIndex",
+    "SearchHit",
+    "SearchResult",
+]
@@ -0,0 +1,243 @@
+import gzip
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+from pydantic_core import to_json
+
+from api.models import CardInfoAPIResponse, TarotCard
+from api.utils import make_etag
+
+from .images import CardImageVariants
+
+logger = logging.getLogger(__name__)
+
+
+class CardRecord(NamedTuple):
+    """Compact, read-only view of one tarot card."""
+
+    number: int
+    name: str
+    image_url: str
+    info: Dict[str, Any]
+    body: bytes
+    etag: str
+    cards: Tuple[TarotCard, TarotCard]
+    fragments: Tuple[bytes, bytes]
+    field_fragments: Dict[str, bytes]
+
+
+class CardBundle(NamedTuple):
+    """Several cards rendered as one JSON body, plus its gzip encoding and ETag."""
+
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+
+class _CatalogState(NamedTuple):
+    records: Tuple[CardRecord, ...]
+    by_number: Dict[int, CardRecord]
+    by_name: Dict[str, CardRecord]
+    bundles: "OrderedDict[Tuple[Optional[Tuple[int, ...]], Optional[Tuple[str, ...]]], CardBundle]"
+
+
+class CardCatalog:
+    """Process-wide in-memory catalog of tarot card metadata.
+
+    The JSON files are read once, on first access, and kept as immutable records indexed
+    by card number (the file stem) and by case-insensitive card name. Each record also holds
+    its `CardInfoAPIResponse` pre-rendered to JSON bytes plus a content-hash ETag, and its
+    reversed and upright `TarotCard` (indexed by `is_upright`) both as shared, frozen models and as
+    pre-rendered JSON, and every info field pre-rendered as a `"field":value` fragment that
+    `bundle()` joins into multi-card responses. Call `reload()` when the JSON directory changes.
+
+    When `image_variants` have been built, `image_url` points at the variant matching
+    `image_width` and `image_format` instead of the original JPEG.
+    """
+
+    fields: Tuple[str, ...] = tuple(CardInfoAPIResponse.model_fields)
+    max_bundles: int = 256
+
+    def __init__(
+        self,
+        card_dir: Path,
+        images_subpath: str,
+        image_variants: Optional[CardImageVariants] = None,
+        image_width: Optional[int] = None,
+        image_format: Optional[str] = None,
+    ) -> None:
+        self.card_dir = Path(card_dir)
+        self.images_subpath = images_subpath
+        self.image_variants = image_variants
+        self.image_width = image_width
+        self.image_format = image_format
+        self._state: Optional[_CatalogState] = None
+        self._lock = threading.Lock()
+        self._bundle_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _read(self) -> _CatalogState:
+        records = []
+        for file in self.card_dir.glob("*.json"):
+            with open(file, "r", encoding="utf-8") as f:
+                card_info: dict = json.load(f)
+
+            card_info.pop("img", None)
+            card_info["image_url"] = self._image_url(int(file.stem))
+            info = CardInfoAPIResponse.model_validate(card_info)
+            body = info.model_dump_json().encode()
+            cards = tuple(
+                TarotCard(name=card_info["name"], is_upright=is_upright, image_url=card_info["image_url"])
+                for is_upright in (False, True)
+            )
+            records.append(
+                CardRecord(
+                    number=int(file.stem),
+                    name=card_info["name"],
+                    image_url=card_info["image_url"],
+                    info=card_info,
+                    body=body,
+                    etag=make_etag(body),
+                    cards=cards,
+                    fragments=tuple(card.model_dump_json().encode() for card in cards),
+                    field_fragments={
+                        field: to_json(field) + b":" + to_json(value) for field, value in info.model_dump().items()
+                    },
+                )
+            )
+
+        records.sort(key=lambda record: record.number)
+        logger.info(f"Loaded {len(records)} tarot cards from {self.card_dir}")
+        return _CatalogState(
+            records=tuple(records),
+            by_number={record.number: record for record in records},
+            by_name={record.name.casefold(): record for record in records},
+            bundles=OrderedDict(),
+        )
+
+    def _image_url(self, card_number: int) -> str:
+        if self.image_variants is not None:
+            variant = self.image_variants.select(card_number, self.image_width, format=self.image_format)
+            if variant is not None:
+                return self.image_variants.url(variant)
+        return f"{self.images_subpath}/{card_number}.jpg"
+
+    @property
+    def _loaded(self) -> _CatalogState:
+        state = self._state
+        if state is None:
+            with self._lock:
+                if self._state is None:
+                    self._state = self._read()
+                state = self._state
+        return state
+
+    def load(self) -> "CardCatalog":
+        """Load the catalog eagerly (no-op if already loaded)."""
+        _ = self._loaded
+        return self
+
+    def reload(self, card_dir: Optional[Path] = None, images_subpath: Optional[str] = None) -> "CardCatalog":
+        """Re-read the JSON directory and atomically swap in the new records."""
+        with self._lock:
+            if card_dir:
+                self.card_dir = Path(card_dir)
+            if images_subpath:
+                self.images_subpath = images_subpath
+            if self.image_variants is not None:
+                self.image_variants.reload()
+            self._state = self._read()
+        return self
+
+    @property
+    def records(self) -> Tuple[CardRecord, ...]:
+        """All cards ordered by card number."""
+        return self._loaded.records
+
+    def get(self, card_number: int) -> Optional[CardRecord]:
+        """Look up a card by number, or `None` if unknown."""
+        return self._count(self._loaded.by_number.get(card_number))
+
+    def find(self, name: str) -> Optional[CardRecord]:
+        """Look up a card by (case-insensitive) name, or `None` if unknown."""
+        return self._count(self._loaded.by_name.get(name.strip().casefold()))
+
+    def bundle(
+        self, card_numbers: Optional[Sequence[int]] = None, fields: Optional[Sequence[str]] = None
+    ) -> CardBundle:
+        """Render cards as `{"cards": [...]}` from their pre-rendered field fragments.
+
+        Each card holds `card_number` plus the requested info `fields` (all of them by
+        default), in catalog field order; `card_numbers` defaults to every card. The most
+        recently used `max_bundles` renderings are kept with their gzip encoding and ETag.
+        Raises `ValueError` for an unknown card number or field.
+        """
+        state = self._loaded
+        numbers = tuple(dict.fromkeys(card_numbers)) if card_numbers is not None else None
+        projection = tuple(field for field in self.fields if field in fields) if fields is not None else None
+        if fields is not None and len(projection) != len(set(fields)):
+            raise ValueError(f"Unknown card fields: {', '.join(sorted(set(fields) - set(self.fields)))}")
+
+        key = (numbers, projection)
+        with self._bundle_lock:
+            bundle = state.bundles.get(key)
+            if bundle is not None:
+                state.bundles.move_to_end(key)
+        if bundle is not None:
+            self.hits += 1
+            return bundle
+
+        if numbers is None:
+            records = state.records
+        else:
+            unknown = [number for number in numbers if number not in state.by_number]
+            if unknown:
+                raise ValueError(f"Unknown card numbers: {', '.join(map(str, unknown))}")
+            records = tuple(state.by_number[number] for number in numbers)
+
+        self.misses += 1
+        selected = self.fields if projection is None else projection
+        body = (
+            b'{"cards":['
+            + b",".join(
+                b"{"
+                + b",".join((b'"card_number":%d' % record.number, *(record.field_fragments[f] for f in selected)))
+                + b"}"
+                for record in records
+            )
+            + b"]}"
+        )
+        bundle = CardBundle(body=body, gzipped=gzip.compress(body, mtime=0), etag=make_etag(body))
+        with self._bundle_lock:
+            state.bundles[key] = bundle
+            while len(state.bundles) > self.max_bundles:
+                state.bundles.popitem(last=False)
+        return bundle
+
+    def _count(self, record: Optional[CardRecord]) -> Optional[CardRecord]:
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return record
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup hit/miss counters and number of cards."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self),
+        }
+
+    def __len__(self) -> int:
+        return len(self._loaded.records)
+
+    def __iter__(self) -> Iterator[CardRecord]:
+        return iter(self._loaded.records)
@@ -1,10 +1,13 @@
-import json
 import random
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from api.models import TarotCard
 
+from .catalog import CardCatalog, CardRecord
+from .images import CardImageVariants
+from .search import CardSearchIndex
+
 
 class TarotDeck:
     """Draw tarot cards."""
@@ -12,14 +15,31 @@ class TarotDeck:
     base_dir: Path = Path(__file__).resolve().parents[3] / "static"
     cards_subdir: str = "json"
     images_subpath: str = "/tarot-cards/images"
+    image_width: Optional[int] = 350
+    # Drawn cards carry one pre-rendered image URL rather than one negotiated per request: every
+    # current browser decodes WebP, and a fixed URL keeps draw responses identical and cacheable.
+    # Clients wanting AVIF, JPEG or another width use `/tarot-cards/image`, which negotiates `Accept`.
+    image_format: str = "webp"
+    image_variants: CardImageVariants = CardImageVariants(
+        base_dir / "images", base_dir / "images" / "variants", f"{images_subpath}/variants"
+    )
+    catalog: CardCatalog = CardCatalog(
+        base_dir / cards_subdir, images_subpath, image_variants, image_width, image_format
+    )
+    search: CardSearchIndex = CardSearchIndex(catalog)
 
     def __init__(self, seed: Optional[int] = None) -> None:
         self.random_seed = seed
-        self.cards: List[Dict[str, Any]] = self._load_cards()
+        self.cards: Tuple[CardRecord, ...] = self.catalog.records
 
     @classmethod
     def configure(
-        cls, base_dir: Optional[Path] = None, cards_subdir: Optional[str] = None, images_subpath: Optional[str] = None
+        cls,
+        base_dir: Optional[Path] = None,
+        cards_subdir: Optional[str] = None,
+        images_subpath: Optional[str] = None,
+        image_width: Optional[int] = None,
+        image_format: Optional[str] = None,
     ) -> None:
         """Change configuration at class level."""
         if base_dir:
@@ -28,52 +48,58 @@ class TarotDeck:
             cls.cards_subdir = cards_subdir
         if images_subpath:
             cls.images_subpath = images_subpath
+        if image_width:
+            cls.image_width = image_width
+        if image_format:
+            cls.image_format = image_format
+        if base_dir or cards_subdir or images_subpath or image_width or image_format:
+            cls.reload_cards()
+
+    @classmethod
+    def reload_cards(cls) -> None:
+        """Re-read the card JSON directory and image variant manifest into the shared catalog."""
+        cls.image_variants.source_dir = cls.base_dir / "images"
+        cls.image_variants.output_dir = cls.base_dir / "images" / "variants"
+        cls.image_variants.url_prefix = f"{cls.images_subpath}/variants"
+        cls.catalog.image_width = cls.image_width
+        cls.catalog.image_format = cls.image_format
+        cls.catalog.reload(card_dir=cls._card_dir(), images_subpath=cls.images_subpath)
 
     @classmethod
     def _card_dir(cls) -> Path:
         return cls.base_dir / cls.cards_subdir
 
-    def _load_cards(self) -> List[Dict[str, Any]]:
-        """Load all card JSON metadata."""
-        cards = []
-        for file in self._card_dir().glob("*.json"):
-            with open(file, "r", encoding="utf-8") as f:
-                card_info = json.load(f)
-                card_info["image_url"] = f"{self.images_subpath}/{file.stem}.jpg"
-                cards.append(card_info)
-        return cards
-
     def get_card_info(self, card_number: int) -> Dict[str, Any]:
-        """Load a specific card info file by number."""
-        file_path = self._card_dir() / f"{card_number}.json"
-        if not file_path.exists():
-            raise ValueError(f"Card file not found: {file_path}")
-
-        with open(file_path, "r", encoding="utf-8") as f:
-            card_info: dict = json.load(f)
+        """Return a specific card info by number."""
+        record = self.catalog.get(card_number)
+        if record is None:
+            raise ValueError(f"Card not found: {card_number}")
 
-        card_info["image_url"] = f"{self.images_subpath}/{card_number}.jpg"
-
-        card_info.pop("img", None)
-        return card_info
+        return dict(record.info)
 
     def draw(self, count: int = 10) -> List[TarotCard]:
-        """Draw N shuffled tarot cards."""
-        if count > len(self.cards):
-            return []
+        """Draw N shuffled tarot cards.
 
-        if self.random_seed is not None:
-            random.seed(self.random_seed)
+        The cards are the catalog's shared, frozen `TarotCard` instances.
+        """
+        return [record.cards[is_upright] for record, is_upright in self._sample(random.Random(self.random_seed), count)]
 
-        deck = self.cards.copy()
-        random.shuffle(deck)
+    def draw_json(self, count: int = 10) -> bytes:
+        """Draw like `draw()`, rendered as `CardsAPIResponse` JSON from the pre-rendered cards."""
+        spread = self._sample(random.Random(self.random_seed), count)
+        return b'{"cards":[' + b",".join(record.fragments[is_upright] for record, is_upright in spread) + b"]}"
 
-        selected = deck[:count]
+    def draw_many(self, seeds: Iterable[Optional[int]], count: int = 10) -> List[List[TarotCard]]:
+        """Draw one spread of N cards per seed; the same seed always yields the same spread."""
         return [
-            TarotCard(
-                name=card["name"],
-                image_url=card["image_url"],
-                is_upright=(random.random() < 0.5),
-            )
-            for card in selected
+            [record.cards[is_upright] for record, is_upright in self._sample(random.Random(seed), count)]
+            for seed in seeds
         ]
+
+    def _sample(self, rng: random.Random, count: int) -> List[Tuple[CardRecord, bool]]:
+        """Sample N distinct cards and their orientations from a draw-local generator."""
+        if not 0 <= count <= len(self.cards):
+            return []
+
+        selected = rng.sample(self.cards, count)
+        return [(record, rng.random() < 0.5) for record in selected]
@@ -0,0 +1,165 @@
+import hashlib
+import io
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+EXTENSIONS = {"avif": "avif", "webp": "webp", "jpeg": "jpg"}
+QUALITY = {"avif": 50, "webp": 75, "jpeg": 80}
+
+
+class ImageVariant(NamedTuple):
+    """One resized, re-encoded card image."""
+
+    width: int
+    format: str
+    file: str
+    bytes: int
+
+
+class CardImageVariants:
+    """Precomputed resized and re-encoded card images, and content negotiation over them.
+
+    `build()` is the offline step: it writes every (width, format) variant of each card under
+    content-hashed file names plus a `manifest.json`. At runtime the manifest is read once and
+    `select()` picks the best variant for a requested width and `Accept` header. Variants whose
+    file is missing are left out, so cards without any fall back to the original image.
+    """
+
+    manifest_name: str = "manifest.json"
+
+    def __init__(self, source_dir: Path, output_dir: Path, url_prefix: str) -> None:
+        self.source_dir = Path(source_dir)
+        self.output_dir = Path(output_dir)
+        self.url_prefix = url_prefix
+        self._variants: Optional[Dict[int, List[ImageVariant]]] = None
+        self._lock = threading.Lock()
+
+    def build(
+        self,
+        widths: Sequence[int] = (120, 200, 350),
+        formats: Sequence[str] = ("avif", "webp", "jpeg"),
+        quality: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Any]:
+        """Render all variants and write the manifest. Requires Pillow (`images` extra)."""
+        try:
+            from PIL import Image, features
+        except ImportError as e:
+            raise ImportError("Building image variants requires Pillow: install the `images` extra") from e
+
+        supported = [fmt for fmt in formats if fmt == "jpeg" or features.check(fmt)]
+        for fmt in set(formats) - set(supported):
+            logger.warning(f"Pillow has no {fmt} support, skipping {fmt} variants")
+
+        quality = {**QUALITY, **(quality or {})}
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self.output_dir.glob("*.*.*"):
+            stale.unlink()
+
+        cards: Dict[str, List[Dict[str, Any]]] = {}
+        for source in sorted(self.source_dir.glob("*.jpg"), key=lambda path: int(path.stem)):
+            with Image.open(source) as original:
+                original = original.convert("RGB")
+                entries = []
+                for width in sorted({min(width, original.width) for width in widths}):
+                    height = round(original.height * width / original.width)
+                    resized = original.resize((width, height), Image.Resampling.LANCZOS)
+                    for fmt in supported:
+                        buffer = io.BytesIO()
+                        resized.save(buffer, format=fmt.upper(), quality=quality[fmt])
+                        data = buffer.getvalue()
+                        digest = hashlib.sha256(data).hexdigest()[:10]
+                        file = f"{source.stem}-{width}w.{digest}.{EXTENSIONS[fmt]}"
+                        (self.output_dir / file).write_bytes(data)
+                        entries.append({"width": width, "format": fmt, "file": file, "bytes": len(data)})
+            cards[source.stem] = entries
+
+        manifest = {"widths": sorted(set(widths)), "formats": supported, "cards": cards}
+        (self.output_dir / self.manifest_name).write_text(json.dumps(manifest, indent=2) + "\n")
+        self.reload()
+        return manifest
+
+    def _read(self) -> Dict[int, List[ImageVariant]]:
+        manifest_path = self.output_dir / self.manifest_name
+        if not manifest_path.exists():
+            logger.info(f"No image variant manifest at {manifest_path}, serving the original images")
+            return {}
+        manifest = json.loads(manifest_path.read_text())
+        variants: Dict[int, List[ImageVariant]] = {}
+        missing = 0
+        for number, entries in manifest["cards"].items():
+            present = [ImageVariant(**entry) for entry in entries if (self.output_dir / entry["file"]).is_file()]
+            missing += len(entries) - len(present)
+            if present:
+                variants[int(number)] = present
+        if missing:
+            logger.warning(f"{missing} image variants listed in {manifest_path} are missing, skipping them")
+        return variants
+
+    @property
+    def _loaded(self) -> Dict[int, List[ImageVariant]]:
+        variants = self._variants
+        if variants is None:
+            with self._lock:
+                if self._variants is None:
+                    self._variants = self._read()
+                variants = self._variants
+        return variants
+
+    def reload(self) -> None:
+        """Re-read the manifest after a build."""
+        with self._lock:
+            self._variants = self._read()
+
+    @property
+    def available(self) -> bool:
+        """Whether any variants have been built."""
+        return bool(self._loaded)
+
+    def select(
+        self,
+        card_number: int,
+        width: Optional[int] = None,
+        accept: Optional[str] = None,
+        format: Optional[str] = None,
+    ) -> Optional[ImageVariant]:
+        """Pick the best variant of a card.
+
+        The format is `format` when given, otherwise the most compact one the `Accept` header
+        allows (AVIF, then WebP, then JPEG). The width is the smallest one covering `width`, or
+        the largest available when `width` is omitted or larger than every variant.
+        """
+        variants = self._loaded.get(card_number)
+        if not variants:
+            return None
+
+        available_formats = {variant.format for variant in variants}
+        if format is None:
+            accepted = (accept or "").lower()
+            format = next(
+                (fmt for fmt in ("avif", "webp") if fmt in available_formats and MEDIA_TYPES[fmt] in accepted),
+                "jpeg",
+            )
+        candidates = sorted((v for v in variants if v.format == format), key=lambda v: v.width)
+        if not candidates:
+            return None
+        if width is None:
+            return candidates[-1]
+        return next((v for v in candidates if v.width >= width), candidates[-1])
+
+    def url(self, variant: ImageVariant) -> str:
+        """Public, content-hashed URL of a variant."""
+        return f"{self.url_prefix}/{variant.file}"
+
+
+if __name__ == "__main__":
+    from .deck import TarotDeck
+
+    logging.basicConfig(level=logging.INFO)
+    built = TarotDeck.image_variants.build()
+    logger.info(f"Built variants for {len(built['cards'])} cards in {TarotDeck.image_variants.output_dir}")
@@ -0,0 +1,242 @@
+import bisect
+import logging
+import math
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .catalog import CardCatalog, CardRecord
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by do for from has have how i in is it its me my of off on or so that the this to "
+    "was what when who why will with you your".split()
+)
+FIELD_WEIGHTS: Dict[str, float] = {
+    "name": 5.0,
+    "keywords": 3.0,
+    "archetype": 2.5,
+    "elemental": 2.0,
+    "fortune_telling": 1.5,
+    "meanings": 1.0,
+    "mythical_spiritual": 1.0,
+    "numerology": 1.0,
+    "hebrew_alphabet": 1.0,
+    "questions_to_ask": 0.5,
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens of `text` without stopwords."""
+    return [token for token in TOKEN_PATTERN.findall(text.casefold()) if token not in STOPWORDS]
+
+
+def _normalize(value: str) -> str:
+    return value.strip().casefold().removesuffix(" arcana")
+
+
+def _strings(value: Any) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+
+class SearchHit(NamedTuple):
+    record: CardRecord
+    score: float
+    fields: Tuple[str, ...]
+
+
+class SearchResult(NamedTuple):
+    total: int
+    hits: List[SearchHit]
+
+
+class _Posting(NamedTuple):
+    weight: float
+    fields: Tuple[str, ...]
+
+
+class _IndexState(NamedTuple):
+    records: Tuple[CardRecord, ...]
+    by_number: Dict[int, CardRecord]
+    postings: Dict[str, Dict[int, _Posting]]
+    vocabulary: List[str]
+    idf: Dict[str, float]
+    norms: Dict[int, float]
+    by_suit: Dict[str, Set[int]]
+    by_arcana: Dict[str, Set[int]]
+
+
+class CardSearchIndex:
+    """Inverted index over the text fields of the card catalog.
+
+    Every field in `FIELD_WEIGHTS` is tokenized into postings mapping a token to the cards
+    holding it, weighted by the field it appears in. Queries are ranked with BM25 over
+    those weighted term frequencies; with `prefix`, each query term also matches the
+    vocabulary tokens it starts with (found by bisecting the sorted vocabulary), at a
+    discount. Suit and arcana filters are precomputed sets of card numbers.
+
+    The index is built on first access, or eagerly with `load()`, and rebuilt whenever the
+    catalog has been reloaded.
+    """
+
+    k1: float = 1.2
+    b: float = 0.75
+    prefix_discount: float = 0.6
+
+    def __init__(self, catalog: CardCatalog, field_weights: Optional[Dict[str, float]] = None) -> None:
+        self.catalog = catalog
+        self.field_weights = dict(field_weights or FIELD_WEIGHTS)
+        self._state: Optional[_IndexState] = None
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.query_time = 0.0
+
+    def _build(self, records: Tuple[CardRecord, ...]) -> _IndexState:
+        term_fields: Dict[str, Dict[int, Dict[str, float]]] = {}
+        lengths: Dict[int, float] = {}
+        for record in records:
+            length = 0.0
+            for field, weight in self.field_weights.items():
+                for text in _strings(record.info.get(field)):
+                    for token in tokenize(text):
+                        fields = term_fields.setdefault(token, {}).setdefault(record.number, {})
+                        fields[field] = fields.get(field, 0.0) + weight
+                        length += weight
+            lengths[record.number] = length
+
+        average = sum(lengths.values()) / len(lengths) if lengths else 1.0
+        postings = {
+            token: {number: _Posting(sum(fields.values()), tuple(fields)) for number, fields in cards.items()}
+            for token, cards in term_fields.items()
+        }
+        idf = {
+            token: math.log(1 + (len(records) - len(cards) + 0.5) / (len(cards) + 0.5))
+            for token, cards in postings.items()
+        }
+
+        by_suit: Dict[str, Set[int]] = {}
+        by_arcana: Dict[str, Set[int]] = {}
+        for record in records:
+            by_suit.setdefault(_normalize(record.info.get("suit", "")), set()).add(record.number)
+            by_arcana.setdefault(_normalize(record.info.get("arcana", "")), set()).add(record.number)
+
+        logger.info(f"Indexed {len(postings)} search terms over {len(records)} tarot cards")
+        return _IndexState(
+            records=records,
+            by_number={record.number: record for record in records},
+            postings=postings,
+            vocabulary=sorted(postings),
+            idf=idf,
+            norms={
+                number: self.k1 * (1 - self.b + self.b * length / (average or 1.0))
+                for number, length in lengths.items()
+            },
+            by_suit=by_suit,
+            by_arcana=by_arcana,
+        )
+
+    @property
+    def _loaded(self) -> _IndexState:
+        records = self.catalog.records
+        state = self._state
+        if state is None or state.records is not records:
+            with self._lock:
+                if self._state is None or self._state.records is not records:
+                    self._state = self._build(records)
+                state = self._state
+        return state
+
+    def load(self) -> "CardSearchIndex":
+        """Build the index eagerly (no-op if the catalog has not changed since)."""
+        _ = self._loaded
+        return self
+
+    def _expand(self, state: _IndexState, term: str, prefix: bool) -> List[Tuple[str, float]]:
+        """Vocabulary tokens matched by a query term, with their score multipliers."""
+        matches = [(term, 1.0)] if term in state.postings else []
+        if prefix:
+            vocabulary = state.vocabulary
+            position = bisect.bisect_right(vocabulary, term)
+            while position < len(vocabulary) and vocabulary[position].startswith(term):
+                matches.append((vocabulary[position], self.prefix_discount))
+                position += 1
+        return matches
+
+    def search(
+        self,
+        query: str = "",
+        suit: Optional[str] = None,
+        arcana: Optional[str] = None,
+        prefix: bool = True,
+        limit: int = 10,
+        offset: int = 0,
+    ) -> SearchResult:
+        """Rank the cards matching every term of `query`, within the suit and arcana filters.
+
+        An empty query lists the filtered cards by number. `total` counts every match, while
+        `hits` holds the `limit` matches after `offset`.
+        """
+        started = time.perf_counter()
+        state = self._loaded
+        candidates: Optional[Set[int]] = None
+        if suit:
+            candidates = set(state.by_suit.get(_normalize(suit), ()))
+        if arcana:
+            selected = state.by_arcana.get(_normalize(arcana), set())
+            candidates = selected & candidates if candidates is not None else set(selected)
+
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            numbers = sorted(candidates) if candidates is not None else [record.number for record in state.records]
+            ranked = [(number, 0.0, ()) for number in numbers]
+        else:
+            scores: Dict[int, float] = {}
+            fields: Dict[int, Dict[str, None]] = {}
+            for index, term in enumerate(terms):
+                term_scores: Dict[int, float] = {}
+                for token, boost in self._expand(state, term, prefix):
+                    idf = state.idf[token]
+                    for number, posting in state.postings[token].items():
+                        if candidates is not None and number not in candidates:
+                            continue
+                        if index and number not in scores:
+                            continue
+                        score = boost * idf * posting.weight * (self.k1 + 1) / (posting.weight + state.norms[number])
+                        if score > term_scores.get(number, 0.0):
+                            term_scores[number] = score
+                        fields.setdefault(number, {}).update(dict.fromkeys(posting.fields))
+                scores = {number: scores.get(number, 0.0) + score for number, score in term_scores.items()}
+                if not scores:
+                    break
+            ranked = sorted(
+                ((number, score, tuple(fields[number])) for number, score in scores.items()),
+                key=lambda item: (-item[1], item[0]),
+            )
+
+        hits = [
+            SearchHit(state.by_number[number], round(score, 4), matched)
+            for number, score, matched in ranked[offset : offset + limit]
+        ]
+        self.queries += 1
+        self.query_time += time.perf_counter() - started
+        return SearchResult(total=len(ranked), hits=hits)
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size and query counters."""
+        state = self._loaded
+        return {
+            "cards": len(state.records),
+            "terms": len(state.postings),
+            "queries": self.queries,
+            "mean_query_ms": self.query_time / self.queries * 1000 if self.queries else 0.0,
+        }
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from api.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_WAIT = REGISTRY.histogram(
+    "llm_rate_limit_wait_seconds", "Time calls waited for client-side rate limit headroom.", ("model",)
+)
+RATE_LIMITED = REGISTRY.counter(
+    "llm_rate_limited_total", "Calls refused by the client-side rate limiter before reaching the model.", ("model",)
+)
+
+
+class RateLimit(NamedTuple):
+    """Requests and tokens per minute allowed for one model; `None` means unlimited."""
+
+    rpm: Optional[int] = None
+    tpm: Optional[int] = None
+
+
+def parse_rate_limits(value: str) -> Dict[str, RateLimit]:
+    """Parse `model=rpm:tpm` pairs separated by commas, e.g. `openai/gpt-oss-120b=30:60000,openai/gpt-oss-20b=:90000`."""
+    limits: Dict[str, RateLimit] = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        model, _, spec = item.strip().rpartition("=")
+        rpm, _, tpm = spec.partition(":")
+        if not model:
+            raise ValueError(f"Invalid rate limit {item!r}, expected model=rpm:tpm")
+        limits[model] = RateLimit(int(rpm) if rpm.strip() else None, int(tpm) if tpm.strip() else None)
+    return limits
+
+
+def usage_tokens(usage: Optional[object], default: int = 0) -> int:
+    """Total tokens of an OpenAI `usage` object, or `default` when the response reported none."""
+    if usage is None:
+        return default
+    total = getattr(usage, "total_tokens", None)
+    if total is None:
+        total = (getattr(usage, "prompt_tokens", 0) or 0) + (getattr(usage, "completion_tokens", 0) or 0)
+    return total
+
+
+class RateLimitedError(Exception):
+    """Raised when a model has no headroom within the governor's `max_wait`; `retry_after` is in seconds."""
+
+    def __init__(self, model: str, retry_after: float) -> None:
+        self.model = model
+        self.retry_after = retry_after
+        super().__init__(f"Rate limit for {model} reached, retry in {retry_after:.1f}s")
+
+
+class TokenBucket:
+    """Bucket refilled continuously at `per_minute / 60` units per second, holding at most `per_minute`.
+
+    The level may go negative: takes are reservations, and later callers wait out the debt.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def refill(self) -> float:
+        """Add what accrued since the last update and return the current level."""
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.level
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` (at most the capacity) fits in the bucket."""
+        self.refill()
+        deficit = min(amount, self.capacity) - self.level
+        return max(0.0, deficit / self.rate) if self.rate else math.inf
+
+    def take(self, amount: float) -> None:
+        self.refill()
+        self.level -= amount
+
+    def give(self, amount: float) -> None:
+        self.refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateGovernor:
+    """Client-side request and token budgets per upstream model.
+
+    `acquire(model, tokens)` reserves one request and the estimated tokens of a call before it
+    is made. When the buckets are short, the caller sleeps until the reservation is covered,
+    provided that takes at most `max_wait` seconds; otherwise `RateLimitedError` is raised
+    without reserving anything, so the caller can move on to another model. `settle()` then
+    corrects the token bucket with the tokens the call actually used, once it is over.
+
+    Models without a configured `RateLimit` are never limited.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, RateLimit]] = None,
+        max_wait: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_wait = max_wait
+        self.clock = clock
+        self.limits: Dict[str, RateLimit] = {}
+        self._buckets: Dict[str, Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+        self.waits = 0
+        self.rejections = 0
+        self.configure(limits or {})
+
+    def configure(self, limits: Dict[str, RateLimit]) -> None:
+        """Set or replace the limits of the given models; their buckets start full."""
+        for model, limit in limits.items():
+            self.limits[model] = limit
+            self._buckets[model] = (
+                TokenBucket(limit.rpm, self.clock) if limit.rpm else None,
+                TokenBucket(limit.tpm, self.clock) if limit.tpm else None,
+            )
+
+    def _reservation(self, model: str, tokens: int) -> List[Tuple[TokenBucket, float]]:
+        requests, budget = self._buckets.get(model, (None, None))
+        reservation: List[Tuple[TokenBucket, float]] = []
+        if requests is not None:
+            reservation.append((requests, 1.0))
+        if budget is not None and tokens > 0:
+            reservation.append((budget, float(tokens)))
+        return reservation
+
+    def wait_time(self, model: str, tokens: int = 0) -> float:
+        """Seconds a call to `model` costing `tokens` would wait right now."""
+        return max((bucket.wait_time(amount) for bucket, amount in self._reservation(model, tokens)), default=0.0)
+
+    def order(self, models: Sequence[str], tokens: int = 0) -> List[str]:
+        """`models` in their order, with those that cannot get headroom within `max_wait` moved last."""
+        return sorted(models, key=lambda model: self.wait_time(model, tokens) > self.max_wait)
+
+    async def acquire(self, model: str, tokens: int = 0) -> None:
+        """Reserve a request and `tokens` for `model`, waiting up to `max_wait`, or raise `RateLimitedError`."""
+        reservation = self._reservation(model, tokens)
+        if not reservation:
+            return
+
+        wait = max(bucket.wait_time(amount) for bucket, amount in reservation)
+        if wait > self.max_wait:
+            self.rejections += 1
+            RATE_LIMITED.inc(model)
+            raise RateLimitedError(model, wait)
+
+        for bucket, amount in reservation:
+            bucket.take(amount)
+        if wait <= 0:
+            return
+
+        self.waits += 1
+        RATE_LIMIT_WAIT.observe(wait, model)
+        logger.debug(f"Waiting {wait:.2f}s for rate limit headroom on {model}")
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            for bucket, amount in reservation:
+                bucket.give(amount)
+            raise
+
+    def settle(self, model: str, estimated: int, actual: int) -> None:
+        """Replace the estimated tokens of a finished call, successful or not, with those it used."""
+        budget = self._buckets.get(model, (None, None))[1]
+        if budget is None:
+            return
+        if actual > estimated:
+            budget.take(actual - estimated)
+        elif actual < estimated:
+            budget.give(estimated - actual)
+
+    def stats(self) -> Dict[str, Any]:
+        """Configured limits and remaining headroom per model, plus wait and rejection counters."""
+        models: Dict[str, Any] = {}
+        for model, (requests, budget) in self._buckets.items():
+            models[model] = {
+                "rpm": self.limits[model].rpm,
+                "tpm": self.limits[model].tpm,
+                "requests_available": round(requests.refill(), 2) if requests else None,
+                "tokens_available": round(budget.refill()) if budget else None,
+            }
+        return {"max_wait": self.max_wait, "waits": self.waits, "rejections": self.rejections, "models": models}
@@ -0,0 +1,106 @@
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Dict, Iterator, Mapping, Optional, Tuple
+
+from pydantic_core import to_json
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def make_etag(body: bytes) -> str:
+    """Return a strong ETag derived from the content hash of a response body."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def class_names(error: BaseException) -> Iterator[str]:
+    """`package.ClassName` of an exception's class and its bases, for matching optional SDK errors by name."""
+    for cls in type(error).__mro__:
+        yield f"{cls.__module__.partition('.')[0]}.{cls.__name__}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an `If-None-Match` header against an ETag using weak comparison (RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Check whether an `Accept-Encoding` header allows a gzip-encoded response."""
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip().lower()
+        if not quality.startswith("q="):
+            return True
+        try:
+            return float(quality[2:]) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """Serialize a response model (or plain data) straight to JSON bytes with pydantic-core.
+
+    Returning this from a route skips FastAPI's `response_model` re-validation and
+    `jsonable_encoder` pass, which only repeat work for models the route just built.
+    """
+    return Response(to_json(content), status_code=status_code, headers=headers, media_type="application/json")
+
+
+def format_sse(data: str, event: Optional[str] = None) -> str:
+    """Encode one server-sent event; multi-line data is split over several `data:` fields."""
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+async def merge_streams(streams: Dict[str, AsyncIterator[Any]]) -> AsyncIterator[Tuple[str, Any]]:
+    """Interleave several async iterators, yielding `(name, item)` pairs as items arrive.
+
+    An iterator that raises yields `(name, exception)` once and is then finished. Closing the
+    merged iterator cancels every iterator still running.
+    """
+    queue: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue()
+    finished = object()
+
+    async def pump(name: str, stream: AsyncIterator[Any]) -> None:
+        try:
+            async for item in stream:
+                await queue.put((name, item))
+        except Exception as e:
+            await queue.put((name, e))
+        finally:
+            await queue.put((name, finished))
+
+    tasks = [asyncio.create_task(pump(name, stream)) for name, stream in streams.items()]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            name, item = await queue.get()
+            if item is finished:
+                remaining -= 1
+                continue
+            yield name, item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files served with long-lived immutable caching, for content-hashed file names."""
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
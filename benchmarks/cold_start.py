@@ -0,0 +1,119 @@
+"""Cold-start benchmark for the card-only and predict paths.
+
+Each sample runs in a fresh interpreter, so it measures what a serverless cold start pays:
+
+- `card`: import `api.index`, then serve one `/tarot-cards/draw` and one `/tarot-cards/get-card-info`.
+- `predict`: import `api.index`, then initialize the LLM clients used by the predict endpoints.
+
+Usage:
+
+    python benchmarks/cold_start.py --runs 5 --card-budget-ms 900 --predict-budget-ms 2500 --output cold_start.json
+
+The script prints (and optionally writes) a JSON report with median timings and exits with
+status 1 when a path exceeds its budget, or when the card path imports an LLM client library.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_BASE_DIR = Path(__file__).resolve().parents[1]
+LLM_MODULES = ("openai", "instructor", "httpx")
+
+CARD_PATH = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import api.index as index
+imported = time.perf_counter()
+request = index.CardsAPIRequest(name="John Doe", dob="2000-01-01", count=3)
+asyncio.run(index.draw_cards(request))
+index.get_card_info(1, if_none_match=None)
+finished = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_call_ms": (finished - imported) * 1000,
+    "total_ms": (finished - started) * 1000,
+    "llm_modules": [m for m in %(llm_modules)r if m in sys.modules],
+}))
+"""
+
+PREDICT_PATH = """
+import json, sys, time
+started = time.perf_counter()
+import api.index as index
+imported = time.perf_counter()
+index.TarotReader._get_client()
+index.NumerologyReader._get_client()
+finished = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_call_ms": (finished - imported) * 1000,
+    "total_ms": (finished - started) * 1000,
+    "llm_modules": [m for m in %(llm_modules)r if m in sys.modules],
+}))
+"""
+
+
+def run_sample(code: str) -> Dict[str, Any]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(PROJECT_BASE_DIR),
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "sk-bench"),
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", code % {"llm_modules": LLM_MODULES}],
+        cwd=PROJECT_BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "runs": len(samples),
+        "import_ms": statistics.median(s["import_ms"] for s in samples),
+        "first_call_ms": statistics.median(s["first_call_ms"] for s in samples),
+        "total_ms": statistics.median(s["total_ms"] for s in samples),
+        "max_total_ms": max(s["total_ms"] for s in samples),
+        "llm_modules": samples[-1]["llm_modules"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--card-budget-ms", type=float, default=None)
+    parser.add_argument("--predict-budget-ms", type=float, default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    report = {
+        "card": summarize([run_sample(CARD_PATH) for _ in range(args.runs)]),
+        "predict": summarize([run_sample(PREDICT_PATH) for _ in range(args.runs)]),
+    }
+
+    failures = []
+    if report["card"]["llm_modules"]:
+        failures.append(f"card path imported LLM modules: {report['card']['llm_modules']}")
+    for path, budget in (("card", args.card_budget_ms), ("predict", args.predict_budget_ms)):
+        if budget is not None and report[path]["total_ms"] > budget:
+            failures.append(f"{path} path took {report[path]['total_ms']:.0f} ms, budget is {budget:.0f} ms")
+    report["failures"] = failures
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        args.output.write_text(output + "\n")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
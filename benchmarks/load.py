@@ -0,0 +1,290 @@
+"""Load benchmark for the API's hot paths against a stub OpenAI-compatible server.
+
+The harness starts `benchmarks/stub_openai.py` and the API (`api.index:app` under uvicorn,
+pointed at the stub through `OPENAI_BASE_URL`) as subprocesses, then drives each scenario
+with a closed loop of concurrent clients at every requested concurrency level:
+
+- `draw`: `POST /tarot-cards/draw`
+- `card-info`: `GET /tarot-cards/get-card-info`
+- `tarot`: `POST /predict/tarot-interpretations`
+- `numerology`: `POST /predict/numerology-interpretations`
+
+Predict requests use a unique name each, so they miss the reading cache and reach the stub.
+
+Usage:
+
+    python benchmarks/load.py --concurrency 1 8 32 --requests 500 --predict-requests 100 \\
+        --stub-latency-ms 300 --stub-jitter-ms 100 --output load.json --baseline previous.json
+
+The JSON report holds throughput and p50/p95/p99 latencies per scenario and concurrency,
+plus the git commit and settings, so runs from different commits can be compared; with
+`--baseline` the relative change against an earlier report is included as well.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+PROJECT_BASE_DIR = Path(__file__).resolve().parents[1]
+SCENARIOS = ("draw", "card-info", "tarot", "numerology")
+PREDICT_SCENARIOS = ("tarot", "numerology")
+
+RequestFactory = Callable[[int], Tuple[str, str, Optional[Dict[str, Any]]]]
+
+
+def _tarot_request(i: int) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+    cards = ("The Fool", "The Magician", "Death", "The Sun", "Ace of Cups", "Ten of Swords")
+    return (
+        "POST",
+        "/predict/tarot-interpretations",
+        {
+            "name": f"Bench User {i}",
+            "question": "What should I focus on this month?",
+            "past_card": {"name": cards[i % len(cards)], "is_upright": True},
+            "present_card": {"name": cards[(i + 1) % len(cards)], "is_upright": i % 2 == 0},
+            "future_card": {"name": cards[(i + 2) % len(cards)], "is_upright": True},
+        },
+    )
+
+
+REQUESTS: Dict[str, RequestFactory] = {
+    "draw": lambda i: ("POST", "/tarot-cards/draw", {"name": f"Bench User {i % 100}", "dob": "1990-05-17", "count": 3}),
+    "card-info": lambda i: ("GET", f"/tarot-cards/get-card-info?card_number={i % 78 + 1}", None),
+    "tarot": _tarot_request,
+    "numerology": lambda i: (
+        "POST",
+        "/predict/numerology-interpretations",
+        {"name": f"Bench User {i}", "dob": "1990-05-17", "question": "What should I focus on this month?"},
+    ),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args} exited with status {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} did not become ready in {timeout:.0f}s")
+
+
+@contextmanager
+def servers(args: argparse.Namespace) -> Iterator[str]:
+    """Run the stub and the API; yields the API base URL."""
+    stub_port, api_port = free_port(), free_port()
+    stub = subprocess.Popen(
+        [
+            sys.executable,
+            str(PROJECT_BASE_DIR / "benchmarks" / "stub_openai.py"),
+            f"--port={stub_port}",
+            f"--latency-ms={args.stub_latency_ms}",
+            f"--jitter-ms={args.stub_jitter_ms}",
+            f"--failure-rate={args.stub_failure_rate}",
+            f"--failure-status={args.stub_failure_status}",
+        ],
+        cwd=PROJECT_BASE_DIR,
+    )
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(PROJECT_BASE_DIR),
+        "OPENAI_API_KEY": "sk-bench",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{stub_port}/v1",
+        "READING_CACHE_PATH": "",
+    }
+    api = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "api.index:app",
+            f"--port={api_port}",
+            "--log-level=warning",
+            "--no-access-log",
+        ],
+        cwd=PROJECT_BASE_DIR,
+        env=env,
+    )
+    try:
+        wait_ready(f"http://127.0.0.1:{stub_port}/health", stub)
+        wait_ready(f"http://127.0.0.1:{api_port}/metrics", api)
+        yield f"http://127.0.0.1:{api_port}"
+    finally:
+        for process in (api, stub):
+            process.terminate()
+        for process in (api, stub):
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered), max(1, math.ceil(q * len(ordered)))) - 1]
+
+
+async def run_level(
+    client: httpx.AsyncClient, factory: RequestFactory, requests: int, concurrency: int, offset: int
+) -> Dict[str, Any]:
+    """Send `requests` requests with `concurrency` workers, each issuing its next request as soon as one completes."""
+    counter = itertools.count(offset)
+    stop = offset + requests
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+
+    async def worker() -> None:
+        while (i := next(counter)) < stop:
+            method, path, body = factory(i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": sum(count for status, count in statuses.items() if not status.startswith("2")),
+        "statuses": statuses,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(latencies) / duration, 2) if duration else 0.0,
+        "mean_ms": round(statistics.fmean(ordered), 2) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50), 2),
+        "p95_ms": round(percentile(ordered, 0.95), 2),
+        "p99_ms": round(percentile(ordered, 0.99), 2),
+        "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+async def run_benchmark(base_url: str, args: argparse.Namespace) -> Dict[str, List[Dict[str, Any]]]:
+    limits = httpx.Limits(
+        max_connections=max(args.concurrency) * 2, max_keepalive_connections=max(args.concurrency) * 2
+    )
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    offset = 0
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        for scenario in args.scenarios:
+            factory = REQUESTS[scenario]
+            requests = args.predict_requests if scenario in PREDICT_SCENARIOS else args.requests
+            await run_level(client, factory, args.warmup, 1, offset)
+            offset += args.warmup
+            results[scenario] = []
+            for concurrency in args.concurrency:
+                level = await run_level(client, factory, requests, concurrency, offset)
+                offset += requests
+                results[scenario].append(level)
+                print(
+                    f"{scenario:>10} c={concurrency:<4} {level['throughput_rps']:>9.1f} req/s  "
+                    f"p50={level['p50_ms']:.1f}ms p95={level['p95_ms']:.1f}ms p99={level['p99_ms']:.1f}ms  "
+                    f"errors={level['errors']}",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def compare(results: Dict[str, List[Dict[str, Any]]], baseline: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Relative change of throughput and latency percentiles against a previous report."""
+    changes: Dict[str, List[Dict[str, Any]]] = {}
+    for scenario, levels in results.items():
+        previous = {level["concurrency"]: level for level in baseline.get("results", {}).get(scenario, [])}
+        for level in levels:
+            before = previous.get(level["concurrency"])
+            if before is None:
+                continue
+            change = {"concurrency": level["concurrency"]}
+            for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+                change[metric] = round(level[metric] / before[metric] - 1, 4) if before[metric] else None
+            changes.setdefault(scenario, []).append(change)
+    return changes
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PROJECT_BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=500, help="requests per level for card scenarios")
+    parser.add_argument("--predict-requests", type=int, default=100, help="requests per level for predict scenarios")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--stub-latency-ms", type=float, default=300.0)
+    parser.add_argument("--stub-jitter-ms", type=float, default=100.0)
+    parser.add_argument("--stub-failure-rate", type=float, default=0.0)
+    parser.add_argument("--stub-failure-status", type=int, default=500)
+    parser.add_argument("--base-url", default=None, help="benchmark an already running API instead of starting one")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    args = parser.parse_args()
+
+    if args.base_url:
+        results = asyncio.run(run_benchmark(args.base_url, args))
+    else:
+        with servers(args) as base_url:
+            results = asyncio.run(run_benchmark(base_url, args))
+
+    report: Dict[str, Any] = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "settings": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "results": results,
+    }
+    if args.baseline:
+        report["baseline"] = {
+            "path": str(args.baseline),
+            "changes": compare(results, json.loads(args.baseline.read_text())),
+        }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        args.output.write_text(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
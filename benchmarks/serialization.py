@@ -0,0 +1,147 @@
+"""Per-request CPU cost of building and serializing API responses.
+
+Each case compares the route's previous response path, a validated response model returned
+to FastAPI (`response_model` validation, `jsonable_encoder`, `JSONResponse`), with the
+current one: pre-rendered card fragments for `/tarot-cards/draw`, and `json_response()`
+(pydantic-core straight to bytes) for the predict routes.
+
+Usage:
+
+    python benchmarks/serialization.py --iterations 2000 --output serialization.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+PROJECT_BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_BASE_DIR))
+
+from api.models import (  # noqa: E402
+    CardsAPIResponse,
+    FullReadingAPIResponse,
+    TarotAPIResponse,
+    TarotCard,
+    TarotInterpretation,
+)
+from api.modules import TarotDeck  # noqa: E402
+from api.utils import json_response  # noqa: E402
+
+MEANING = "The cards speak of a turning point: what was held back is ready to move. " * 6
+
+
+def fastapi_default(response_model: type, build: Callable[[], Any]) -> Callable[[], bytes]:
+    """The previous path: the route returns a model and FastAPI validates and encodes it."""
+    field = create_model_field(name="Response", type_=response_model, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def run() -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=build(), is_coroutine=True))
+        return JSONResponse(content).body
+
+    return run
+
+
+def validated_spread(count: int) -> Callable[[], CardsAPIResponse]:
+    """Draw the way the deck used to: sample, then build and validate a `TarotCard` per card."""
+    deck = TarotDeck(seed=7)
+
+    def build() -> CardsAPIResponse:
+        rng = random.Random(deck.random_seed)
+        selected = rng.sample(deck.cards, count)
+        cards = [
+            TarotCard(name=card.name, image_url=card.image_url, is_upright=rng.random() < 0.5) for card in selected
+        ]
+        return CardsAPIResponse(cards=cards)
+
+    return build
+
+
+def reading() -> TarotAPIResponse:
+    return TarotAPIResponse(
+        interpretations=[
+            TarotInterpretation(
+                card_name="The Fool (UPRIGHT)", position=position, orientation="upright", meaning=MEANING
+            )
+            for position in ("past", "present", "future")
+        ],
+        summary=MEANING,
+    )
+
+
+def full_reading() -> FullReadingAPIResponse:
+    response = reading()
+    return FullReadingAPIResponse(
+        cards=TarotDeck(seed=7).draw(3),
+        interpretations=response.interpretations,
+        summary=response.summary,
+        numerology_meaning=MEANING * 3,
+    )
+
+
+def cases() -> Dict[str, Dict[str, Callable[[], bytes]]]:
+    return {
+        f"draw-{count}": {
+            "previous": fastapi_default(CardsAPIResponse, validated_spread(count)),
+            "current": lambda count=count: TarotDeck(seed=7).draw_json(count),
+        }
+        for count in (3, 10, 78)
+    } | {
+        "tarot-interpretations": {
+            "previous": fastapi_default(TarotAPIResponse, reading),
+            "current": lambda: json_response(reading()).body,
+        },
+        "full-reading": {
+            "previous": fastapi_default(FullReadingAPIResponse, full_reading),
+            "current": lambda: json_response(full_reading()).body,
+        },
+    }
+
+
+def cpu_us(run: Callable[[], bytes], iterations: int) -> float:
+    for _ in range(min(100, iterations)):
+        run()
+    started = time.process_time()
+    for _ in range(iterations):
+        run()
+    return (time.process_time() - started) / iterations * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    TarotDeck.catalog.load()
+    report: Dict[str, Any] = {}
+    for name, paths in cases().items():
+        previous, current = paths["previous"], paths["current"]
+        if json.loads(previous()) != json.loads(current()):
+            raise AssertionError(f"{name}: responses differ between paths")
+        previous_us, current_us = cpu_us(previous, args.iterations), cpu_us(current, args.iterations)
+        report[name] = {
+            "previous_us": round(previous_us, 2),
+            "current_us": round(current_us, 2),
+            "saved_us": round(previous_us - current_us, 2),
+            "speedup": round(previous_us / current_us, 2) if current_us else None,
+        }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        args.output.write_text(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Stub OpenAI-compatible chat completions server for benchmarks.
+
+It answers `POST /v1/chat/completions` with canned content after a configurable latency, in
+the shapes the readers use:
+
+- plain completions (`NumerologyReader`), streamed or not;
+- forced tool calls (`TarotReader` through instructor), streamed or not, with arguments
+  generated from the tool's JSON schema.
+
+Failures are injected at random with a configurable status code, so fallback, circuit
+breaking and admission control can be exercised too.
+
+Point the API at it with `OPENAI_BASE_URL=http://127.0.0.1:8901/v1`, or in-process with
+`TarotReader.configure(client=instructor.from_openai(openai.AsyncOpenAI(base_url=..., api_key="sk-bench")))`
+and `NumerologyReader.configure(client=openai.AsyncOpenAI(base_url=..., api_key="sk-bench"))`.
+
+Usage:
+
+    python benchmarks/stub_openai.py --port 8901 --latency-ms 300 --jitter-ms 100 --failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+FILLER = (
+    "The cards speak of a turning point: what was held back is ready to move, and patience now "
+    "will be repaid with clarity. Trust the quiet signals and act on them when the time comes."
+)
+
+
+@dataclass
+class StubConfig:
+    """Latency, failure and streaming behaviour of the stub."""
+
+    latency_ms: float = 300.0
+    jitter_ms: float = 0.0
+    failure_rate: float = 0.0
+    failure_status: int = 500
+    stream_chunks: int = 20
+    completion_chars: int = 600
+    seed: Optional[int] = None
+
+
+def _value_for(schema: Dict[str, Any], text: str) -> Any:
+    kind = schema.get("type")
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return True
+    if kind == "array":
+        return [_value_for(schema.get("items", {}), text)]
+    if kind == "object":
+        return {name: _value_for(prop, text) for name, prop in schema.get("properties", {}).items()}
+    return text
+
+
+def _split(text: str, parts: int) -> List[str]:
+    size = max(1, -(-len(text) // max(1, parts)))
+    return [text[i : i + size] for i in range(0, len(text), size)] or [""]
+
+
+def create_app(config: StubConfig) -> Starlette:
+    """Build the stub ASGI app for `config`."""
+    rng = random.Random(config.seed)
+    text = (FILLER * (config.completion_chars // len(FILLER) + 1))[: config.completion_chars]
+
+    async def delay() -> None:
+        await asyncio.sleep(max(0.0, config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)) / 1000)
+
+    def tool_call(body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        tools = body.get("tools") or []
+        if not tools:
+            return None
+        choice = body.get("tool_choice")
+        name = choice["function"]["name"] if isinstance(choice, dict) else tools[0]["function"]["name"]
+        function = next(tool["function"] for tool in tools if tool["function"]["name"] == name)
+        per_field = max(20, config.completion_chars // max(1, len(function["parameters"].get("properties", {}))))
+        arguments = _value_for(function["parameters"], text[:per_field])
+        return {
+            "id": f"call_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)},
+        }
+
+    def usage(body: Dict[str, Any], completion: str) -> Dict[str, int]:
+        prompt_tokens = len(json.dumps(body.get("messages", []))) // 4
+        completion_tokens = len(completion) // 4
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    async def stream(
+        body: Dict[str, Any], base: Dict[str, Any], call: Optional[Dict[str, Any]]
+    ) -> AsyncIterator[bytes]:
+        content = call["function"]["arguments"] if call else text
+        pieces = _split(content, config.stream_chunks)
+        interval = config.latency_ms / 1000 / max(1, len(pieces))
+        for index, piece in enumerate(pieces):
+            if call:
+                tool_delta: Dict[str, Any] = {"index": 0, "function": {"arguments": piece}}
+                if index == 0:
+                    tool_delta.update(id=call["id"], type="function")
+                    tool_delta["function"]["name"] = call["function"]["name"]
+                delta: Dict[str, Any] = (
+                    {"role": "assistant", "tool_calls": [tool_delta]} if index == 0 else {"tool_calls": [tool_delta]}
+                )
+            else:
+                delta = {"role": "assistant", "content": piece} if index == 0 else {"content": piece}
+            chunk = {
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n".encode()
+            await asyncio.sleep(interval)
+        finish = {"index": 0, "delta": {}, "finish_reason": "tool_calls" if call else "stop"}
+        yield f"data: {json.dumps({**base, 'object': 'chat.completion.chunk', 'choices': [finish]})}\n\n".encode()
+        if (body.get("stream_options") or {}).get("include_usage"):
+            final = {**base, "object": "chat.completion.chunk", "choices": [], "usage": usage(body, content)}
+            yield f"data: {json.dumps(final)}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+    async def chat_completions(request: Request) -> Response:
+        body = await request.json()
+        if rng.random() < config.failure_rate:
+            await delay()
+            return JSONResponse(
+                {"error": {"message": "Injected stub failure", "type": "stub_error", "code": config.failure_status}},
+                status_code=config.failure_status,
+            )
+
+        call = tool_call(body)
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+        }
+        if body.get("stream"):
+            return StreamingResponse(stream(body, base, call), media_type="text/event-stream")
+
+        await delay()
+        message: Dict[str, Any] = {"role": "assistant", "content": None if call else text}
+        if call:
+            message["tool_calls"] = [call]
+        return JSONResponse(
+            {
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if call else "stop"}],
+                "usage": usage(body, call["function"]["arguments"] if call else text),
+            }
+        )
+
+    async def health(request: Request) -> Response:
+        return JSONResponse({"status": "ok"})
+
+    return Starlette(
+        routes=[
+            Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+            Route("/health", health, methods=["GET"]),
+        ]
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency-ms", type=float, default=StubConfig.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=StubConfig.jitter_ms)
+    parser.add_argument("--failure-rate", type=float, default=StubConfig.failure_rate)
+    parser.add_argument("--failure-status", type=int, default=StubConfig.failure_status)
+    parser.add_argument("--stream-chunks", type=int, default=StubConfig.stream_chunks)
+    parser.add_argument("--completion-chars", type=int, default=StubConfig.completion_chars)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        failure_status=args.failure_status,
+        stream_chunks=args.stream_chunks,
+        completion_chars=args.completion_chars,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from api.admission import AdmissionController, AdmissionMiddleware, OverloadedError
+
+
+async def started(coro) -> "asyncio.Task":
+    task = asyncio.ensure_future(coro)
+    await asyncio.sleep(0)
+    return task
+
+
+def test_admits_up_to_the_limit_then_queues() -> None:
+    async def main() -> None:
+        controller = AdmissionController(initial_limit=2)
+        await controller.acquire("free")
+        await controller.acquire("free")
+        waiting = await started(controller.acquire("free"))
+        assert not waiting.done()
+        assert controller.stats()["queued"]["free"] == 1
+
+        controller.release()
+        await waiting
+        assert controller.in_flight == 2
+
+    asyncio.run(main())
+
+
+def test_higher_lane_is_admitted_first() -> None:
+    async def main() -> None:
+        controller = AdmissionController(initial_limit=1)
+        await controller.acquire("free")
+        free = await started(controller.acquire("free"))
+        paid = await started(controller.acquire("paid"))
+
+        controller.release()
+        await paid
+        assert not free.done()
+        controller.release()
+        await free
+
+    asyncio.run(main())
+
+
+def test_queue_timeout_sheds() -> None:
+    async def main() -> None:
+        controller = AdmissionController(initial_limit=1, queue_timeout=0.01)
+        await controller.acquire("free")
+        with pytest.raises(OverloadedError) as e:
+            await controller.acquire("free")
+        assert e.value.retry_after >= 1
+        assert controller.stats()["shed"] == 1
+        assert controller.queued == 0
+
+    asyncio.run(main())
+
+
+def test_estimated_wait_over_the_deadline_sheds_at_once() -> None:
+    async def main() -> None:
+        controller = AdmissionController(initial_limit=1, queue_timeout=10)
+        await controller.acquire("free")
+        controller.release(service_time=30.0)
+        await controller.acquire("free")
+        with pytest.raises(OverloadedError) as e:
+            await asyncio.wait_for(controller.acquire("free"), timeout=1)
+        assert e.value.retry_after == 30
+
+    asyncio.run(main())
+
+
+def test_full_queue_evicts_a_lower_lane_or_sheds() -> None:
+    async def main() -> None:
+        controller = AdmissionController(initial_limit=1, max_queue=1)
+        await controller.acquire("free")
+        free = await started(controller.acquire("free"))
+        with pytest.raises(OverloadedError):
+            await controller.acquire("free")
+
+        paid = await started(controller.acquire("paid"))
+        with pytest.raises(OverloadedError, match="Preempted"):
+            await free
+        controller.release()
+        await paid
+
+    asyncio.run(main())
+
+
+def status_error(status: int) -> Exception:
+    error = Exception("upstream")
+    error.status_code = status  # type: ignore[attr-defined]
+    return error
+
+
+REQUEST = httpx.Request("POST", "https://llm.example/v1/chat/completions")
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        asyncio.TimeoutError(),
+        status_error(429),
+        status_error(503),
+        httpx.ReadTimeout("slow", request=REQUEST),
+        openai.APITimeoutError(request=REQUEST),
+    ],
+)
+def test_upstream_overload_backs_off(error: Exception) -> None:
+    controller = AdmissionController(initial_limit=16, backoff=0.5)
+    controller.observe(error=error)
+    assert controller.limit == 8
+    assert controller.stats()["upstream_overloads"] == 1
+
+
+def test_other_errors_leave_the_limit_alone() -> None:
+    controller = AdmissionController(initial_limit=16)
+    controller.observe(error=status_error(400))
+    assert controller.limit == 16
+
+
+def test_slow_cold_start_does_not_cut_the_limit() -> None:
+    controller = AdmissionController(initial_limit=16)
+    controller.observe(latency=5.0)
+    for _ in range(50):
+        controller.observe(latency=0.5)
+    assert controller.limit == 16
+    assert controller.stats()["upstream_latency"] == 0.5
+
+
+def test_latency_drift_after_warmup_cuts_the_limit() -> None:
+    controller = AdmissionController(initial_limit=16, warmup_samples=5)
+    for _ in range(5):
+        controller.observe(latency=0.5)
+    controller.observe(latency=20.0)
+    assert controller.limit == pytest.approx(14.4)
+
+
+def test_middleware_sheds_with_503_and_retry_after() -> None:
+    async def endpoint(request) -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    controller = AdmissionController(initial_limit=1, queue_timeout=0.01)
+    app = Starlette(routes=[Route("/predict/reading", endpoint), Route("/health", endpoint)])
+    client = TestClient(AdmissionMiddleware(app, controller))
+
+    assert client.get("/predict/reading").status_code == 200
+    assert controller.in_flight == 0
+
+    controller.in_flight = 1
+    response = client.get("/predict/reading")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/health").status_code == 200
@@ -0,0 +1,54 @@
+from typing import Any, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.index as index
+from api.models.api import TAROT_BATCH_MAX_SIZE
+from api.modules.predict import TarotReader
+
+CARD = {"name": "The Fool", "is_upright": True}
+READING = {"name": "Ann", "question": "q", "past_card": CARD, "present_card": CARD, "future_card": CARD, "tier": "fast"}
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(index.app)
+
+
+@pytest.fixture
+def concurrency(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    seen: List[int] = []
+
+    async def generate_readings(cls: Any, requests: Any, concurrency: int) -> list:
+        seen.append(concurrency)
+        return []
+
+    monkeypatch.setattr(TarotReader, "generate_readings", classmethod(generate_readings))
+    return seen
+
+
+@pytest.mark.parametrize("size", [0, TAROT_BATCH_MAX_SIZE + 1])
+def test_batch_size_is_bounded(client: TestClient, size: int) -> None:
+    response = client.post("/predict/tarot-interpretations/batch", json={"requests": [READING] * size})
+    assert response.status_code == 422
+
+
+def test_batch_takes_free_slots_up_to_half_the_limit(client: TestClient, concurrency: List[int]) -> None:
+    admission = index.PREDICT_ADMISSION
+    response = client.post("/predict/tarot-interpretations/batch", json={"requests": [READING] * 32, "concurrency": 64})
+    assert response.status_code == 200
+    assert concurrency == [int(admission.limit * admission.max_share)]
+    assert admission.in_flight == 0
+
+
+def test_busy_batch_runs_with_its_own_slot(
+    client: TestClient, concurrency: List[int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    admission = index.PREDICT_ADMISSION
+    busy = int(admission.limit) - 1
+    monkeypatch.setattr(admission, "in_flight", busy)
+    response = client.post("/predict/tarot-interpretations/batch", json={"requests": [READING] * 8, "concurrency": 8})
+    assert response.status_code == 200
+    assert concurrency == [1]
+    assert admission.in_flight == busy
@@ -0,0 +1,85 @@
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.index as index
+from api.modules.tarot_cards import TarotDeck
+from api.modules.tarot_cards.catalog import CardCatalog
+
+
+@pytest.fixture
+def catalog() -> CardCatalog:
+    return CardCatalog(TarotDeck.catalog.card_dir, TarotDeck.catalog.images_subpath).load()
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(index.app)
+
+
+def test_bundle_projects_fields_in_catalog_order(catalog: CardCatalog) -> None:
+    cards = json.loads(catalog.bundle([3, 1, 3], ["keywords", "name"]).body)["cards"]
+    assert [card["card_number"] for card in cards] == [3, 1]
+    assert list(cards[1]) == ["card_number", "name", "keywords"]
+    assert cards[1]["name"] == "The Fool"
+    assert cards[1]["keywords"] == catalog.get(1).info["keywords"]
+
+
+def test_bundle_defaults_to_every_card_and_field(catalog: CardCatalog) -> None:
+    cards = json.loads(catalog.bundle().body)["cards"]
+    assert len(cards) == len(catalog)
+    assert cards[0] == {"card_number": 1, **catalog.get(1).info}
+
+
+def test_bundle_rejects_unknown_cards_and_fields(catalog: CardCatalog) -> None:
+    with pytest.raises(ValueError, match="Unknown card numbers: 99"):
+        catalog.bundle([1, 99])
+    with pytest.raises(ValueError, match="Unknown card fields: colour"):
+        catalog.bundle(fields=["name", "colour"])
+
+
+def test_bundle_is_cached_with_gzip_and_etag(catalog: CardCatalog) -> None:
+    first = catalog.bundle([1, 2], ["name"])
+    misses = catalog.misses
+    assert catalog.bundle([1, 2], ["name"]) is first
+    assert catalog.misses == misses
+    assert gzip.decompress(first.gzipped) == first.body
+    assert catalog.bundle([2, 1], ["name"]).etag != first.etag
+
+
+def test_endpoint_negotiates_gzip(client: TestClient) -> None:
+    plain = client.get(
+        "/tarot-cards/cards", params={"cards": "1,2", "fields": "name"}, headers={"Accept-Encoding": "identity"}
+    )
+    assert plain.status_code == 200
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["Vary"] == "Accept-Encoding"
+    assert plain.json() == {
+        "cards": [{"card_number": 1, "name": "The Fool"}, {"card_number": 2, "name": "The Magician"}]
+    }
+
+    zipped = client.get(
+        "/tarot-cards/cards", params={"cards": "1,2", "fields": "name"}, headers={"Accept-Encoding": "gzip"}
+    )
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert zipped.json() == plain.json()
+    assert zipped.headers["ETag"] != plain.headers["ETag"]
+
+
+def test_endpoint_honours_if_none_match(client: TestClient) -> None:
+    params = {"cards": "all", "fields": "name,image_url"}
+    etag = client.get("/tarot-cards/cards", params=params).headers["ETag"]
+    cached = client.get("/tarot-cards/cards", params=params, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"cards": "one,two"}, {"cards": "0"}, {"cards": "79"}, {"cards": ","}, {"fields": "name,colour"}],
+)
+def test_endpoint_rejects_bad_selections(client: TestClient, params: dict) -> None:
+    assert client.get("/tarot-cards/cards", params=params).status_code == 400
@@ -0,0 +1,18 @@
+import pydantic
+import pytest
+
+from api.modules.tarot_cards import TarotDeck
+
+
+def test_drawn_cards_are_frozen() -> None:
+    card = TarotDeck(seed=1).draw(1)[0]
+    with pytest.raises(pydantic.ValidationError):
+        card.name = "The Fool"
+    assert TarotDeck(seed=1).draw(1)[0].full_card_name == card.full_card_name
+
+
+def test_draw_json_matches_draw() -> None:
+    cards = TarotDeck(seed=7).draw(5)
+    assert (
+        TarotDeck(seed=7).draw_json(5) == b'{"cards":[' + b",".join(c.model_dump_json().encode() for c in cards) + b"]}"
+    )
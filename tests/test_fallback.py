@@ -0,0 +1,153 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+import pytest
+from fastapi import HTTPException
+
+from api.modules.predict import AllModelsFailedError, FallbackPolicy, HealthTracker, NumerologyReader, TarotReader
+from api.ratelimit import RateGovernor, RateLimit
+
+MODEL = "model"
+COST = 1000
+
+
+@pytest.fixture
+def governor() -> RateGovernor:
+    return RateGovernor({MODEL: RateLimit(tpm=6000)}, clock=lambda: 0.0)
+
+
+@pytest.fixture
+def policy(governor: RateGovernor) -> FallbackPolicy:
+    return FallbackPolicy(governor=governor, health=HealthTracker())
+
+
+def budget(governor: RateGovernor) -> float:
+    return governor.stats()["models"][MODEL]["tokens_available"]
+
+
+def test_attempt_settles_to_usage(governor: RateGovernor, policy: FallbackPolicy) -> None:
+    async def call(model: str) -> str:
+        try:
+            return "reading"
+        finally:
+            policy.settle(model, COST, 150)
+
+    assert asyncio.run(policy.run([MODEL], call, cost=COST)) == "reading"
+    assert budget(governor) == 6000 - 150
+
+
+def test_attempt_cancelled_before_its_call_is_refunded(governor: RateGovernor) -> None:
+    policy = FallbackPolicy(governor=governor, health=HealthTracker(), concurrency={MODEL: 1})
+
+    async def main() -> None:
+        release = asyncio.Event()
+        calls = []
+
+        async def call(model: str) -> str:
+            calls.append(model)
+            try:
+                await release.wait()
+                return "reading"
+            finally:
+                policy.settle(model, COST, 150)
+
+        holder = asyncio.create_task(policy.run([MODEL], call, cost=COST))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(policy.run([MODEL], call, cost=COST))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert budget(governor) == 6000 - COST
+        release.set()
+        assert await holder == "reading"
+        assert calls == [MODEL]
+
+    asyncio.run(main())
+    assert budget(governor) == 6000 - 150
+
+
+def test_timed_out_stream_is_refunded(governor: RateGovernor) -> None:
+    policy = FallbackPolicy(governor=governor, health=HealthTracker(), default_timeout=0.01)
+
+    async def open_stream(model: str) -> AsyncIterator[str]:
+        try:
+            await asyncio.sleep(10)
+            yield "never"
+        finally:
+            policy.settle(model, COST, 0)
+
+    async def main() -> None:
+        async for _ in policy.stream([MODEL], open_stream, cost=COST):
+            pass
+
+    with pytest.raises(AllModelsFailedError):
+        asyncio.run(main())
+    assert budget(governor) == 6000
+
+
+def reader_client(**completions: Any) -> SimpleNamespace:
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(**completions)))
+
+
+async def rejected(**kwargs: Any) -> Any:
+    raise RuntimeError("invalid output")
+
+
+async def rejected_stream(**kwargs: Any) -> AsyncIterator[Any]:
+    raise RuntimeError("invalid output")
+    yield
+
+
+@pytest.fixture
+def readers(monkeypatch: pytest.MonkeyPatch, policy: FallbackPolicy) -> None:
+    for reader in (TarotReader, NumerologyReader):
+        monkeypatch.setattr(reader, "fallback", policy)
+        monkeypatch.setattr(reader, "models", [MODEL])
+    monkeypatch.setattr(
+        TarotReader, "client", reader_client(create_with_completion=rejected, create_partial=rejected_stream)
+    )
+    monkeypatch.setattr(NumerologyReader, "client", reader_client(create=rejected))
+
+
+CARDS = ("The Fool (UPRIGHT)", "The Magician (REVERSED)", "Death (UPRIGHT)")
+
+
+@pytest.mark.usefixtures("readers")
+def test_failed_tarot_call_keeps_its_reservation(governor: RateGovernor) -> None:
+    cache_key, prompt = TarotReader._prepare_request("Ann Lee", "Will the call fail?", *CARDS)
+    with pytest.raises(AllModelsFailedError):
+        asyncio.run(TarotReader._complete(cache_key, prompt))
+    assert budget(governor) == 6000 - TarotReader._estimate_cost(prompt)
+
+
+@pytest.mark.usefixtures("readers")
+def test_failed_tarot_stream_keeps_its_reservation(governor: RateGovernor) -> None:
+    async def main() -> list:
+        stream = TarotReader.stream_interpretation("Ann Lee", "Will the stream fail?", *CARDS)
+        return [tier async for _, tier in stream]
+
+    assert asyncio.run(main()) == ["fast"]
+    _, prompt = TarotReader._prepare_request("Ann Lee", "Will the stream fail?", *CARDS)
+    assert budget(governor) == 6000 - TarotReader._estimate_cost(prompt)
+
+
+@pytest.mark.usefixtures("readers")
+def test_failed_numerology_call_keeps_its_reservation(governor: RateGovernor) -> None:
+    prompt = NumerologyReader._prepare_request("Ann Lee", "1990-10-01", "Will the call fail?")
+    with pytest.raises(HTTPException):
+        asyncio.run(NumerologyReader._complete(prompt))
+    assert budget(governor) == 6000 - NumerologyReader._estimate_cost(prompt)
+
+
+@pytest.mark.usefixtures("readers")
+def test_failed_numerology_stream_keeps_its_reservation(governor: RateGovernor) -> None:
+    async def main() -> None:
+        async for _ in NumerologyReader.stream_analysis("Ann Lee", "1990-10-01", "Will the stream fail?"):
+            pass
+
+    with pytest.raises(HTTPException):
+        asyncio.run(main())
+    prompt = NumerologyReader._prepare_request("Ann Lee", "1990-10-01", "Will the stream fail?")
+    assert budget(governor) == 6000 - NumerologyReader._estimate_cost(prompt)
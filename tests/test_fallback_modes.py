@@ -0,0 +1,80 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Tuple
+
+import pytest
+
+from api.modules.predict import AllModelsFailedError, FallbackPolicy
+
+
+def make_call(delays: Dict[str, float], failing: Tuple[str, ...] = ()) -> Tuple[Callable, List[str], List[str]]:
+    started: List[str] = []
+    cancelled: List[str] = []
+
+    async def call(model: str) -> str:
+        started.append(model)
+        try:
+            await asyncio.sleep(delays[model])
+        except asyncio.CancelledError:
+            cancelled.append(model)
+            raise
+        if model in failing:
+            raise RuntimeError(f"{model} down")
+        return model
+
+    return call, started, cancelled
+
+
+def test_sequential_falls_back_after_timeout() -> None:
+    call, started, cancelled = make_call({"seq-slow": 10, "seq-ok": 0})
+    policy = FallbackPolicy(timeouts={"seq-slow": 0.01})
+    assert asyncio.run(policy.run(["seq-slow", "seq-ok"], call)) == "seq-ok"
+    assert started == ["seq-slow", "seq-ok"]
+    assert cancelled == ["seq-slow"]
+
+
+def test_hedged_starts_next_model_when_first_is_slow() -> None:
+    call, started, cancelled = make_call({"hedge-slow": 10, "hedge-ok": 0.01})
+    policy = FallbackPolicy(mode="hedged", hedge_delay=0.02)
+    began = time.perf_counter()
+    assert asyncio.run(policy.run(["hedge-slow", "hedge-ok"], call)) == "hedge-ok"
+    assert time.perf_counter() - began < 1
+    assert started == ["hedge-slow", "hedge-ok"]
+    assert cancelled == ["hedge-slow"]
+
+
+def test_hedged_waits_for_a_fast_first_model() -> None:
+    call, started, _ = make_call({"hedge-first": 0.01, "hedge-spare": 0})
+    policy = FallbackPolicy(mode="hedged", hedge_delay=1)
+    assert asyncio.run(policy.run(["hedge-first", "hedge-spare"], call)) == "hedge-first"
+    assert started == ["hedge-first"]
+
+
+def test_hedged_moves_on_immediately_after_a_failure() -> None:
+    call, started, _ = make_call({"hedge-broken": 0, "hedge-next": 0}, failing=("hedge-broken",))
+    policy = FallbackPolicy(mode="hedged", hedge_delay=10)
+    began = time.perf_counter()
+    assert asyncio.run(policy.run(["hedge-broken", "hedge-next"], call)) == "hedge-next"
+    assert time.perf_counter() - began < 1
+
+
+def test_race_starts_all_and_cancels_losers() -> None:
+    call, started, cancelled = make_call({"race-a": 10, "race-b": 0.01, "race-c": 10})
+    policy = FallbackPolicy(mode="race")
+    assert asyncio.run(policy.run(["race-a", "race-b", "race-c"], call)) == "race-b"
+    assert sorted(started) == ["race-a", "race-b", "race-c"]
+    assert sorted(cancelled) == ["race-a", "race-c"]
+
+
+@pytest.mark.parametrize("mode", ["sequential", "hedged", "race"])
+def test_all_models_failing_raises(mode: str) -> None:
+    models = [f"{mode}-down-1", f"{mode}-down-2"]
+    call, _, _ = make_call(dict.fromkeys(models, 0), failing=tuple(models))
+    with pytest.raises(AllModelsFailedError) as e:
+        asyncio.run(FallbackPolicy(mode=mode).run(models, call))
+    assert set(e.value.errors) == set(models)
+
+
+def test_unknown_mode_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        FallbackPolicy(mode="parallel")
@@ -0,0 +1,154 @@
+import asyncio
+from typing import List
+
+import httpx
+import openai
+import pydantic
+import pytest
+
+from api.llm import LLMNotConfiguredError
+from api.modules.predict import AllModelsFailedError, FallbackPolicy, HealthTracker, is_upstream_failure
+
+REQUEST = httpx.Request("POST", "https://llm.example/v1/chat/completions")
+
+
+def status_error(status: int) -> openai.APIStatusError:
+    return openai.APIStatusError("error", response=httpx.Response(status, request=REQUEST), body=None)
+
+
+def validation_error() -> pydantic.ValidationError:
+    try:
+        pydantic.TypeAdapter(int).validate_python("not a number")
+    except pydantic.ValidationError as e:
+        return e
+    raise AssertionError
+
+
+@pytest.fixture
+def now() -> List[float]:
+    return [0.0]
+
+
+@pytest.fixture
+def health(now: List[float]) -> HealthTracker:
+    return HealthTracker(max_consecutive_failures=2, cooldown=30, clock=lambda: now[0])
+
+
+def degrade(health: HealthTracker, model: str) -> None:
+    for record in (health.record_failure, lambda model: health.record_success(model, 0.1), health.record_failure):
+        record(model)
+
+
+def trip(health: HealthTracker, model: str = "m") -> None:
+    for _ in range(health.max_consecutive_failures):
+        assert health.acquire(model)
+        health.record_failure(model)
+
+
+def test_breaker_opens_after_consecutive_failures(health: HealthTracker) -> None:
+    assert health.acquire("m")
+    health.record_failure("m")
+    assert health.stats()["m"]["state"] == "closed"
+    health.record_failure("m")
+    assert health.stats()["m"]["state"] == "open"
+    assert not health.acquire("m")
+    assert not health.available("m")
+
+
+def test_success_resets_consecutive_failures(health: HealthTracker) -> None:
+    health.record_failure("m")
+    health.record_success("m", 0.1)
+    health.record_failure("m")
+    assert health.stats()["m"]["state"] == "closed"
+
+
+def test_half_open_probe_closes_breaker_on_success(health: HealthTracker, now: List[float]) -> None:
+    trip(health)
+    now[0] = 29.0
+    assert not health.acquire("m")
+    now[0] = 30.0
+    assert health.available("m")
+    assert health.acquire("m")
+    assert health.stats()["m"]["state"] == "half_open"
+    assert not health.acquire("m"), "only one probe at a time"
+    health.record_success("m", 0.1)
+    assert health.stats()["m"]["state"] == "closed"
+    assert health.acquire("m") and health.acquire("m")
+
+
+def test_half_open_probe_failure_reopens_breaker(health: HealthTracker, now: List[float]) -> None:
+    trip(health)
+    now[0] = 30.0
+    assert health.acquire("m")
+    health.record_failure("m")
+    stats = health.stats()["m"]
+    assert stats["state"] == "open" and stats["trips"] == 2
+    now[0] = 59.0
+    assert not health.acquire("m")
+    now[0] = 60.0
+    assert health.acquire("m")
+
+
+def test_released_probe_can_be_retried(health: HealthTracker, now: List[float]) -> None:
+    trip(health)
+    now[0] = 30.0
+    assert health.acquire("m")
+    health.release("m")
+    assert health.acquire("m")
+
+
+def test_order_puts_open_models_last_and_degraded_after_healthy(health: HealthTracker) -> None:
+    trip(health, "broken")
+    degrade(health, "flaky")
+    assert health.order(["broken", "flaky", "ok"]) == ["ok", "flaky", "broken"]
+
+
+def test_error_rate_recovers_without_traffic(health: HealthTracker, now: List[float]) -> None:
+    degrade(health, "flaky")
+    assert health.degraded("flaky")
+    now[0] = 60.0
+    assert not health.degraded("flaky")
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        asyncio.TimeoutError(),
+        httpx.ConnectError("refused", request=REQUEST),
+        openai.APITimeoutError(request=REQUEST),
+        status_error(429),
+        status_error(503),
+    ],
+)
+def test_upstream_failures(error: BaseException) -> None:
+    assert is_upstream_failure(error)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [status_error(400), status_error(401), validation_error(), LLMNotConfiguredError("no key"), ValueError("bad")],
+)
+def test_client_errors_are_not_upstream_failures(error: BaseException) -> None:
+    assert not is_upstream_failure(error)
+
+
+def test_wrapped_upstream_failure_is_recognized() -> None:
+    try:
+        try:
+            raise httpx.ReadTimeout("slow", request=REQUEST)
+        except httpx.ReadTimeout as e:
+            raise RuntimeError("retries exhausted") from e
+    except RuntimeError as e:
+        assert is_upstream_failure(e)
+
+
+def test_client_errors_do_not_trip_the_breaker(health: HealthTracker) -> None:
+    async def call(model: str) -> str:
+        raise validation_error()
+
+    policy = FallbackPolicy(health=health)
+    for _ in range(health.max_consecutive_failures + 1):
+        with pytest.raises(AllModelsFailedError):
+            asyncio.run(policy.run(["m"], call))
+    assert health.stats()["m"]["state"] == "closed"
+    assert health.stats()["m"]["samples"] == 0
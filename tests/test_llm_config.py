@@ -0,0 +1,49 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import api.index as index
+import api.llm as llm
+from api.modules.predict import FallbackPolicy, HealthTracker, NumerologyReader, TarotReader
+
+CARD = {"name": "The Fool", "is_upright": True}
+READING = {"name": "Ann", "question": "q", "past_card": CARD, "present_card": CARD, "future_card": CARD}
+PERSON = {"name": "Ann", "dob": "1990-01-01", "question": "q"}
+
+
+@pytest.fixture
+def health() -> HealthTracker:
+    return HealthTracker()
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch, health: HealthTracker) -> TestClient:
+    monkeypatch.setattr(llm, "OPENAI_API_KEY", None)
+    for reader in (TarotReader, NumerologyReader):
+        monkeypatch.setattr(reader, "client", None)
+        monkeypatch.setattr(reader, "fallback", FallbackPolicy(health=health))
+    return TestClient(index.app)
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [
+        ("/predict/tarot-interpretations", READING),
+        ("/predict/tarot-interpretations/stream", READING),
+        ("/predict/tarot-interpretations/batch", {"requests": [READING]}),
+        ("/predict/numerology-interpretations", PERSON),
+        ("/predict/numerology-interpretations/stream", PERSON),
+        ("/predict/full-reading", PERSON),
+        ("/predict/full-reading/stream", PERSON),
+    ],
+)
+def test_missing_api_key_is_a_clear_503(client: TestClient, health: HealthTracker, path: str, body: dict) -> None:
+    response = client.post(path, json=body)
+    assert response.status_code == 503
+    assert "OPENAI_API_KEY" in response.json()["detail"]
+    assert health.stats() == {}
+
+
+def test_fast_tier_needs_no_api_key(client: TestClient) -> None:
+    response = client.post("/predict/tarot-interpretations", json=dict(READING, tier="fast"))
+    assert response.status_code == 200
+    assert response.json()["tier"] == "fast"
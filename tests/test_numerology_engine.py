@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Any, Dict
+
+import pytest
+from unidecode import unidecode
+
+from api.modules.numerology import NumerologyEngine, digital_root
+
+PEOPLE = [
+    ("John Doe", "2000-01-01"),
+    ("Zoë Ångström-Ørsted", "1987-12-31"),
+    ("O'Brien Mc Gee", "31/12/1999"),
+    ("Nguyễn Thị Minh Khai", "1975.04.30"),
+    ("", "1990-10-01"),
+    ("Ann", ""),
+    ("X Æ A-12", "2020-05-04"),
+]
+
+
+def reference(name: str, dob: str) -> Dict[str, Any]:
+    """The numerology numbers as originally computed, one character at a time."""
+    letters = [ord(c) - 64 for c in unidecode(name.upper().replace(" ", "")) if c.isalpha()]
+    dob_sum = sum(int(ch) for ch in dob if ch.isdigit())
+    total = sum(letters) + dob_sum
+    while total > 9:
+        total = sum(int(d) for d in str(total))
+    return {
+        "name_numerology": sum(letters),
+        "dob_numerology": dob_sum,
+        "personal_numerology": total,
+        "current_year_numerology": sum(int(d) for d in str(datetime.now().year)),
+    }
+
+
+@pytest.mark.parametrize("value", [0, 1, 9, 10, 18, 19, 99, 12345])
+def test_digital_root_matches_repeated_digit_sum(value: int) -> None:
+    expected = value
+    while expected > 9:
+        expected = sum(int(d) for d in str(expected))
+    assert digital_root(value) == expected
+
+
+@pytest.mark.parametrize("name, dob", PEOPLE)
+def test_calculate_matches_reference(name: str, dob: str) -> None:
+    assert NumerologyEngine.calculate(name, dob) == reference(name, dob)
+
+
+def test_explanation() -> None:
+    explanation = NumerologyEngine.calculate("Ann", "2000-01-01", explain=True)["_explanation"]
+    assert explanation["name"] == "A(1) + N(14) + N(14) = 29"
+    assert explanation["dob"] == "2 + 0 + 0 + 0 + 0 + 1 + 0 + 1 = 4"
+    assert explanation["personal"] == "33 → 6"
+
+
+def test_batch_matches_calculate() -> None:
+    pytest.importorskip("numpy")
+    names, dobs = zip(*PEOPLE)
+    batch = NumerologyEngine.calculate_batch(names, dobs)
+    for i, (name, dob) in enumerate(PEOPLE):
+        assert {key: int(values[i]) for key, values in batch.items()} == NumerologyEngine.calculate(name, dob)
+
+
+def test_batch_of_nothing() -> None:
+    pytest.importorskip("numpy")
+    assert all(len(values) == 0 for values in NumerologyEngine.calculate_batch([], []).values())
+
+
+def test_batch_rejects_mismatched_lengths() -> None:
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        NumerologyEngine.calculate_batch(["Ann"], [])
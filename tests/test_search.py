@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import api.index as index
+from api.modules.tarot_cards import TarotDeck
+from api.modules.tarot_cards.search import CardSearchIndex, tokenize
+
+
+@pytest.fixture(scope="module")
+def search() -> CardSearchIndex:
+    return TarotDeck.search.load()
+
+
+def names(result) -> list:
+    return [hit.record.name for hit in result.hits]
+
+
+def test_tokenize_drops_stopwords_and_punctuation() -> None:
+    assert tokenize("What does the Queen of Cups mean, for me?") == ["does", "queen", "cups", "mean"]
+
+
+def test_name_match_ranks_first(search: CardSearchIndex) -> None:
+    result = search.search("fool")
+    assert names(result)[0] == "The Fool"
+    assert result.hits[0].fields == ("name",)
+    assert all(a.score >= b.score for a, b in zip(result.hits, result.hits[1:]))
+
+
+def test_every_term_must_match(search: CardSearchIndex) -> None:
+    assert names(search.search("queen cups")) == ["Queen of Cups"]
+    assert search.search("queen cups fool").total == 0
+
+
+def test_prefix_matches_are_optional_and_discounted(search: CardSearchIndex) -> None:
+    assert search.search("medit", prefix=False).total == 0
+    prefixed = search.search("medit")
+    whole = search.search("meditation")
+    assert names(prefixed)[0] == names(whole)[0] == "Four of Swords"
+    assert prefixed.hits[0].score < whole.hits[0].score
+
+
+def test_filters_without_query_list_cards_by_number(search: CardSearchIndex) -> None:
+    major = search.search(arcana="major", limit=78)
+    assert major.total == 22
+    assert [hit.record.number for hit in major.hits] == sorted(hit.record.number for hit in major.hits)
+    assert {hit.record.info["suit"] for hit in search.search(suit="Cups", limit=78).hits} == {"Cups"}
+    assert search.search("the of").total == len(TarotDeck.catalog)
+
+
+def test_filters_narrow_ranked_results(search: CardSearchIndex) -> None:
+    everywhere = search.search("love", limit=78)
+    cups = search.search("love", suit="cups", limit=78)
+    assert 0 < cups.total < everywhere.total
+    assert all(hit.record.info["suit"] == "Cups" for hit in cups.hits)
+
+
+def test_pagination_slices_the_ranking(search: CardSearchIndex) -> None:
+    ranking = names(search.search("love", limit=78))
+    page = search.search("love", limit=3, offset=2)
+    assert page.total == len(ranking)
+    assert names(page) == ranking[2:5]
+
+
+def test_search_endpoint() -> None:
+    client = TestClient(index.app)
+    body = client.get("/tarot-cards/search", params={"q": "fool", "limit": 1}).json()
+    assert body["total"] == 2
+    assert body["results"][0]["name"] == "The Fool"
+    assert body["results"][0]["matched_fields"] == ["name"]
+    assert client.get("/tarot-cards/search", params={"suit": "coins"}).status_code == 422
@@ -0,0 +1,90 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from api.modules.predict import NumerologyReader, SemanticCache, TarotReader  # noqa: E402
+
+GROUP = "cards"
+QUESTION = "Will my love last forever?"
+PARAPHRASES = [
+    ("Will my love last forever?", "Is my relationship going to last forever?"),
+    ("Should I change jobs?", "Should I switch my job?"),
+    ("Will I get the promotion?", "Am I going to get the promotion?"),
+    ("How can I improve my finances?", "How do I improve my finances?"),
+    ("Will my business succeed?", "Is my business going to succeed?"),
+    ("What does my career look like this year?", "How will my career go this year?"),
+    ("Will I find love soon?", "Will I meet someone soon?"),
+    ("Is he the one for me?", "Is he the right one for me?"),
+]
+OTHER_QUESTIONS = [
+    ("Will my love last forever?", "Will my job last forever?"),
+    ("Should I change jobs?", "Should I move abroad?"),
+    ("Will I get the promotion?", "Will I get married?"),
+    ("What does my career look like this year?", "What does my health look like this year?"),
+    ("Will my business succeed?", "Will my marriage succeed?"),
+    ("Is he the one for me?", "Is she the one for me?"),
+    ("Will I find love soon?", "Will I find a job soon?"),
+    ("How can I improve my finances?", "How can I improve my health?"),
+]
+
+
+@pytest.fixture
+def cache() -> SemanticCache:
+    cache = SemanticCache(name="test")
+    cache.set(GROUP, QUESTION, "reading")
+    return cache
+
+
+def test_reworded_question_hits(cache: SemanticCache) -> None:
+    hit = cache.get(GROUP, "  will my LOVE last forever ")
+    assert hit is not None and hit.value == "reading"
+
+
+def test_negated_question_misses(cache: SemanticCache) -> None:
+    assert cache.featurizer(QUESTION) @ cache.featurizer("Will my love not last forever?") > 0.75
+    assert cache.get(GROUP, "Will my love not last forever?") is None
+    assert cache.get(GROUP, "Won't my love last forever?") is None
+
+
+def test_negation_guard_holds_at_a_low_threshold(cache: SemanticCache) -> None:
+    cache.threshold = 0.5
+    assert cache.get(GROUP, "Will my love not last forever?") is None
+    assert cache.stats()["rejected"] == 1
+
+
+def test_paraphrase_hits(cache: SemanticCache) -> None:
+    hit = cache.get(GROUP, "Is my relationship going to last forever?")
+    assert hit is not None and hit.value == "reading"
+
+
+def hit_rate(pairs) -> float:
+    cache = SemanticCache(name="test")
+    for i, (question, _) in enumerate(pairs):
+        cache.set(str(i), question, "reading")
+    return sum(cache.get(str(i), other) is not None for i, (_, other) in enumerate(pairs)) / len(pairs)
+
+
+def test_default_hit_rate_on_sample_questions() -> None:
+    # The featurizer is lexical: paraphrases sharing (synonymous) content words are reused,
+    # ones in other words are not, and a swapped topic never is.
+    assert hit_rate(PARAPHRASES) >= 0.6
+    assert hit_rate(OTHER_QUESTIONS) == 0.0
+
+
+def test_other_group_misses(cache: SemanticCache) -> None:
+    assert cache.get("other cards", QUESTION) is None
+
+
+def test_tarot_group_is_per_person(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(TarotReader, "semantic_cache", SemanticCache(name="tarot"))
+    cards = ("The Fool (UPRIGHT)", "The Magician (REVERSED)", "Death (UPRIGHT)")
+    assert TarotReader._semantic_group("Ann Lee", *cards) == TarotReader._semantic_group(" ann  lee", *cards)
+    assert TarotReader._semantic_group("Ann Lee", *cards) != TarotReader._semantic_group("Bo Lee", *cards)
+
+
+def test_numerology_group_is_per_person(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(NumerologyReader, "semantic_cache", SemanticCache(name="numerology"))
+    prompt = NumerologyReader._prepare_request("Ann Lee", "1990-10-01", QUESTION)
+    assert NumerologyReader._semantic_group("Ann Lee", "1990-10-01", prompt) != NumerologyReader._semantic_group(
+        "Ann Lee", "1990-01-01", prompt
+    )
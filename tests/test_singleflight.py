@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from api.modules.predict import SingleFlight
+
+
+def test_concurrent_calls_share_one_task() -> None:
+    flights = SingleFlight()
+    calls = 0
+
+    async def factory() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "reading"
+
+    async def main() -> list:
+        return await asyncio.gather(*(flights.run("key", factory) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["reading"] * 5
+    assert calls == 1
+    assert flights.stats() == {"calls": 5, "coalesced": 4, "in_flight": 0}
+
+
+def test_cancelled_caller_does_not_cancel_shared_task() -> None:
+    flights = SingleFlight()
+
+    async def factory() -> str:
+        await asyncio.sleep(0.02)
+        return "reading"
+
+    async def main() -> str:
+        first = asyncio.create_task(flights.run("key", factory))
+        second = asyncio.create_task(flights.run("key", factory))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "reading"
+
+
+def test_task_is_cancelled_with_its_last_caller() -> None:
+    flights = SingleFlight()
+
+    async def main() -> bool:
+        stopped = asyncio.Event()
+
+        async def factory() -> str:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+            return "reading"
+
+        caller = asyncio.create_task(flights.run("key", factory))
+        await asyncio.sleep(0)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.wait_for(stopped.wait(), timeout=1)
+        return flights.stats()["in_flight"] == 0
+
+    assert asyncio.run(main())
+
+
+def test_failure_is_shared_and_not_cached() -> None:
+    flights = SingleFlight()
+    calls = 0
+
+    async def factory() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream down")
+
+    async def main() -> list:
+        return await asyncio.gather(*(flights.run("key", factory) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
+    with pytest.raises(RuntimeError):
+        asyncio.run(flights.run("key", factory))
+    assert calls == 2